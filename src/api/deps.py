@@ -0,0 +1,133 @@
+"""Shared service dependencies for the API
+
+Each factory builds its service once and returns the same instance on every
+call, so it can be used directly or through FastAPI's ``Depends``. The app
+calls them on startup so clients are constructed before the first request.
+"""
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from ..config.settings import get_settings
+from ..graph_db.neo4j_connector import Neo4jConnector, AsyncNeo4jConnector
+from ..embeddings.embedder import EmbeddingService
+from ..embeddings.cache import EmbeddingCache
+from ..embeddings.vector_store import VectorStore
+from ..retrieval.agent import RetrievalAgent
+
+settings = get_settings()
+
+_async_graph_db: Optional[AsyncNeo4jConnector] = None
+_async_graph_db_lock = asyncio.Lock()
+
+
+def _neo4j_config() -> Dict[str, Any]:
+    """Connection and pool configuration for Neo4j drivers"""
+    return {
+        "uri": settings.neo4j_uri,
+        "user": settings.neo4j_user,
+        "password": settings.neo4j_password,
+        "database": settings.neo4j_database,
+        "max_connection_pool_size": settings.neo4j_pool_size,
+        "connection_acquisition_timeout": settings.neo4j_connection_acquisition_timeout,
+        "max_connection_lifetime": settings.neo4j_max_connection_lifetime
+    }
+
+
+@lru_cache(maxsize=None)
+def get_graph_db() -> Neo4jConnector:
+    """Get the shared graph database connection"""
+    graph_db = Neo4jConnector(_neo4j_config())
+    graph_db.connect()
+    return graph_db
+
+
+async def get_async_graph_db() -> AsyncNeo4jConnector:
+    """Get the shared async graph database connection"""
+    global _async_graph_db
+    if _async_graph_db is None:
+        async with _async_graph_db_lock:
+            if _async_graph_db is None:
+                graph_db = AsyncNeo4jConnector(_neo4j_config())
+                await graph_db.connect()
+                _async_graph_db = graph_db
+    return _async_graph_db
+
+
+@lru_cache(maxsize=None)
+def get_embedding_service() -> EmbeddingService:
+    """Get the shared embedding service"""
+    provider = settings.embedding_provider.lower()
+    if provider == "gemini":
+        api_key = settings.gemini_api_key
+        model = settings.gemini_embedding_model
+    else:
+        api_key = settings.openai_api_key
+        model = settings.openai_embedding_model
+
+    cache = None
+    if settings.embedding_cache_enabled:
+        cache = EmbeddingCache(settings.embedding_cache_path, provider=provider, model=model)
+
+    return EmbeddingService(
+        api_key=api_key,
+        model=model,
+        provider=provider,
+        cache=cache
+    )
+
+
+@lru_cache(maxsize=None)
+def get_vector_store() -> VectorStore:
+    """Get the shared vector store"""
+    provider = settings.embedding_provider.lower()
+    dimension = 768 if provider == "gemini" else 1536
+    return VectorStore(
+        dimension=dimension,
+        quantization=settings.vector_quantization,
+        index_type=settings.vector_index_type,
+        metric=settings.vector_metric,
+        device=settings.vector_device
+    )
+
+
+@lru_cache(maxsize=None)
+def get_retrieval_agent() -> RetrievalAgent:
+    """Get the shared retrieval agent"""
+    provider = settings.llm_provider.lower()
+    if provider == "gemini":
+        api_key = settings.gemini_api_key
+        model = settings.gemini_model
+    elif provider == "anthropic":
+        api_key = settings.anthropic_api_key
+        model = settings.llm_model
+    else:
+        api_key = settings.openai_api_key
+        model = settings.openai_model
+
+    return RetrievalAgent(
+        graph_db=get_graph_db(),
+        embedding_service=get_embedding_service(),
+        vector_store=get_vector_store(),
+        api_key=api_key,
+        model=model,
+        provider=provider
+    )
+
+
+def close_vector_store() -> None:
+    """Flush the shared vector store if it was created"""
+    if get_vector_store.cache_info().currsize:
+        get_vector_store().close()
+
+
+async def close_graph_dbs() -> None:
+    """Close any open graph database drivers"""
+    global _async_graph_db
+    if get_graph_db.cache_info().currsize:
+        get_graph_db().disconnect()
+        get_graph_db.cache_clear()
+    if _async_graph_db is not None:
+        await _async_graph_db.disconnect()
+        _async_graph_db = None
@@ -0,0 +1,106 @@
+"""In-process registry for long-running background jobs"""
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class JobStatus:
+    """Status of a background job"""
+    job_id: str
+    job_type: str
+    status: str = "queued"  # queued, running, completed, failed
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation"""
+        return {
+            "job_id": self.job_id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobRegistry:
+    """Thread-safe registry tracking background job status"""
+
+    def __init__(self, max_jobs: int = 100):
+        """
+        Initialize job registry
+
+        Args:
+            max_jobs: Maximum number of finished jobs to retain
+        """
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, JobStatus] = {}
+        self._lock = threading.RLock()
+
+    def create(self, job_type: str) -> JobStatus:
+        """
+        Register a new queued job
+
+        Args:
+            job_type: Kind of job (e.g., "migration", "embeddings")
+
+        Returns:
+            The new job status
+        """
+        job = JobStatus(job_id=uuid.uuid4().hex, job_type=job_type)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        """Get a job by id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[JobStatus]:
+        """List all tracked jobs, newest first"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def mark_running(self, job_id: str) -> None:
+        """Mark a job as started"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = "running"
+            job.started_at = datetime.now()
+
+    def mark_completed(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job as completed with its result"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = "completed"
+            job.result = result
+            job.finished_at = datetime.now()
+
+    def mark_failed(self, job_id: str, error: str) -> None:
+        """Mark a job as failed with an error message"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = "failed"
+            job.error = error
+            job.finished_at = datetime.now()
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond max_jobs"""
+        finished = [j for j in self._jobs.values() if j.status in ("completed", "failed")]
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job in sorted(finished, key=lambda j: j.created_at)[:excess]:
+            del self._jobs[job.job_id]
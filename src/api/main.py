@@ -1,12 +1,17 @@
 """FastAPI application for RDBMS to Graph RAG system"""
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from prometheus_client import make_asgi_app
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
-import json
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import orjson
 from loguru import logger
 import sys
 from pathlib import Path
@@ -15,24 +20,38 @@ from ..config.settings import get_settings
 from ..connectors.postgres import PostgreSQLConnector
 from ..connectors.mysql import MySQLConnector
 from ..connectors.sqlite import SQLiteConnector
-from ..graph_db.neo4j_connector import Neo4jConnector
+from ..graph_db.neo4j_connector import AsyncNeo4jConnector
 from ..schema_mapper.mapper import SchemaMapper
 from ..schema_mapper.llm_enhancer import LLMSchemaEnhancer
 from ..migration.migrator import DataMigrator
-from ..embeddings.embedder import EmbeddingService
 from ..embeddings.vector_store import VectorStore
 from ..retrieval.agent import RetrievalAgent
 from ..cdc.manager import CDCManager
 from ..cdc.postgres_listener import PostgreSQLCDCListener
 from ..cdc.handlers import GraphSyncHandler, EmbeddingSyncHandler
+from ..metrics import MIGRATION_TABLES, QUERY_SECONDS
+from .query_cache import QueryCache
+from .query_log import QueryLog
+from .jobs import JobRegistry
+from .deps import (
+    get_graph_db,
+    get_async_graph_db,
+    get_embedding_service,
+    get_vector_store,
+    get_retrieval_agent,
+    close_graph_dbs,
+    close_vector_store
+)
 
 logger.remove()
-logger.add(sys.stderr, level="INFO")
+# enqueue hands records to a writer thread so logging never blocks a request
+logger.add(sys.stderr, level="INFO", enqueue=True)
 
 app = FastAPI(
     title="RDBMS to Graph RAG API",
     description="API for converting relational databases to knowledge graphs with intelligent retrieval",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 settings = get_settings()
@@ -50,6 +69,8 @@ templates_path = Path(__file__).parent.parent / "web" / "templates"
 if static_path.exists():
     app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
+app.mount("/metrics", make_asgi_app())
+
 class DatabaseConfig(BaseModel):
     """Database configuration"""
     db_type: str
@@ -77,84 +98,78 @@ class SchemaResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
-_graph_db = None
-_embedding_service = None
-_vector_store = None
-_retrieval_agent = None
 _cdc_manager = None
 _current_graph_schema = None
+_query_cache = QueryCache(
+    max_size=settings.query_cache_size,
+    ttl=settings.query_cache_ttl
+)
+_query_log = QueryLog(settings.query_log_path, settings.query_log_max_bytes)
+_job_registry = JobRegistry()
+_job_executor = ThreadPoolExecutor(max_workers=settings.api_job_workers, thread_name_prefix="api-job")
 
 
-def get_graph_db():
-    """Get or create graph database connection"""
-    global _graph_db
-    if _graph_db is None:
-        config = {
-            "uri": settings.neo4j_uri,
-            "user": settings.neo4j_user,
-            "password": settings.neo4j_password
-        }
-        _graph_db = Neo4jConnector(config)
-        _graph_db.connect()
-    return _graph_db
-
-
-def get_embedding_service():
-    """Get or create embedding service"""
-    global _embedding_service
-    if _embedding_service is None:
-        provider = settings.embedding_provider.lower()
-        if provider == "gemini":
-            api_key = settings.gemini_api_key
-            model = settings.gemini_embedding_model
-            dimension = 768
-        else:
-            api_key = settings.openai_api_key
-            model = settings.openai_embedding_model
-            dimension = 1536
-
-        _embedding_service = EmbeddingService(
-            api_key=api_key,
-            model=model,
-            provider=provider
-        )
-    return _embedding_service
-
-
-def get_vector_store():
-    """Get or create vector store"""
-    global _vector_store
-    if _vector_store is None:
-        provider = settings.embedding_provider.lower()
-        dimension = 768 if provider == "gemini" else 1536
-        _vector_store = VectorStore(dimension=dimension)
-    return _vector_store
-
-
-def get_retrieval_agent():
-    """Get or create retrieval agent"""
-    global _retrieval_agent
-    if _retrieval_agent is None:
-        provider = settings.llm_provider.lower()
-        if provider == "gemini":
-            api_key = settings.gemini_api_key
-            model = settings.gemini_model
-        elif provider == "anthropic":
-            api_key = settings.anthropic_api_key
-            model = settings.llm_model
-        else:
-            api_key = settings.openai_api_key
-            model = settings.openai_model
-
-        _retrieval_agent = RetrievalAgent(
-            graph_db=get_graph_db(),
-            embedding_service=get_embedding_service(),
-            vector_store=get_vector_store(),
-            api_key=api_key,
-            model=model,
-            provider=provider
+# Orders result logging against invalidation markers in the query log
+_invalidation_lock = threading.Lock()
+
+
+def invalidate_query_cache() -> None:
+    """Drop cached query results and mark logged results as stale"""
+    with _invalidation_lock:
+        _query_cache.invalidate_all()
+        _query_log.record_invalidation()
+
+
+def _store_query_result(
+    cache_key: Any,
+    request: QueryRequest,
+    result: Dict[str, Any],
+    generation: int
+) -> None:
+    """Cache and log a query result unless the cache was invalidated meanwhile"""
+    with _invalidation_lock:
+        if _query_cache.put(cache_key, result, generation=generation):
+            _query_log.record(request.query, request.top_k, result)
+
+
+@app.on_event("startup")
+async def init_services():
+    """Construct shared clients and connect to Neo4j before serving requests"""
+    for factory in (get_graph_db, get_vector_store, get_embedding_service, get_retrieval_agent):
+        try:
+            await run_in_threadpool(factory)
+        except Exception as e:
+            logger.warning(f"Could not initialize {factory.__name__} on startup: {e}")
+
+    try:
+        await get_async_graph_db()
+    except Exception as e:
+        logger.warning(f"Could not initialize get_async_graph_db on startup: {e}")
+
+
+@app.on_event("shutdown")
+async def close_services():
+    """Close shared database drivers and flush the vector store and query log"""
+    await close_graph_dbs()
+    close_vector_store()
+    await run_in_threadpool(_query_log.close)
+
+
+@app.on_event("startup")
+async def warm_query_cache():
+    """Seed the query cache with the most frequent recent queries"""
+    try:
+        entries = await run_in_threadpool(
+            _query_log.load_top,
+            settings.query_cache_ttl,
+            settings.query_cache_warm_size
         )
-    return _retrieval_agent
+        for entry, age in entries:
+            _query_cache.put(QueryCache.make_key(entry["query"], entry["top_k"]), entry["result"], age=age)
+        if entries:
+            logger.info(f"Warmed query cache with {len(entries)} recent queries")
+    except Exception as e:
+        logger.warning(f"Could not warm query cache: {e}")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -195,6 +210,48 @@ async def health_check():
     return {"status": "healthy"}
 
 
+def _map_schema(config: DatabaseConfig) -> SchemaResponse:
+    """Introspect the source database and map it to a graph schema"""
+    if config.db_type == "postgres":
+        connector = PostgreSQLConnector(config.connection_string or settings.postgres_url)
+    elif config.db_type == "mysql":
+        connector = MySQLConnector(config.connection_string or settings.mysql_url)
+    elif config.db_type == "sqlite":
+        connector = SQLiteConnector(config.connection_string or "./data/sample.db")
+    else:
+        raise HTTPException(status_code=400, detail=f"Unsupported database type: {config.db_type}")
+    
+    with connector:
+        table_schemas = connector.get_all_schemas()
+
+        llm_enhancer = None
+        if settings.schema_llm_enabled:
+            schema_provider = settings.schema_llm_provider.lower()
+            if schema_provider == "gemini":
+                schema_api_key = settings.gemini_api_key
+            else:
+                schema_api_key = settings.openai_api_key
+
+            llm_enhancer = LLMSchemaEnhancer(
+                api_key=schema_api_key,
+                model=settings.schema_llm_model,
+                provider=schema_provider
+            )
+
+        mapper = SchemaMapper(llm_enhancer=llm_enhancer)
+        graph_schema = mapper.map_schema(
+            table_schemas,
+            label_prefix=config.domain_prefix,
+            source_connector=connector if llm_enhancer else None
+        )
+    
+    return SchemaResponse(
+        node_types=[nt.to_dict() for nt in graph_schema.node_types],
+        relationship_types=[rt.to_dict() for rt in graph_schema.relationship_types],
+        metadata=graph_schema.metadata
+    )
+
+
 @app.post("/schema/map")
 async def map_schema(config: DatabaseConfig) -> SchemaResponse:
     """
@@ -207,125 +264,144 @@ async def map_schema(config: DatabaseConfig) -> SchemaResponse:
         Graph schema
     """
     try:
-        if config.db_type == "postgres":
-            connector = PostgreSQLConnector(config.connection_string or settings.postgres_url)
-        elif config.db_type == "mysql":
-            connector = MySQLConnector(config.connection_string or settings.mysql_url)
-        elif config.db_type == "sqlite":
-            connector = SQLiteConnector(config.connection_string or "./data/sample.db")
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported database type: {config.db_type}")
+        return await run_in_threadpool(_map_schema, config)
         
-        with connector:
-            table_schemas = connector.get_all_schemas()
-
-            llm_enhancer = None
-            if settings.schema_llm_enabled:
-                schema_provider = settings.schema_llm_provider.lower()
-                if schema_provider == "gemini":
-                    schema_api_key = settings.gemini_api_key
-                else:
-                    schema_api_key = settings.openai_api_key
-
-                llm_enhancer = LLMSchemaEnhancer(
-                    api_key=schema_api_key,
-                    model=settings.schema_llm_model,
-                    provider=schema_provider
-                )
+    except Exception as e:
+        logger.error(f"Error mapping schema: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _run_migration(request: MigrationRequest, source) -> Dict[str, Any]:
+    """
+    Map the source schema and migrate its data into the graph database
+
+    Args:
+        request: Migration request
+        source: Unconnected source database connector
+
+    Returns:
+        Migration result
+    """
+    global _current_graph_schema
 
-            mapper = SchemaMapper(llm_enhancer=llm_enhancer)
-            graph_schema = mapper.map_schema(
-                table_schemas,
-                label_prefix=config.domain_prefix,
-                source_connector=connector if llm_enhancer else None
+    target = get_graph_db()
+
+    with source:
+        table_schemas = source.get_all_schemas()
+
+        if request.tables_filter:
+            table_schemas = {k: v for k, v in table_schemas.items() if k in request.tables_filter}
+        MIGRATION_TABLES.set(len(table_schemas))
+
+        llm_enhancer = None
+        if settings.schema_llm_enabled:
+            schema_provider = settings.schema_llm_provider.lower()
+            if schema_provider == "gemini":
+                schema_api_key = settings.gemini_api_key
+            else:
+                schema_api_key = settings.openai_api_key
+
+            llm_enhancer = LLMSchemaEnhancer(
+                api_key=schema_api_key,
+                model=settings.schema_llm_model,
+                provider=schema_provider
             )
-        
-        return SchemaResponse(
-            node_types=[nt.to_dict() for nt in graph_schema.node_types],
-            relationship_types=[rt.to_dict() for rt in graph_schema.relationship_types],
-            metadata=graph_schema.metadata
+
+        mapper = SchemaMapper(llm_enhancer=llm_enhancer)
+        graph_schema = mapper.map_schema(
+            table_schemas,
+            label_prefix=request.domain_prefix,
+            source_connector=source if llm_enhancer else None
         )
-        
+
+        migrator = DataMigrator(
+            source,
+            target,
+            graph_schema,
+            batch_size=settings.migration_batch_size,
+            max_workers=settings.migration_workers
+        )
+        stats = migrator.migrate(clear_target=request.clear_target)
+
+    _current_graph_schema = graph_schema
+    invalidate_query_cache()
+
+    return {
+        "nodes_created": stats.get("nodes_created", 0),
+        "relationships_created": stats.get("relationships_created", 0),
+        "domain_prefix": request.domain_prefix,
+        "tables_migrated": list(table_schemas.keys())
+    }
+
+
+async def _run_job(job_id: str, func, *args) -> None:
+    """
+    Run a blocking job function on the job executor and record its outcome
+
+    Args:
+        job_id: Job identifier in the registry
+        func: Blocking function returning a result dictionary
+        *args: Arguments passed to func
+    """
+    _job_registry.mark_running(job_id)
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(_job_executor, func, *args)
+        _job_registry.mark_completed(job_id, result)
+        logger.info(f"Job {job_id} completed")
     except Exception as e:
-        logger.error(f"Error mapping schema: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Job {job_id} failed: {e}")
+        _job_registry.mark_failed(job_id, str(e))
 
 
 @app.post("/migrate")
 async def migrate_data(request: MigrationRequest, background_tasks: BackgroundTasks):
     """
-    Migrate data from RDBMS to graph database
+    Queue a migration from RDBMS to graph database
     
     Args:
         request: Migration request
         background_tasks: FastAPI background tasks
         
     Returns:
-        Migration status
+        Queued job id, poll /jobs/{job_id} for the result
     """
-    try:
-        connection_str = request.connection_string
-        if request.db_type == "postgres":
-            source = PostgreSQLConnector(connection_str or settings.postgres_url)
-        elif request.db_type == "mysql":
-            source = MySQLConnector(connection_str or settings.mysql_url)
-        elif request.db_type == "sqlite":
-            source = SQLiteConnector(connection_str or "./data/sample.db")
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported database type: {request.db_type}")
-
-        target = get_graph_db()
+    connection_str = request.connection_string
+    if request.db_type == "postgres":
+        source = PostgreSQLConnector(connection_str or settings.postgres_url)
+    elif request.db_type == "mysql":
+        source = MySQLConnector(connection_str or settings.mysql_url)
+    elif request.db_type == "sqlite":
+        source = SQLiteConnector(connection_str or "./data/sample.db")
+    else:
+        raise HTTPException(status_code=400, detail=f"Unsupported database type: {request.db_type}")
 
-        with source:
-            table_schemas = source.get_all_schemas()
+    job = _job_registry.create("migration")
+    background_tasks.add_task(_run_job, job.job_id, _run_migration, request, source)
 
-            if request.tables_filter:
-                table_schemas = {k: v for k, v in table_schemas.items() if k in request.tables_filter}
-                logger.info(f"Filtered to {len(table_schemas)} tables: {list(table_schemas.keys())}")
-
-            llm_enhancer = None
-            if settings.schema_llm_enabled:
-                schema_provider = settings.schema_llm_provider.lower()
-                if schema_provider == "gemini":
-                    schema_api_key = settings.gemini_api_key
-                else:
-                    schema_api_key = settings.openai_api_key
-
-                llm_enhancer = LLMSchemaEnhancer(
-                    api_key=schema_api_key,
-                    model=settings.schema_llm_model,
-                    provider=schema_provider
-                )
+    return {"job_id": job.job_id, "status": job.status}
 
-            mapper = SchemaMapper(llm_enhancer=llm_enhancer)
-            graph_schema = mapper.map_schema(
-                table_schemas,
-                label_prefix=request.domain_prefix,
-                source_connector=source if llm_enhancer else None
-            )
 
-        with source:
-            migrator = DataMigrator(source, target, graph_schema)
-            stats = migrator.migrate(clear_target=request.clear_target)
+@app.get("/jobs")
+async def list_jobs():
+    """List background jobs"""
+    return {"jobs": [job.to_dict() for job in _job_registry.list()]}
 
-        global _current_graph_schema
-        _current_graph_schema = graph_schema
 
-        return {
-            "status": "completed",
-            "nodes_created": stats.get("nodes_created", 0),
-            "relationships_created": stats.get("relationships_created", 0),
-            "domain_prefix": request.domain_prefix,
-            "tables_migrated": list(table_schemas.keys())
-        }
-        
-    except Exception as e:
-        logger.error(f"Error during migration: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get status and result of a background job"""
+    job = _job_registry.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
 
 
 @app.post("/query")
-async def query(request: QueryRequest) -> Dict[str, Any]:
+async def query(
+    request: QueryRequest,
+    agent: RetrievalAgent = Depends(get_retrieval_agent)
+) -> Dict[str, Any]:
     """
     Execute an intelligent query using the agentic retrieval system
     
@@ -336,9 +412,20 @@ async def query(request: QueryRequest) -> Dict[str, Any]:
         Query results and answer
     """
     try:
-        agent = get_retrieval_agent()
-        result = agent.query(request.query)
-        
+        cache_key = QueryCache.make_key(request.query, request.top_k)
+        cached = _query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Read before the agent runs, so a graph change during the call
+        # keeps its result out of the cache
+        generation = _query_cache.generation
+        with QUERY_SECONDS.time():
+            result = await run_in_threadpool(agent.query, request.query)
+
+        # A fallback answer from a failed LLM call must not be served again
+        if not result.get("answer_failed"):
+            _store_query_result(cache_key, request, result, generation)
         return result
         
     except Exception as e:
@@ -346,8 +433,16 @@ async def query(request: QueryRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _ndjson_line(chunk: Dict[str, Any]) -> bytes:
+    """Serialize a stream chunk as one NDJSON line"""
+    return orjson.dumps(chunk, default=str, option=orjson.OPT_APPEND_NEWLINE)
+
+
 @app.post("/query/stream")
-async def query_stream(request: QueryRequest):
+async def query_stream(
+    request: QueryRequest,
+    agent: RetrievalAgent = Depends(get_retrieval_agent)
+):
     """
     Execute an intelligent query with streaming response
 
@@ -358,12 +453,26 @@ async def query_stream(request: QueryRequest):
         Streaming response with progressive results
     """
     try:
-        agent = get_retrieval_agent()
+        cache_key = QueryCache.make_key(request.query, request.top_k)
+        cached = _query_cache.get(cache_key)
 
         async def generate():
             """Generate streaming response"""
-            for chunk in agent.query_stream(request.query):
-                yield json.dumps(chunk) + "\n"
+            if cached is not None:
+                yield _ndjson_line({"type": "complete", **cached})
+                return
+
+            generation = _query_cache.generation
+            failed = False
+            async for chunk in agent.aquery_stream(request.query):
+                chunk_type = chunk.get("type")
+                if chunk_type == "error":
+                    # The complete chunk that follows holds a partial answer
+                    failed = True
+                elif chunk_type == "complete" and not failed:
+                    result = {k: v for k, v in chunk.items() if k != "type"}
+                    _store_query_result(cache_key, request, result, generation)
+                yield _ndjson_line(chunk)
 
         return StreamingResponse(
             generate(),
@@ -379,42 +488,52 @@ async def query_stream(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/query/cache/stats")
+async def get_query_cache_stats():
+    """Get query result cache statistics"""
+    return {
+        "status": "success",
+        **_query_cache.get_stats()
+    }
+
+
+_META_STATS_QUERY = "CALL apoc.meta.stats() YIELD labels RETURN labels"
+
+_LABEL_COUNTS_QUERY = """
+MATCH (n)
+UNWIND labels(n) AS label
+RETURN label, count(*) AS count
+ORDER BY label
+"""
+
+_RELATIONSHIP_TYPES_QUERY = "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types"
+
+
 @app.get("/stats")
-async def get_stats():
+async def get_stats(
+    graph_db: AsyncNeo4jConnector = Depends(get_async_graph_db),
+    vector_store: VectorStore = Depends(get_vector_store)
+):
     """Get database statistics"""
     try:
-        graph_db = get_graph_db()
-
-        node_types_query = """
-        CALL db.labels() YIELD label
-        CALL apoc.cypher.run('MATCH (n:`' + label + '`) RETURN count(n) as count', {}) YIELD value
-        RETURN label, value.count as count
-        ORDER BY label
-        """
 
         try:
-            node_types_result = graph_db.execute_query(node_types_query)
+            meta_result = await graph_db.execute_query(_META_STATS_QUERY)
+            label_counts = meta_result[0]["labels"] if meta_result else {}
+            node_types = [{"label": label, "count": label_counts[label]} for label in sorted(label_counts)]
+        except Exception:
+            node_types_result = await graph_db.execute_query(_LABEL_COUNTS_QUERY)
             node_types = [{"label": r["label"], "count": r["count"]} for r in node_types_result]
-        except:
-            labels_query = "CALL db.labels() YIELD label RETURN collect(label) as labels"
-            labels_result = graph_db.execute_query(labels_query)
-            labels = labels_result[0]["labels"] if labels_result else []
-            node_types = []
-            for label in labels:
-                count_query = f"MATCH (n:`{label}`) RETURN count(n) as count"
-                count_result = graph_db.execute_query(count_query)
-                node_types.append({"label": label, "count": count_result[0]["count"] if count_result else 0})
-
-        rel_types_query = "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types"
-        rel_types_result = graph_db.execute_query(rel_types_query)
+
+        rel_types_result = await graph_db.execute_query(_RELATIONSHIP_TYPES_QUERY)
         relationship_types = rel_types_result[0]["types"] if rel_types_result else []
 
         stats = {
-            "total_nodes": graph_db.get_node_count(),
-            "total_relationships": graph_db.get_relationship_count(),
+            "total_nodes": await graph_db.get_node_count(),
+            "total_relationships": await graph_db.get_relationship_count(),
             "node_types": node_types,
             "relationship_types": relationship_types,
-            "vector_store_size": get_vector_store().size
+            "vector_store_size": vector_store.size
         }
 
         return stats
@@ -429,71 +548,93 @@ class EmbeddingRequest(BaseModel):
     node_labels: Optional[List[str]] = None
 
 
-@app.post("/embeddings/build")
-async def build_embeddings(request: EmbeddingRequest, background_tasks: BackgroundTasks):
-    """Build embeddings for all nodes in the graph"""
-    try:
-        graph_db = get_graph_db()
-        embedding_service = get_embedding_service()
-        vector_store = get_vector_store()
-
-        if request.node_labels:
-            label_conditions = " OR ".join([f"n:`{label}`" for label in request.node_labels])
-            query = f"MATCH (n) WHERE {label_conditions} RETURN n, labels(n) as labels LIMIT 1000"
-        else:
-            query = "MATCH (n) RETURN n, labels(n) as labels LIMIT 1000"
+# toString() raises on list properties, so those are joined item by item
+_EMBEDDING_PROJECTION = """
+WITH n, labels(n) AS labels, properties(n) AS props
+WITH labels, props, [k IN keys(props) WHERE NOT k IN $excluded_keys | k + ': ' + CASE
+    WHEN props[k] IS :: LIST<ANY>
+    THEN '[' + coalesce(reduce(s = null, v IN props[k] | coalesce(s + ', ', '') + toString(v)), '') + ']'
+    ELSE toString(props[k])
+END] AS parts
+RETURN labels, props,
+       reduce(s = 'Label: ' + coalesce(head(labels), ''), l IN tail(labels) | s + ', ' + l)
+       + reduce(s = '', p IN parts | s + ', ' + p) AS text
+"""
+
+# Labels are passed as a parameter so every label filter shares one cached plan
+_EMBEDDING_SOURCE_QUERY = "MATCH (n)" + _EMBEDDING_PROJECTION
+_EMBEDDING_SOURCE_BY_LABEL_QUERY = (
+    "MATCH (n) WHERE any(l IN labels(n) WHERE l IN $labels)" + _EMBEDDING_PROJECTION
+)
 
-        nodes = graph_db.execute_query(query)
 
-        vectors = []
-        metadata_list = []
+def _run_embedding_build(request: EmbeddingRequest) -> Dict[str, Any]:
+    """
+    Build embeddings for graph nodes and add them to the vector store
 
-        for node_data in nodes:
-            n = node_data.get("n", {})
-            labels = node_data.get("labels", [])
+    Args:
+        request: Embedding build request
 
-            if hasattr(n, '_properties'):
-                props = dict(n._properties)
-            elif isinstance(n, dict):
-                props = n
-            else:
-                props = {}
+    Returns:
+        Embedding build result
+    """
+    graph_db = get_graph_db()
+    embedding_service = get_embedding_service()
+    vector_store = get_vector_store()
+
+    params: Dict[str, Any] = {"excluded_keys": ["id", "created_at", "updated_at"]}
+    if request.node_labels:
+        query = _EMBEDDING_SOURCE_BY_LABEL_QUERY
+        params["labels"] = request.node_labels
+    else:
+        query = _EMBEDDING_SOURCE_QUERY
+
+    embeddings_created = 0
+
+    for records in graph_db.stream_query(query, params, batch_size=1000):
+        texts = [record["text"] for record in records]
+        metadata_list = [
+            {
+                "node_id": record["props"].get("id", ""),
+                "labels": record["labels"],
+                "text": record["text"],
+                "properties": record["props"]
+            }
+            for record in records
+        ]
 
-            text_parts = [f"Label: {', '.join(labels)}"]
-            for key, value in props.items():
-                if key not in ['id', 'created_at', 'updated_at']:
-                    text_parts.append(f"{key}: {value}")
+        vectors = embedding_service.embed_texts(
+            texts,
+            batch_size=settings.embedding_batch_size,
+            as_array=True
+        )
+        vector_store.add_vectors(vectors, metadata_list)
+        embeddings_created += len(vectors)
 
-            text = ", ".join(text_parts)
+    vector_store.flush()
 
-            embedding = embedding_service.embed_text(text)
-            vectors.append(embedding)
+    if embeddings_created:
+        invalidate_query_cache()
 
-            metadata_list.append({
-                "node_id": props.get("id", ""),
-                "labels": labels,
-                "text": text,
-                "properties": props  # Now a plain dict, not a Neo4j Node
-            })
+    return {
+        "embeddings_created": embeddings_created,
+        "vector_store_size": vector_store.size
+    }
 
-        vector_store.add_vectors(vectors, metadata_list)
 
-        return {
-            "status": "completed",
-            "embeddings_created": len(vectors),
-            "vector_store_size": vector_store.size
-        }
+@app.post("/embeddings/build")
+async def build_embeddings(request: EmbeddingRequest, background_tasks: BackgroundTasks):
+    """Queue an embedding build for nodes in the graph, poll /jobs/{job_id} for the result"""
+    job = _job_registry.create("embeddings")
+    background_tasks.add_task(_run_job, job.job_id, _run_embedding_build, request)
 
-    except Exception as e:
-        logger.error(f"Error building embeddings: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"job_id": job.job_id, "status": job.status}
 
 
 @app.get("/embeddings/status")
-async def get_embeddings_status():
+async def get_embeddings_status(vector_store: VectorStore = Depends(get_vector_store)):
     """Get status of the vector store"""
     try:
-        vector_store = get_vector_store()
         status = vector_store.get_status()
 
         return {
@@ -558,17 +699,25 @@ async def setup_cdc(request: CDCSetupRequest):
                 connection_config=connection_config,
                 slot_name=settings.postgres_cdc_slot_name,
                 publication_name=settings.postgres_cdc_publication,
-                tables=request.tables
+                tables=request.tables,
+                feedback_flush_size=settings.cdc_feedback_flush_size,
+                feedback_flush_interval=settings.cdc_feedback_flush_interval,
+                max_queued_events=settings.cdc_batch_size * 8
             )
 
             listener_name = f"{request.db_type}_{request.domain_prefix or 'default'}"
-            _cdc_manager.register_listener(listener_name, listener, auto_setup=True)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                _job_executor,
+                lambda: _cdc_manager.register_listener(listener_name, listener, auto_setup=True)
+            )
 
             if _current_graph_schema:
                 graph_handler = GraphSyncHandler(
                     graph_db=get_graph_db(),
                     graph_schema=_current_graph_schema,
-                    domain_prefix=request.domain_prefix or ""
+                    domain_prefix=request.domain_prefix or "",
+                    on_change=invalidate_query_cache
                 )
                 _cdc_manager.add_handler(graph_handler)
 
@@ -576,7 +725,8 @@ async def setup_cdc(request: CDCSetupRequest):
                     embedding_handler = EmbeddingSyncHandler(
                         embedding_service=get_embedding_service(),
                         vector_store=get_vector_store(),
-                        graph_schema=_current_graph_schema
+                        graph_schema=_current_graph_schema,
+                        batch_size=settings.embedding_batch_size
                     )
                     _cdc_manager.add_handler(embedding_handler)
 
@@ -627,8 +777,8 @@ async def control_cdc(request: CDCControlRequest):
 
 
 @app.get("/cdc/status")
-async def get_cdc_status():
-    """Get CDC status"""
+async def get_cdc_status(include_errors: bool = False):
+    """Get CDC status, with the recent handler errors if include_errors is set"""
     global _cdc_manager
 
     if _cdc_manager is None:
@@ -638,7 +788,7 @@ async def get_cdc_status():
         }
 
     try:
-        status = _cdc_manager.get_status()
+        status = _cdc_manager.get_status(include_errors=include_errors)
         return {
             "status": "success",
             **status
@@ -0,0 +1,138 @@
+"""Thread-safe TTL + LRU cache for retrieval agent query results"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """
+    LRU cache with per-entry TTL for query results
+
+    Entries are evicted in least-recently-used order once ``max_size`` is
+    reached, and treated as missing once older than ``ttl`` seconds.
+
+    Every invalidation bumps ``generation``. A result computed before an
+    invalidation is dropped when stored with the generation it started in.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize query cache
+
+        Args:
+            max_size: Maximum number of cached results
+            ttl: Time-to-live for each entry in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    @staticmethod
+    def make_key(query: str, top_k: int) -> Tuple[str, int]:
+        """
+        Build a cache key from a query and its result size
+
+        Args:
+            query: Natural language query
+            top_k: Number of results requested
+
+        Returns:
+            Cache key tuple of (normalized query hash, top_k)
+        """
+        normalized = " ".join(query.strip().lower().split())
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+        return digest, top_k
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        age: float = 0.0,
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            age: Seconds the value has already been alive, so restored
+                entries still expire on their original schedule
+            generation: Cache generation read before the value was computed;
+                the value is dropped if the cache was invalidated since
+
+        Returns:
+            Whether the value was stored
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+
+            self._entries[key] = (time.monotonic() - age, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            return True
+
+    def invalidate_all(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+            self.generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,139 @@
+"""Append-only JSONL log of answered queries, used to warm the query cache"""
+
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from loguru import logger
+
+
+class QueryLog:
+    """
+    Rolling log of query results
+
+    Each answered query is appended as one JSON line. Cache invalidations
+    are logged too, so results recorded before the graph last changed are
+    never replayed.
+
+    Entries are written by a background thread, so recording never does
+    file I/O on the caller's thread. Once the log passes ``max_bytes`` it
+    is rotated to a single ``.1`` backup, which bounds it to about twice
+    that size on disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize query log
+
+        Args:
+            path: Path to the JSONL log file
+            max_bytes: Size at which the log is rotated
+        """
+        self.path = Path(path)
+        self.backup_path = self.path.with_name(self.path.name + ".1")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pending: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="query-log-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, query: str, top_k: int, result: Dict[str, Any]) -> None:
+        """Queue an answered query and its result for appending"""
+        self._pending.put({"ts": time.time(), "query": query, "top_k": top_k, "result": result})
+
+    def record_invalidation(self) -> None:
+        """Queue a marker that all earlier results are stale"""
+        self._pending.put({"ts": time.time(), "invalidate": True})
+
+    def close(self) -> None:
+        """Write out queued entries and stop the writer thread"""
+        self._pending.put(None)
+        self._writer.join(timeout=5)
+
+    def _write_loop(self) -> None:
+        """Append queued entries, in batches, until close() is called"""
+        while True:
+            entries = [self._pending.get()]
+            # Drain whatever else is queued so a burst costs one open()
+            while True:
+                try:
+                    entries.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in entries
+            self._append([entry for entry in entries if entry is not None])
+            if stop:
+                return
+
+    def _append(self, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        data = b"".join(
+            orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+            for entry in entries
+        )
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+                    self.path.replace(self.backup_path)
+                with open(self.path, "ab") as f:
+                    f.write(data)
+        except OSError as e:
+            logger.warning(f"Could not write query log: {e}")
+
+    def load_top(self, max_age: float, limit: int) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Get the most frequent recent queries with their latest result
+
+        Only entries newer than ``max_age`` seconds and after the last
+        invalidation are considered. The log is compacted to those entries.
+
+        Args:
+            max_age: Maximum entry age in seconds
+            limit: Maximum number of distinct queries to return
+
+        Returns:
+            List of (entry, age in seconds) tuples, most frequent first
+        """
+        cutoff = time.time() - max_age
+        entries: List[Dict[str, Any]] = []
+
+        with self._lock:
+            sources = [p for p in (self.backup_path, self.path) if p.exists()]
+            if not sources:
+                return []
+
+            for source in sources:
+                with open(source, "rb") as f:
+                    for line in f:
+                        try:
+                            entry = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            continue
+                        if entry.get("ts", 0) < cutoff:
+                            continue
+                        if entry.get("invalidate"):
+                            entries.clear()
+                            continue
+                        entries.append(entry)
+
+            with open(self.path, "wb") as f:
+                for entry in entries:
+                    f.write(orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE))
+            self.backup_path.unlink(missing_ok=True)
+
+        counts: Counter = Counter()
+        latest: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for entry in entries:
+            key = (" ".join(entry["query"].strip().lower().split()), entry["top_k"])
+            counts[key] += 1
+            latest[key] = entry
+
+        now = time.time()
+        return [(latest[key], now - latest[key]["ts"]) for key, _ in counts.most_common(limit)]
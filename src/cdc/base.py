@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Collection, Dict, Optional
 
 
 class ChangeOperation(Enum):
@@ -16,7 +16,7 @@ class ChangeOperation(Enum):
     DDL = "DDL"  # Schema changes
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeEvent:
     """
     Unified change event format across all databases
@@ -41,7 +41,9 @@ class ChangeEvent:
     lsn: Optional[str] = None
     position: Optional[str] = None
     
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
+    
+    _identifier: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __str__(self) -> str:
         return (
@@ -50,9 +52,12 @@ class ChangeEvent:
         )
     
     def get_identifier(self) -> str:
-        """Get unique identifier for this change"""
-        pk_str = str(self.primary_key) if self.primary_key else "unknown"
-        return f"{self.schema}.{self.table}:{pk_str}:{self.timestamp.isoformat()}"
+        """Get unique identifier for this change, computed once per event"""
+        if self._identifier is None:
+            pk_str = str(self.primary_key) if self.primary_key else "unknown"
+            ts_micros = int(self.timestamp.timestamp() * 1_000_000)
+            self._identifier = f"{self.schema}.{self.table}:{pk_str}:{ts_micros}"
+        return self._identifier
 
 
 class CDCListener(ABC):
@@ -146,6 +151,9 @@ class CDCHandler(ABC):
     (Neo4j, vector store, etc.)
     """
     
+    # Most events passed to one handle_batch() call, or None for no limit
+    max_batch_size: Optional[int] = None
+    
     @abstractmethod
     def handle_change(self, event: ChangeEvent) -> None:
         """
@@ -177,6 +185,15 @@ class CDCHandler(ABC):
             True if this handler can process the event
         """
         return True
+    
+    def handled_tables(self) -> Optional[Collection[str]]:
+        """
+        Get the tables this handler processes, used to route events by table
+        
+        Returns:
+            Table names, or None if can_handle() must be checked per event
+        """
+        return None
 
 
 class CDCError(Exception):
@@ -1,6 +1,7 @@
 """CDC handlers for syncing changes to target systems"""
 
-from typing import Dict, Any, List, Optional
+from dataclasses import replace
+from typing import Callable, Collection, Dict, Any, List, Optional
 from loguru import logger
 
 from .base import CDCHandler, ChangeEvent, ChangeOperation
@@ -24,7 +25,9 @@ class GraphSyncHandler(CDCHandler):
         self,
         graph_db: GraphDatabaseConnector,
         graph_schema: GraphSchema,
-        domain_prefix: str = ""
+        domain_prefix: str = "",
+        on_change: Optional[Callable[[], None]] = None,
+        batch_size: int = 1000
     ):
         """
         Initialize graph sync handler
@@ -33,15 +36,35 @@ class GraphSyncHandler(CDCHandler):
             graph_db: Graph database connector
             graph_schema: Graph schema mapping
             domain_prefix: Prefix for node labels (e.g., "Healthcare")
+            on_change: Optional callback invoked after changes are applied
+                (e.g., to invalidate query caches)
+            batch_size: Maximum rows sent to the graph database in one write
         """
         self.graph_db = graph_db
         self.graph_schema = graph_schema
         self.domain_prefix = domain_prefix
+        self.on_change = on_change
+        self.batch_size = batch_size
+        self.max_batch_size = batch_size
         
-        self.table_to_node_type = {}
+        self.table_to_node_type = graph_schema.table_index
+        
+        self._prop_names = {
+            node_type.label: tuple(prop.name for prop in node_type.properties)
+            for node_type in graph_schema.node_types
+        }
+        
+        # Query text is built once per label so every write reuses the same plan
+        self._update_queries = {}
+        self._delete_queries = {}
+        self._truncate_queries = {}
         for node_type in graph_schema.node_types:
-            if node_type.source_table:
-                self.table_to_node_type[node_type.source_table] = node_type
+            label = node_type.label
+            self._truncate_queries[label] = f"MATCH (n:{label}) DETACH DELETE n"
+            if node_type.primary_key:
+                match = f"UNWIND $rows AS row MATCH (n:{label} {{{node_type.primary_key}: row.pk}})"
+                self._update_queries[label] = f"{match} SET n += row.props"
+                self._delete_queries[label] = f"{match} DETACH DELETE n"
     
     def handle_change(self, event: ChangeEvent) -> None:
         """Handle a single change event"""
@@ -56,10 +79,13 @@ class GraphSyncHandler(CDCHandler):
                 self._handle_truncate(event)
             else:
                 logger.warning(f"Unsupported operation: {event.operation}")
+                return
                 
         except Exception as e:
             logger.error(f"Error handling change event: {e}")
             raise
+
+        self._notify_change()
     
     def handle_batch(self, events: List[ChangeEvent]) -> None:
         """Handle a batch of change events"""
@@ -75,66 +101,77 @@ class GraphSyncHandler(CDCHandler):
             elif event.operation == ChangeOperation.DELETE:
                 deletes.append(event)
         
+        if updates:
+            updates = self._coalesce_updates(updates, deletes)
+        
         if inserts:
             self._batch_insert(inserts)
         if updates:
             self._batch_update(updates)
         if deletes:
             self._batch_delete(deletes)
+
+        if inserts or updates or deletes:
+            self._notify_change()
+
+    def _coalesce_updates(
+        self,
+        updates: List[ChangeEvent],
+        deletes: List[ChangeEvent]
+    ) -> List[ChangeEvent]:
+        """
+        Merge the updates to each node into one, dropping updates to nodes
+        deleted in the same batch
+
+        Columns are merged in event order rather than keeping only the last
+        event: wal2json leaves unchanged TOASTed columns out of an update,
+        so a later event may lack a value an earlier one changed.
+        """
+        deleted = {(event.table, self._event_pk_value(event)) for event in deletes}
+        merged: Dict[Any, ChangeEvent] = {}
+        unkeyed = []
+        
+        for event in updates:
+            pk_value = self._event_pk_value(event)
+            if pk_value is None:
+                unkeyed.append(event)
+                continue
+            key = (event.table, pk_value)
+            if key in deleted:
+                continue
+            previous = merged.get(key)
+            if previous is not None and previous.new_data and event.new_data:
+                event = replace(event, new_data={**previous.new_data, **event.new_data})
+            merged[key] = event
+        
+        return unkeyed + list(merged.values())
+    
+    def _event_pk_value(self, event: ChangeEvent) -> Any:
+        """Get the node primary key value an event targets, if its table is mapped"""
+        node_type = self.table_to_node_type.get(event.table)
+        if not node_type or not node_type.primary_key:
+            return None
+        return self._get_pk_value(event, node_type)
+    
+    def _notify_change(self) -> None:
+        """Invoke the change callback, if any"""
+        if self.on_change:
+            self.on_change()
     
     def _handle_insert(self, event: ChangeEvent) -> None:
         """Handle INSERT operation"""
-        node_type = self.table_to_node_type.get(event.table)
-        if not node_type:
-            logger.debug(f"No node type mapping for table: {event.table}")
+        if event.table not in self.table_to_node_type:
+            logger.debug("No node type mapping for table: {}", event.table)
             return
-        
-        label = node_type.label
-        properties = self._prepare_properties(event.new_data, node_type)
-        
-        self.graph_db.create_node(label, properties)
-        logger.debug(f"Created node: {label} with {len(properties)} properties")
+        self._batch_insert([event])
     
     def _handle_update(self, event: ChangeEvent) -> None:
         """Handle UPDATE operation"""
-        node_type = self.table_to_node_type.get(event.table)
-        if not node_type:
-            return
-        
-        label = node_type.label
-        properties = self._prepare_properties(event.new_data, node_type)
-        
-        if event.primary_key and node_type.primary_key:
-            pk_value = event.primary_key.get(node_type.primary_key)
-            if pk_value:
-                query = f"""
-                MATCH (n:{label} {{{node_type.primary_key}: $pk_value}})
-                SET n += $properties
-                RETURN n
-                """
-                self.graph_db.execute_query(
-                    query,
-                    {'pk_value': pk_value, 'properties': properties}
-                )
-                logger.debug(f"Updated node: {label}[{pk_value}]")
+        self._batch_update([event])
     
     def _handle_delete(self, event: ChangeEvent) -> None:
         """Handle DELETE operation"""
-        node_type = self.table_to_node_type.get(event.table)
-        if not node_type:
-            return
-        
-        label = node_type.label
-        
-        if event.primary_key and node_type.primary_key:
-            pk_value = event.primary_key.get(node_type.primary_key)
-            if pk_value:
-                query = f"""
-                MATCH (n:{label} {{{node_type.primary_key}: $pk_value}})
-                DETACH DELETE n
-                """
-                self.graph_db.execute_query(query, {'pk_value': pk_value})
-                logger.debug(f"Deleted node: {label}[{pk_value}]")
+        self._batch_delete([event])
     
     def _handle_truncate(self, event: ChangeEvent) -> None:
         """Handle TRUNCATE operation"""
@@ -143,41 +180,89 @@ class GraphSyncHandler(CDCHandler):
             return
         
         label = node_type.label
-        query = f"MATCH (n:{label}) DETACH DELETE n"
-        self.graph_db.execute_query(query)
+        self.graph_db.execute_query(self._truncate_queries[label])
         logger.info(f"Truncated all nodes with label: {label}")
     
-    def _batch_insert(self, events: List[ChangeEvent]) -> None:
-        """Batch insert multiple nodes"""
-        by_table = {}
+    def _group_by_table(self, events: List[ChangeEvent]) -> Dict[str, List[ChangeEvent]]:
+        """Group events by source table"""
+        by_table: Dict[str, List[ChangeEvent]] = {}
         for event in events:
-            if event.table not in by_table:
-                by_table[event.table] = []
-            by_table[event.table].append(event)
-        
-        for table, table_events in by_table.items():
+            by_table.setdefault(event.table, []).append(event)
+        return by_table
+    
+    def _batch_insert(self, events: List[ChangeEvent]) -> None:
+        """Batch insert multiple nodes, merging on the primary key when available"""
+        for table, table_events in self._group_by_table(events).items():
             node_type = self.table_to_node_type.get(table)
             if not node_type:
                 continue
             
+            key = node_type.primary_key if self.graph_db.supports_merge else None
+            
+            keyed_nodes = []
             nodes = []
             for event in table_events:
                 properties = self._prepare_properties(event.new_data, node_type)
-                nodes.append(properties)
+                if key and properties.get(key) is not None:
+                    keyed_nodes.append(properties)
+                else:
+                    nodes.append(properties)
             
-            if nodes:
-                self.graph_db.batch_create_nodes(node_type.label, nodes)
-                logger.info(f"Batch created {len(nodes)} nodes of type {node_type.label}")
+            for chunk in self._chunks(keyed_nodes):
+                self.graph_db.batch_merge_nodes(node_type.label, key, chunk)
+            for chunk in self._chunks(nodes):
+                self.graph_db.batch_create_nodes(node_type.label, chunk)
+            logger.info(f"Batch created {len(keyed_nodes) + len(nodes)} nodes of type {node_type.label}")
     
     def _batch_update(self, events: List[ChangeEvent]) -> None:
-        """Batch update multiple nodes"""
-        for event in events:
-            self._handle_update(event)
+        """Batch update multiple nodes with one UNWIND query per table"""
+        for table, table_events in self._group_by_table(events).items():
+            node_type = self.table_to_node_type.get(table)
+            if not node_type or not node_type.primary_key:
+                continue
+            
+            rows = []
+            for event in table_events:
+                pk_value = self._get_pk_value(event, node_type)
+                if pk_value is None:
+                    continue
+                rows.append({'pk': pk_value, 'props': self._prepare_properties(event.new_data, node_type)})
+            
+            if rows:
+                query = self._update_queries[node_type.label]
+                for chunk in self._chunks(rows):
+                    self.graph_db.execute_query(query, {'rows': chunk})
+                logger.debug(f"Batch updated {len(rows)} nodes of type {node_type.label}")
     
     def _batch_delete(self, events: List[ChangeEvent]) -> None:
-        """Batch delete multiple nodes"""
-        for event in events:
-            self._handle_delete(event)
+        """Batch delete multiple nodes with one UNWIND query per table"""
+        for table, table_events in self._group_by_table(events).items():
+            node_type = self.table_to_node_type.get(table)
+            if not node_type or not node_type.primary_key:
+                continue
+            
+            rows = []
+            for event in table_events:
+                pk_value = self._get_pk_value(event, node_type)
+                if pk_value is not None:
+                    rows.append({'pk': pk_value})
+            
+            if rows:
+                query = self._delete_queries[node_type.label]
+                for chunk in self._chunks(rows):
+                    self.graph_db.execute_query(query, {'rows': chunk})
+                logger.debug(f"Batch deleted {len(rows)} nodes of type {node_type.label}")
+    
+    def _chunks(self, rows: List[Any]) -> List[List[Any]]:
+        """Split rows into writes of at most batch_size"""
+        return [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+    
+    @staticmethod
+    def _get_pk_value(event: ChangeEvent, node_type) -> Any:
+        """Get the node's primary key value from an event, or None if missing"""
+        if not event.primary_key:
+            return None
+        return event.primary_key.get(node_type.primary_key)
     
     def _prepare_properties(
         self,
@@ -188,18 +273,19 @@ class GraphSyncHandler(CDCHandler):
         if not data:
             return {}
 
-        properties = {}
-        for prop in node_type.properties:
-            if prop.name in data:
-                value = data[prop.name]
-                if value is not None:
-                    properties[prop.name] = value
-
-        return properties
+        return {
+            name: value
+            for name in self._prop_names[node_type.label]
+            if (value := data.get(name)) is not None
+        }
     
     def can_handle(self, event: ChangeEvent) -> bool:
         """Check if this handler can process the event"""
         return event.table in self.table_to_node_type
+    
+    def handled_tables(self) -> Collection[str]:
+        """Get the source tables this handler processes"""
+        return self.table_to_node_type.keys()
 
 
 class EmbeddingSyncHandler(CDCHandler):
@@ -213,7 +299,8 @@ class EmbeddingSyncHandler(CDCHandler):
         self,
         embedding_service: EmbeddingService,
         vector_store: VectorStore,
-        graph_schema: GraphSchema
+        graph_schema: GraphSchema,
+        batch_size: int = 100
     ):
         """
         Initialize embedding sync handler
@@ -222,25 +309,27 @@ class EmbeddingSyncHandler(CDCHandler):
             embedding_service: Service for generating embeddings
             vector_store: Vector store for storing embeddings
             graph_schema: Graph schema mapping
+            batch_size: Number of texts sent in each embedding request
         """
         self.embedding_service = embedding_service
         self.vector_store = vector_store
         self.graph_schema = graph_schema
+        self.batch_size = batch_size
         
-        self.table_to_node_type = {}
-        for node_type in graph_schema.node_types:
-            if node_type.source_table:
-                self.table_to_node_type[node_type.source_table] = node_type
+        self.table_to_node_type = graph_schema.table_index
+        
+        self._prop_names = {
+            node_type.label: tuple(prop.name for prop in node_type.properties)
+            for node_type in graph_schema.node_types
+        }
     
     def handle_change(self, event: ChangeEvent) -> None:
-        """Handle a single change event"""
+        """Handle a single change event through the batched embedding path"""
         try:
-            if event.operation == ChangeOperation.INSERT:
-                self._handle_insert(event)
-            elif event.operation == ChangeOperation.UPDATE:
-                self._handle_update(event)
-            elif event.operation == ChangeOperation.DELETE:
+            if event.operation == ChangeOperation.DELETE:
                 self._handle_delete(event)
+            else:
+                self.handle_batch([event])
                 
         except Exception as e:
             logger.error(f"Error updating embeddings: {e}")
@@ -250,66 +339,56 @@ class EmbeddingSyncHandler(CDCHandler):
         """Handle a batch of change events"""
         texts = []
         metadatas = []
+        # Bulk loads often stamp many events with the same time
+        timestamps: Dict[Any, str] = {}
         
         for event in events:
-            if event.operation in [ChangeOperation.INSERT, ChangeOperation.UPDATE]:
+            if event.operation in (ChangeOperation.INSERT, ChangeOperation.UPDATE):
                 node_type = self.table_to_node_type.get(event.table)
                 if node_type and event.new_data:
-                    text = self._create_text_representation(event.new_data, node_type)
-                    metadata = {
+                    timestamp = timestamps.get(event.timestamp)
+                    if timestamp is None:
+                        timestamp = timestamps[event.timestamp] = event.timestamp.isoformat()
+                    
+                    texts.append(self._create_text_representation(event.new_data, node_type))
+                    metadatas.append({
                         'table': event.table,
                         'label': node_type.label,
                         'operation': event.operation.value,
-                        'timestamp': event.timestamp.isoformat()
-                    }
-                    texts.append(text)
-                    metadatas.append(metadata)
+                        'timestamp': timestamp
+                    })
         
         if texts:
-            embeddings = self.embedding_service.embed_texts(texts)
+            embeddings = self.embedding_service.embed_texts(
+                texts,
+                batch_size=self.batch_size,
+                as_array=True
+            )
             self.vector_store.add_vectors(embeddings, metadatas)
             logger.info(f"Added {len(embeddings)} embeddings to vector store")
     
-    def _handle_insert(self, event: ChangeEvent) -> None:
-        """Handle INSERT - create new embedding"""
-        node_type = self.table_to_node_type.get(event.table)
-        if not node_type or not event.new_data:
-            return
-        
-        text = self._create_text_representation(event.new_data, node_type)
-        embedding = self.embedding_service.embed_text(text)
-        
-        metadata = {
-            'table': event.table,
-            'label': node_type.label,
-            'timestamp': event.timestamp.isoformat()
-        }
-        
-        self.vector_store.add_vectors([embedding], [metadata])
-    
-    def _handle_update(self, event: ChangeEvent) -> None:
-        """Handle UPDATE - update existing embedding"""
-        self._handle_insert(event)
-    
     def _handle_delete(self, event: ChangeEvent) -> None:
         """Handle DELETE - remove embedding"""
-        logger.debug(f"Delete embedding for {event.table}")
+        logger.debug("Delete embedding for {}", event.table)
     
     def _create_text_representation(
         self,
         data: Dict[str, Any],
         node_type
     ) -> str:
-        """Create text representation of data for embedding"""
-        parts = [f"Label: {node_type.label}"]
-        
-        for key, value in data.items():
-            if value is not None:
-                parts.append(f"{key}: {value}")
-        
-        return ", ".join(parts)
+        """Create text representation of the node's mapped properties for embedding"""
+        parts = ", ".join(
+            f"{name}: {value}"
+            for name in self._prop_names[node_type.label]
+            if (value := data.get(name)) is not None
+        )
+        return f"Label: {node_type.label}, {parts}" if parts else f"Label: {node_type.label}"
     
     def can_handle(self, event: ChangeEvent) -> bool:
         """Check if this handler can process the event"""
         return event.table in self.table_to_node_type
+    
+    def handled_tables(self) -> Collection[str]:
+        """Get the source tables this handler processes"""
+        return self.table_to_node_type.keys()
 
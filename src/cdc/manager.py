@@ -2,13 +2,15 @@
 
 import threading
 import time
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from loguru import logger
 
 from .base import CDCListener, ChangeEvent, CDCHandler, CDCError
+from ..metrics import CDC_EVENTS, CDC_EVENTS_FAILED, CDC_BATCH_SECONDS
 
 
 class CDCManager:
@@ -22,11 +24,16 @@ class CDCManager:
     - Tracks CDC status and metrics
     """
     
+    # Most recent handler errors kept for get_status(), and their max length
+    MAX_ERRORS = 1000
+    MAX_ERROR_LENGTH = 256
+    
     def __init__(
         self,
         batch_size: int = 100,
         batch_timeout: float = 5.0,
-        enable_batching: bool = True
+        enable_batching: bool = True,
+        max_pending: Optional[int] = None
     ):
         """
         Initialize CDC Manager
@@ -35,27 +42,47 @@ class CDCManager:
             batch_size: Number of events to batch before processing
             batch_timeout: Max seconds to wait before processing partial batch
             enable_batching: Whether to batch events or process immediately
+            max_pending: Most events queued for batching before listeners
+                are blocked until a batch is taken (default 10 batches)
         """
         self.listeners: Dict[str, CDCListener] = {}
         self.handlers: List[CDCHandler] = []
+        # table -> handlers for it, plus handlers that check every event
+        self._table_routes: Dict[str, List[CDCHandler]] = defaultdict(list)
+        self._unrouted_handlers: List[CDCHandler] = []
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout
         self.enable_batching = enable_batching
+        self.max_pending = max_pending or batch_size * 10
         
-        self.event_queue: List[ChangeEvent] = []
-        self.queue_lock = threading.Lock()
+        self.event_queue: Deque[ChangeEvent] = deque()
+        # Both conditions share one lock guarding event_queue and stopping:
+        # queue_cond is notified when a batch fills up, queue_space when a
+        # batch is taken, waking listeners blocked on a full queue. Blocking
+        # the listener's delivery thread is what pushes backpressure back to
+        # the replication stream rather than buffering WAL here
+        queue_lock = threading.Lock()
+        self.queue_cond = threading.Condition(queue_lock)
+        self.queue_space = threading.Condition(queue_lock)
+        # Held while a batch is taken and processed so batches apply in order
+        self.process_lock = threading.Lock()
         self.batch_thread: Optional[threading.Thread] = None
-        self.stop_batching = threading.Event()
+        self.stopping = False
+        # Runs independent handlers of one batch concurrently
+        self._handler_pool: Optional[ThreadPoolExecutor] = None
         
         self.metrics = {
-            'events_received': 0,
             'events_processed': 0,
             'events_failed': 0,
             'batches_processed': 0,
-            'last_event_time': None,
-            'errors': []
+            'errors': deque(maxlen=self.MAX_ERRORS)
         }
         self.metrics_lock = threading.Lock()
+        
+        # Listener threads count events under metrics_lock; the timestamp is
+        # a single attribute store, so it is written without it
+        self._events_received = 0
+        self._last_event_monotonic: Optional[float] = None
     
     def register_listener(
         self,
@@ -92,6 +119,14 @@ class CDCManager:
             handler: Handler to process change events
         """
         self.handlers.append(handler)
+        
+        tables = handler.handled_tables()
+        if tables is None:
+            self._unrouted_handlers.append(handler)
+        else:
+            for table in tables:
+                self._table_routes[table].append(handler)
+        
         logger.info(f"Added CDC handler: {handler.__class__.__name__}")
     
     def start_all(self) -> None:
@@ -101,7 +136,12 @@ class CDCManager:
             return
         
         if self.enable_batching:
-            self.stop_batching.clear()
+            self.stopping = False
+            if len(self.handlers) > 1:
+                self._handler_pool = ThreadPoolExecutor(
+                    max_workers=len(self.handlers),
+                    thread_name_prefix="cdc-handler"
+                )
             self.batch_thread = threading.Thread(
                 target=self._batch_processor,
                 daemon=True
@@ -126,13 +166,21 @@ class CDCManager:
                 logger.error(f"Error stopping listener '{name}': {e}")
         
         if self.batch_thread:
-            self.stop_batching.set()
+            with self.queue_cond:
+                self.stopping = True
+                self.queue_cond.notify_all()
+                self.queue_space.notify_all()
             self.batch_thread.join(timeout=10)
             
-            if self.event_queue:
-                logger.info(f"Processing {len(self.event_queue)} remaining events")
-                self._process_batch(self.event_queue)
-                self.event_queue.clear()
+            with self.process_lock:
+                batch = self._take_batch()
+                if batch:
+                    logger.info(f"Processing {len(batch)} remaining events")
+                    self._process_batch(batch)
+        
+        if self._handler_pool:
+            self._handler_pool.shutdown(wait=True)
+            self._handler_pool = None
     
     def _handle_change(self, event: ChangeEvent) -> None:
         """
@@ -142,68 +190,109 @@ class CDCManager:
             event: Change event to process
         """
         with self.metrics_lock:
-            self.metrics['events_received'] += 1
-            self.metrics['last_event_time'] = datetime.now()
+            self._events_received += 1
+        self._last_event_monotonic = time.monotonic()
+        CDC_EVENTS.labels(table=event.table, operation=event.operation.value).inc()
+        
+        # Drop events for tables no handler is interested in before queueing
+        if not self._unrouted_handlers and event.table not in self._table_routes:
+            return
         
         if self.enable_batching:
-            with self.queue_lock:
+            with self.queue_cond:
+                while len(self.event_queue) >= self.max_pending and not self.stopping:
+                    self.queue_space.wait()
                 self.event_queue.append(event)
-                
                 if len(self.event_queue) >= self.batch_size:
-                    batch = self.event_queue.copy()
-                    self.event_queue.clear()
-                    self._process_batch(batch)
+                    self.queue_cond.notify()
         else:
             self._process_event(event)
     
+    def _take_batch(self) -> List[ChangeEvent]:
+        """Swap out the queued events, holding the queue lock only for the swap"""
+        with self.queue_cond:
+            batch, self.event_queue = self.event_queue, deque()
+            self.queue_space.notify_all()
+        return list(batch)
+    
     def _batch_processor(self) -> None:
-        """Background thread to process batches on timeout"""
-        last_process_time = time.time()
-        
-        while not self.stop_batching.is_set():
-            time.sleep(0.5)
-            
-            current_time = time.time()
-            elapsed = current_time - last_process_time
+        """Background thread to process batches when full or on timeout"""
+        while True:
+            with self.queue_cond:
+                self.queue_cond.wait_for(
+                    lambda: self.stopping or len(self.event_queue) >= self.batch_size,
+                    timeout=self.batch_timeout
+                )
+                if self.stopping:
+                    return
             
-            if elapsed >= self.batch_timeout:
-                with self.queue_lock:
-                    if self.event_queue:
-                        batch = self.event_queue.copy()
-                        self.event_queue.clear()
-                        self._process_batch(batch)
-                
-                last_process_time = current_time
+            with self.process_lock:
+                self._process_batch(self._take_batch())
     
     def _process_batch(self, events: List[ChangeEvent]) -> None:
         """Process a batch of events"""
         if not events:
             return
         
-        logger.debug(f"Processing batch of {len(events)} events")
+        with CDC_BATCH_SECONDS.time():
+            self._dispatch_batch(events)
+    
+    def _dispatch_batch(self, events: List[ChangeEvent]) -> None:
+        """Hand each handler the events it can handle"""
+        buckets: Dict[int, List[ChangeEvent]] = defaultdict(list)
+        for event in events:
+            for handler in self._table_routes.get(event.table, ()):
+                buckets[id(handler)].append(event)
+        for handler in self._unrouted_handlers:
+            buckets[id(handler)] = [e for e in events if handler.can_handle(e)]
         
-        for handler in self.handlers:
-            handler_events = [e for e in events if handler.can_handle(e)]
+        if not buckets:
+            return
+        
+        work = [
+            (handler, buckets[id(handler)])
+            for handler in self.handlers
+            if buckets.get(id(handler))
+        ]
+        
+        # Handlers share no state, so they run side by side; the batch is
+        # only done once every handler has finished with it
+        if self._handler_pool and len(work) > 1:
+            wait([
+                self._handler_pool.submit(self._run_handler_batch, handler, handler_events)
+                for handler, handler_events in work
+            ])
+        else:
+            for handler, handler_events in work:
+                self._run_handler_batch(handler, handler_events)
+    
+    def _run_handler_batch(self, handler: CDCHandler, events: List[ChangeEvent]) -> None:
+        """Run one handler on its events, in chunks of its max_batch_size"""
+        chunk_size = handler.max_batch_size or len(events)
+        for i in range(0, len(events), chunk_size):
+            self._run_handler_chunk(handler, events[i:i + chunk_size])
+    
+    def _run_handler_chunk(self, handler: CDCHandler, events: List[ChangeEvent]) -> None:
+        """Run one handle_batch() call and record the outcome"""
+        try:
+            handler.handle_batch(events)
             
-            if handler_events:
-                try:
-                    handler.handle_batch(handler_events)
-                    
-                    with self.metrics_lock:
-                        self.metrics['events_processed'] += len(handler_events)
-                        self.metrics['batches_processed'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error in handler {handler.__class__.__name__}: {e}")
-                    
-                    with self.metrics_lock:
-                        self.metrics['events_failed'] += len(handler_events)
-                        self.metrics['errors'].append({
-                            'handler': handler.__class__.__name__,
-                            'error': str(e),
-                            'timestamp': datetime.now(),
-                            'event_count': len(handler_events)
-                        })
+            with self.metrics_lock:
+                self.metrics['events_processed'] += len(events)
+                self.metrics['batches_processed'] += 1
+                
+        except Exception as e:
+            logger.error(f"Error in handler {handler.__class__.__name__}: {e}")
+            
+            CDC_EVENTS_FAILED.labels(handler=handler.__class__.__name__).inc(len(events))
+            with self.metrics_lock:
+                self.metrics['events_failed'] += len(events)
+                self.metrics['errors'].append({
+                    'handler': handler.__class__.__name__,
+                    'error': str(e)[:self.MAX_ERROR_LENGTH],
+                    'timestamp': datetime.now(),
+                    'event_count': len(events)
+                })
     
     def _process_event(self, event: ChangeEvent) -> None:
         """Process a single event immediately"""
@@ -218,26 +307,48 @@ class CDCManager:
                 except Exception as e:
                     logger.error(f"Error in handler {handler.__class__.__name__}: {e}")
                     
+                    CDC_EVENTS_FAILED.labels(handler=handler.__class__.__name__).inc()
                     with self.metrics_lock:
                         self.metrics['events_failed'] += 1
                         self.metrics['errors'].append({
                             'handler': handler.__class__.__name__,
-                            'error': str(e),
+                            'error': str(e)[:self.MAX_ERROR_LENGTH],
                             'timestamp': datetime.now(),
-                            'event': str(event)
+                            'event': (event.table, event.operation.value, event.primary_key)
                         })
     
-    def get_status(self) -> Dict[str, Any]:
-        """Get status of all CDC listeners and overall metrics"""
+    def get_status(self, include_errors: bool = False) -> Dict[str, Any]:
+        """
+        Get status of all CDC listeners and overall metrics
+        
+        Args:
+            include_errors: Whether to include the recent error entries,
+                not just their count
+        """
+        with self.metrics_lock:
+            metrics = {
+                'events_received': self._events_received,
+                'events_processed': self.metrics['events_processed'],
+                'events_failed': self.metrics['events_failed'],
+                'batches_processed': self.metrics['batches_processed'],
+                'last_event_time': self._last_event_time(),
+                'errors_count': len(self.metrics['errors'])
+            }
+            if include_errors:
+                metrics['errors'] = list(self.metrics['errors'])
+        
+        with self.queue_cond:
+            queue_size = len(self.event_queue)
+        
         status = {
             'listeners': {},
             'handlers': [h.__class__.__name__ for h in self.handlers],
-            'metrics': self.metrics.copy(),
+            'metrics': metrics,
             'batching': {
                 'enabled': self.enable_batching,
                 'batch_size': self.batch_size,
                 'batch_timeout': self.batch_timeout,
-                'queue_size': len(self.event_queue)
+                'queue_size': queue_size
             }
         }
         
@@ -249,6 +360,13 @@ class CDCManager:
         
         return status
     
+    def _last_event_time(self) -> Optional[datetime]:
+        """Convert the monotonic time of the last event to wall-clock time"""
+        last = self._last_event_monotonic
+        if last is None:
+            return None
+        return datetime.now() - timedelta(seconds=time.monotonic() - last)
+    
     def cleanup_all(self) -> None:
         """Clean up all CDC resources"""
         for name, listener in self.listeners.items():
@@ -1,13 +1,18 @@
 """PostgreSQL CDC listener using logical replication"""
 
-import json
+import os
+import queue
+import selectors
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Union
 
+import orjson
 import psycopg2
-from psycopg2.extras import LogicalReplicationConnection, ReplicationCursor
+from psycopg2 import pool as pg_pool
+from psycopg2 import sql
 from loguru import logger
 
 from .base import (
@@ -19,6 +24,19 @@ from .base import (
     CDCPositionError
 )
 
+if TYPE_CHECKING:
+    from psycopg2.extras import ReplicationCursor
+
+# Transaction control messages (BEGIN, COMMIT)
+_SKIP_ACTIONS = frozenset({'B', 'C'})
+# Messages read before the receive time used for untimestamped events is refreshed
+_RECV_TIME_REFRESH = 1000
+
+
+def _columns_to_dict(columns: list) -> Dict[str, Any]:
+    """Convert a wal2json column list to a name -> value dict"""
+    return {col['name']: col.get('value') for col in columns}
+
 
 class PostgreSQLCDCListener(CDCListener):
     """
@@ -33,7 +51,10 @@ class PostgreSQLCDCListener(CDCListener):
         connection_config: Dict[str, Any],
         slot_name: str = "graph_sync_slot",
         publication_name: str = "graph_sync_pub",
-        tables: Optional[list[str]] = None
+        tables: Optional[list[str]] = None,
+        feedback_flush_size: int = 100,
+        feedback_flush_interval: float = 1.0,
+        max_queued_events: int = 1000
     ):
         """
         Initialize PostgreSQL CDC listener
@@ -43,23 +64,70 @@ class PostgreSQLCDCListener(CDCListener):
             slot_name: Name of the replication slot
             publication_name: Name of the publication
             tables: List of tables to monitor (None = all tables)
+            feedback_flush_size: Messages processed before the flushed LSN
+                is reported back to the server
+            feedback_flush_interval: Max seconds a processed LSN waits
+                before being reported
+            max_queued_events: Parsed events buffered for delivery before
+                the stream thread stops reading from the server
         """
         super().__init__(connection_config)
+        self._conn_params = self._build_connection_params()
+        # wal2json action code -> parser specialized for that operation
+        self._action_parsers = {
+            'I': self._parse_insert,
+            'U': self._parse_update,
+            'D': self._parse_delete,
+            'T': self._parse_truncate
+        }
         self.slot_name = slot_name
         self.publication_name = publication_name
+        # Shared by every event this listener emits; events never mutate it
+        self._static_metadata = {
+            'publication': publication_name,
+            'slot': slot_name,
+            'plugin': 'wal2json'
+        }
         self.tables = tables
+        # wal2json decodes every table in the database, so changes to tables
+        # outside `tables` are dropped before their rows are materialized
+        self._qualified_tables, self._bare_tables = self._split_table_names(tables)
+        self.feedback_flush_size = feedback_flush_size
+        self.feedback_flush_interval = feedback_flush_interval
+        self.max_queued_events = max_queued_events
+        self._feedback_lsn: Optional[int] = None
+        self._pending_feedback = 0
+        self._last_feedback_time = time.monotonic()
         self.replication_conn = None
-        self.replication_cursor: Optional[ReplicationCursor] = None
+        self.replication_cursor: Optional["ReplicationCursor"] = None
         self.stream_thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        # Self-pipe written by stop_streaming to wake the stream thread's select()
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        # Parsed (lsn, event) pairs for the delivery thread, and the LSNs it has
+        # finished with; feedback only ever covers acknowledged LSNs. The event
+        # queue is bounded: when delivery falls behind, the stream thread blocks
+        # and WAL is retained on the slot instead of piling up in memory
+        self._event_queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_queued_events)
+        self._ack_queue: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        self.delivery_thread: Optional[threading.Thread] = None
+        # Short-lived admin queries (setup, cleanup, status) reuse pooled
+        # connections; replication always gets its own dedicated connection
+        self._admin_pool: Optional[pg_pool.ThreadedConnectionPool] = None
+        self._admin_pool_lock = threading.Lock()
         
     def setup(self) -> None:
         """Set up PostgreSQL logical replication"""
         try:
-            conn = psycopg2.connect(**self._get_connection_params())
-            conn.autocommit = True
-            cursor = conn.cursor()
-
+            with self._admin_connection() as conn:
+                self._setup_replication(conn)
+        except Exception as e:
+            raise CDCSetupError(f"Failed to set up PostgreSQL CDC: {e}")
+    
+    def _setup_replication(self, conn) -> None:
+        """Create the publication and replication slot if missing"""
+        with conn.cursor() as cursor:
             cursor.execute("SHOW wal_level")
             wal_level = cursor.fetchone()[0]
             if wal_level != 'logical':
@@ -75,15 +143,19 @@ class PostgreSQLCDCListener(CDCListener):
 
             if not cursor.fetchone():
                 if self.tables:
-                    tables_str = ", ".join(self.tables)
+                    tables_sql = sql.SQL(", ").join(
+                        sql.Identifier(*name.strip().split('.')) for name in self.tables
+                    )
                     cursor.execute(
-                        f"CREATE PUBLICATION {self.publication_name} "
-                        f"FOR TABLE {tables_str}"
+                        sql.SQL("CREATE PUBLICATION {} FOR TABLE {}").format(
+                            sql.Identifier(self.publication_name), tables_sql
+                        )
                     )
                 else:
                     cursor.execute(
-                        f"CREATE PUBLICATION {self.publication_name} "
-                        f"FOR ALL TABLES"
+                        sql.SQL("CREATE PUBLICATION {} FOR ALL TABLES").format(
+                            sql.Identifier(self.publication_name)
+                        )
                     )
                 logger.info(f"Created publication: {self.publication_name}")
             else:
@@ -95,8 +167,9 @@ class PostgreSQLCDCListener(CDCListener):
             )
             
             if not cursor.fetchone():
+                from psycopg2.extras import LogicalReplicationConnection
                 repl_conn = psycopg2.connect(
-                    **self._get_connection_params(),
+                    **self._conn_params,
                     connection_factory=LogicalReplicationConnection
                 )
                 repl_cursor = repl_conn.cursor()
@@ -109,12 +182,6 @@ class PostgreSQLCDCListener(CDCListener):
                 repl_conn.close()
             else:
                 logger.info(f"Replication slot already exists: {self.slot_name}")
-            
-            cursor.close()
-            conn.close()
-            
-        except Exception as e:
-            raise CDCSetupError(f"Failed to set up PostgreSQL CDC: {e}")
     
     def start_streaming(self, callback: Callable[[ChangeEvent], None]) -> None:
         """Start streaming changes from PostgreSQL"""
@@ -124,87 +191,184 @@ class PostgreSQLCDCListener(CDCListener):
         
         self.is_running = True
         self.stop_event.clear()
+        self._wake_r, self._wake_w = os.pipe()
+        self._event_queue = queue.Queue(maxsize=self.max_queued_events)
+        self._ack_queue = queue.SimpleQueue()
+        
+        self.delivery_thread = threading.Thread(
+            target=self._deliver_events,
+            args=(callback,),
+            daemon=True
+        )
+        self.delivery_thread.start()
         
         self.stream_thread = threading.Thread(
             target=self._stream_changes,
-            args=(callback,),
             daemon=True
         )
         self.stream_thread.start()
         logger.info("Started PostgreSQL CDC streaming")
     
-    def _stream_changes(self, callback: Callable[[ChangeEvent], None]) -> None:
+    def _stream_changes(self) -> None:
         """Internal method to stream changes (runs in separate thread)"""
+        from psycopg2.extras import LogicalReplicationConnection
+        
+        selector = selectors.DefaultSelector()
         try:
             self.replication_conn = psycopg2.connect(
-                **self._get_connection_params(),
+                **self._conn_params,
                 connection_factory=LogicalReplicationConnection
             )
             self.replication_cursor = self.replication_conn.cursor()
             
+            # Format 2 sends one change per message; BEGIN/COMMIT messages
+            # carry nothing the handlers use, so they are not requested
             options = {
                 'format-version': 2,
                 'include-timestamp': True,
-                'include-transaction': True,
+                'include-transaction': False,
                 'include-lsn': True
             }
+            # Payloads stay raw bytes; orjson parses them without a UTF-8 decode step
             self.replication_cursor.start_replication(
                 slot_name=self.slot_name,
-                decode=True,
+                decode=False,
                 options=options
             )
             
             logger.info(f"Streaming from replication slot: {self.slot_name}")
 
+            selector.register(self.replication_conn, selectors.EVENT_READ)
+            selector.register(self._wake_r, selectors.EVENT_READ)
+
+            # Bound once; the loop runs per replication message
+            read_message = self.replication_cursor.read_message
+            process_message = self._process_message
+            stopped = self.stop_event.is_set
+            flush_interval = self.feedback_flush_interval
+
             message_count = 0
-            while not self.stop_event.is_set():
-                msg = self.replication_cursor.read_message()
+            # Read once per burst of messages rather than once per event
+            recv_time = datetime.now()
+            while not stopped():
+                msg = read_message()
 
                 if msg:
                     message_count += 1
-                    logger.debug(f"Received message #{message_count}: data_start={msg.data_start}, payload_size={len(msg.payload) if msg.payload else 0}")
-                    self._process_message(msg, callback)
+                    if message_count % _RECV_TIME_REFRESH == 0:
+                        recv_time = datetime.now()
+                    logger.debug(
+                        "Received message #{}: data_start={}, payload_size={}",
+                        message_count,
+                        msg.data_start,
+                        len(msg.payload) if msg.payload else 0
+                    )
+                    process_message(msg, recv_time)
                 else:
-                    time.sleep(0.1)
+                    # Nothing to read: acknowledge what has been delivered so far,
+                    # then block until the server sends more or we are stopped
+                    self._collect_acks()
+                    self._flush_feedback()
+                    selector.select(timeout=flush_interval)
+                    recv_time = datetime.now()
                     
         except Exception as e:
             logger.error(f"Error in CDC streaming: {e}")
             raise CDCStreamError(f"CDC streaming failed: {e}")
         finally:
+            self._event_queue.put(None)
+            if self.delivery_thread:
+                self.delivery_thread.join(timeout=5)
             if self.replication_cursor:
+                try:
+                    self._collect_acks()
+                    self._flush_feedback()
+                except Exception as e:
+                    logger.warning(f"Could not send final replication feedback: {e}")
                 self.replication_cursor.close()
             if self.replication_conn:
                 self.replication_conn.close()
+            selector.close()
+            wake_fds = (self._wake_r, self._wake_w)
+            self._wake_r = self._wake_w = None
+            for fd in wake_fds:
+                if fd is not None:
+                    os.close(fd)
     
-    def _process_message(
-        self,
-        msg,
-        callback: Callable[[ChangeEvent], None]
-    ) -> None:
-        """Process a replication message"""
+    def _process_message(self, msg, recv_time: datetime) -> None:
+        """Parse a replication message and queue it for delivery"""
         try:
             payload = msg.payload
 
-            logger.debug(f"Processing message payload: {payload[:200] if payload else 'EMPTY'}")
+            logger.opt(lazy=True).debug(
+                "Processing message payload: {}",
+                lambda: payload[:200] if payload else 'EMPTY'
+            )
 
             self.current_position = str(msg.data_start)
 
-            event = self._parse_wal2json(payload)
-            if event:
-                logger.info(f"Parsed event: {event.operation.value} on {event.schema}.{event.table}")
-                callback(event)
-            else:
+            event = self._parse_wal2json(payload, recv_time)
+            if not event:
                 logger.debug("No event parsed from payload")
 
-            msg.cursor.send_feedback(flush_lsn=msg.data_start)
+            # Messages without an event are queued too, so acks stay in LSN order
+            self._event_queue.put((msg.data_start, event))
+
+            self._collect_acks()
+            if (
+                self._pending_feedback >= self.feedback_flush_size
+                or time.monotonic() - self._last_feedback_time >= self.feedback_flush_interval
+            ):
+                self._flush_feedback()
 
+        except psycopg2.Error as e:
+            logger.warning(f"Could not send replication feedback: {e}")
         except Exception as e:
-            logger.error(f"Error processing message: {e}", exc_info=True)
+            logger.exception(f"Error processing message: {e}")
+    
+    def _deliver_events(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """Hand queued events to the callback (runs in separate thread)"""
+        while True:
+            item = self._event_queue.get()
+            if item is None:
+                return
+            lsn, event = item
+            if event:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.exception(f"Error delivering change event: {e}")
+                    continue
+            self._ack_queue.put(lsn)
+    
+    def _collect_acks(self) -> None:
+        """Record LSNs the delivery thread has finished with"""
+        while True:
+            try:
+                lsn = self._ack_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._feedback_lsn = lsn
+            self._pending_feedback += 1
+    
+    def _flush_feedback(self) -> None:
+        """Report the last processed LSN to the server if any are pending"""
+        if not self._pending_feedback:
+            return
+        self.replication_cursor.send_feedback(flush_lsn=self._feedback_lsn)
+        self._pending_feedback = 0
+        self._last_feedback_time = time.monotonic()
     
-    def _parse_wal2json(self, payload: str) -> Optional[ChangeEvent]:
+    def _parse_wal2json(
+        self,
+        payload: Union[bytes, str],
+        recv_time: Optional[datetime] = None
+    ) -> Optional[ChangeEvent]:
         """
         Parse wal2json output format (JSON)
 
+        recv_time is used as the timestamp of changes that carry none.
+
         Example wal2json format version 2:
         {
             "action": "I",  # I=INSERT, U=UPDATE, D=DELETE, T=TRUNCATE
@@ -222,31 +386,16 @@ class PostgreSQLCDCListener(CDCListener):
         }
         """
         try:
-            data = json.loads(payload)
-
-            if 'change' in data:
-                if not data['change']:
-                    return None
-                change = data['change'][0]
-            else:
-                change = data
-
-            action_map = {
-                'I': ChangeOperation.INSERT,
-                'U': ChangeOperation.UPDATE,
-                'D': ChangeOperation.DELETE,
-                'T': ChangeOperation.TRUNCATE
-            }
+            change = orjson.loads(payload)
 
-            action = change.get('action') or change.get('kind')
+            action = change.get('action')
 
-            # Ignore transaction control messages (BEGIN, COMMIT)
-            if action in ('B', 'C'):
-                logger.debug(f"Ignoring transaction control message: {action}")
+            if action in _SKIP_ACTIONS:
+                logger.debug("Ignoring transaction control message: {}", action)
                 return None
 
-            operation = action_map.get(action)
-            if not operation:
+            parse = self._action_parsers.get(action)
+            if parse is None:
                 logger.warning(f"Unknown action: {action}")
                 return None
 
@@ -257,63 +406,165 @@ class PostgreSQLCDCListener(CDCListener):
                 logger.warning("No table name in wal2json output")
                 return None
 
-            new_data = None
-            if 'columns' in change:
-                new_data = {
-                    col['name']: col.get('value')
-                    for col in change['columns']
-                }
-
-            old_data = None
-            if 'identity' in change:
-                old_data = {
-                    col['name']: col.get('value')
-                    for col in change['identity']
-                }
+            if not self._is_monitored(schema, table):
+                return None
 
-            primary_key = None
-            if old_data:
-                primary_key = old_data.copy()
-            elif new_data:
-                primary_key = self._extract_pk_from_data(new_data)
+            return parse(change, schema, table, recv_time)
 
-            timestamp = datetime.now()
-            if 'timestamp' in change:
-                try:
-                    from dateutil import parser as date_parser
-                    timestamp = date_parser.parse(change['timestamp'])
-                except:
-                    pass
-
-            return ChangeEvent(
-                operation=operation,
-                table=table,
-                schema=schema,
-                timestamp=timestamp,
-                database_type='postgres',
-                old_data=old_data,
-                new_data=new_data,
-                primary_key=primary_key,
-                lsn=change.get('lsn') or self.current_position,
-                transaction_id=data.get('xid'),
-                metadata={
-                    'publication': self.publication_name,
-                    'slot': self.slot_name,
-                    'plugin': 'wal2json',
-                    'nextlsn': data.get('nextlsn')
-                }
-            )
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing wal2json JSON: {e}")
-            logger.debug(f"Payload: {payload}")
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            # Malformed payloads are expected noise: no traceback, and the
+            # payload is only formatted when debug logging is on
+            logger.warning(f"Skipping malformed wal2json payload: {e!r}")
+            logger.debug("Payload: {}", payload)
             return None
         except Exception as e:
-            logger.error(f"Error parsing wal2json output: {e}")
-            logger.debug(f"Payload: {payload}")
+            logger.exception(f"Error parsing wal2json output: {e}")
+            return None
+
+    def _parse_insert(
+        self,
+        change: Dict[str, Any],
+        schema: str,
+        table: str,
+        recv_time: Optional[datetime]
+    ) -> ChangeEvent:
+        """Build an INSERT event; inserts carry no identity"""
+        new_data = _columns_to_dict(change['columns'])
+        return self._make_event(
+            ChangeOperation.INSERT, change, schema, table, recv_time,
+            new_data=new_data,
+            primary_key=self._extract_pk_from_data(new_data)
+        )
+
+    def _parse_update(
+        self,
+        change: Dict[str, Any],
+        schema: str,
+        table: str,
+        recv_time: Optional[datetime]
+    ) -> Optional[ChangeEvent]:
+        """Build an UPDATE event, or None for an update that changed nothing"""
+        columns = change.get('columns')
+        identity = change.get('identity')
+
+        # With REPLICA IDENTITY FULL an update that changed nothing
+        # carries identical old and new rows
+        if columns and columns == identity:
+            logger.debug("Skipping no-op update on {}.{}", schema, table)
             return None
 
-        return result
+        new_data = _columns_to_dict(columns) if columns is not None else None
+        old_data = _columns_to_dict(identity) if identity is not None else None
+
+        # Events are never mutated downstream, so the identity dict is shared
+        if old_data:
+            primary_key = old_data
+        elif new_data:
+            primary_key = self._extract_pk_from_data(new_data)
+        else:
+            primary_key = None
+
+        return self._make_event(
+            ChangeOperation.UPDATE, change, schema, table, recv_time,
+            old_data=old_data,
+            new_data=new_data,
+            primary_key=primary_key
+        )
+
+    def _parse_delete(
+        self,
+        change: Dict[str, Any],
+        schema: str,
+        table: str,
+        recv_time: Optional[datetime]
+    ) -> ChangeEvent:
+        """Build a DELETE event; deletes carry only the identity"""
+        identity = change.get('identity')
+        old_data = _columns_to_dict(identity) if identity is not None else None
+        return self._make_event(
+            ChangeOperation.DELETE, change, schema, table, recv_time,
+            old_data=old_data,
+            primary_key=old_data or None
+        )
+
+    def _parse_truncate(
+        self,
+        change: Dict[str, Any],
+        schema: str,
+        table: str,
+        recv_time: Optional[datetime]
+    ) -> ChangeEvent:
+        """Build a TRUNCATE event"""
+        return self._make_event(ChangeOperation.TRUNCATE, change, schema, table, recv_time)
+
+    def _make_event(
+        self,
+        operation: ChangeOperation,
+        change: Dict[str, Any],
+        schema: str,
+        table: str,
+        recv_time: Optional[datetime],
+        old_data: Optional[Dict[str, Any]] = None,
+        new_data: Optional[Dict[str, Any]] = None,
+        primary_key: Optional[Dict[str, Any]] = None
+    ) -> ChangeEvent:
+        """Build a ChangeEvent with the fields every operation shares"""
+        metadata = self._static_metadata
+        nextlsn = change.get('nextlsn')
+        if nextlsn:
+            metadata = {**metadata, 'nextlsn': nextlsn}
+
+        # Positional in ChangeEvent field order; this runs once per change
+        return ChangeEvent(
+            operation,
+            table,
+            schema,
+            self._parse_timestamp(change.get('timestamp'), recv_time),
+            'postgres',
+            old_data,
+            new_data,
+            primary_key,
+            None,  # ddl_statement
+            change.get('xid'),
+            change.get('lsn') or self.current_position,
+            None,  # position
+            metadata
+        )
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str], recv_time: Optional[datetime] = None) -> datetime:
+        """Parse a wal2json commit timestamp, falling back to the receive time"""
+        if not value:
+            return recv_time or datetime.now()
+        try:
+            # wal2json emits ISO 8601 ("2024-01-15 10:30:00.123456+00")
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        try:
+            from dateutil import parser as date_parser
+            return date_parser.parse(value)
+        except (ValueError, OverflowError):
+            return recv_time or datetime.now()
+
+    @staticmethod
+    def _split_table_names(tables: Optional[list[str]]) -> tuple[frozenset, frozenset]:
+        """Split configured tables into (schema, table) pairs and bare names"""
+        qualified = set()
+        bare = set()
+        for name in tables or ():
+            schema, _, table = name.strip().rpartition('.')
+            if schema:
+                qualified.add((schema, table))
+            else:
+                bare.add(table)
+        return frozenset(qualified), frozenset(bare)
+
+    def _is_monitored(self, schema: str, table: str) -> bool:
+        """Check whether changes to a table should be emitted"""
+        if not self.tables:
+            return True
+        return table in self._bare_tables or (schema, table) in self._qualified_tables
 
     def _extract_pk_from_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract primary key from data (assume 'id' column)"""
@@ -329,9 +580,14 @@ class PostgreSQLCDCListener(CDCListener):
         logger.info("Stopping PostgreSQL CDC streaming")
         self.stop_event.set()
         self.is_running = False
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
 
         if self.stream_thread:
-            self.stream_thread.join(timeout=5)
+            self.stream_thread.join(timeout=10)
 
     def get_current_position(self) -> Optional[str]:
         """Get current LSN position"""
@@ -345,50 +601,46 @@ class PostgreSQLCDCListener(CDCListener):
     def cleanup(self) -> None:
         """Clean up replication slot and publication"""
         try:
-            conn = psycopg2.connect(**self._get_connection_params())
-            conn.autocommit = True
-            cursor = conn.cursor()
-
-            cursor.execute(
-                f"SELECT pg_drop_replication_slot('{self.slot_name}') "
-                f"WHERE EXISTS (SELECT 1 FROM pg_replication_slots WHERE slot_name = '{self.slot_name}')"
-            )
-
-            cursor.execute(f"DROP PUBLICATION IF EXISTS {self.publication_name}")
+            with self._admin_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_drop_replication_slot(slot_name) "
+                    "FROM pg_replication_slots WHERE slot_name = %s",
+                    (self.slot_name,)
+                )
 
-            cursor.close()
-            conn.close()
+                cursor.execute(
+                    sql.SQL("DROP PUBLICATION IF EXISTS {}").format(
+                        sql.Identifier(self.publication_name)
+                    )
+                )
 
             logger.info("Cleaned up PostgreSQL CDC resources")
 
         except Exception as e:
             logger.error(f"Error cleaning up CDC: {e}")
+        finally:
+            self._close_admin_pool()
 
     def get_status(self) -> Dict[str, Any]:
         """Get current CDC status"""
         try:
-            conn = psycopg2.connect(**self._get_connection_params())
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT
-                    slot_name,
-                    plugin,
-                    slot_type,
-                    active,
-                    restart_lsn,
-                    confirmed_flush_lsn
-                FROM pg_replication_slots
-                WHERE slot_name = %s
-                """,
-                (self.slot_name,)
-            )
-
-            slot_info = cursor.fetchone()
+            with self._admin_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT
+                        slot_name,
+                        plugin,
+                        slot_type,
+                        active,
+                        restart_lsn,
+                        confirmed_flush_lsn
+                    FROM pg_replication_slots
+                    WHERE slot_name = %s
+                    """,
+                    (self.slot_name,)
+                )
 
-            cursor.close()
-            conn.close()
+                slot_info = cursor.fetchone()
 
             if slot_info:
                 return {
@@ -399,22 +651,49 @@ class PostgreSQLCDCListener(CDCListener):
                     'restart_lsn': str(slot_info[4]) if slot_info[4] else None,
                     'confirmed_flush_lsn': str(slot_info[5]) if slot_info[5] else None,
                     'current_position': self.current_position,
-                    'is_running': self.is_running
+                    'is_running': self.is_running,
+                    'queue_depth': self._event_queue.qsize()
                 }
             else:
                 return {
                     'error': 'Replication slot not found',
-                    'is_running': self.is_running
+                    'is_running': self.is_running,
+                    'queue_depth': self._event_queue.qsize()
                 }
 
         except Exception as e:
             return {
                 'error': str(e),
-                'is_running': self.is_running
+                'is_running': self.is_running,
+                'queue_depth': self._event_queue.qsize()
             }
 
-    def _get_connection_params(self) -> Dict[str, Any]:
-        """Get connection parameters from config"""
+    @contextmanager
+    def _admin_connection(self) -> Iterator[Any]:
+        """Borrow an autocommit connection from the admin pool"""
+        with self._admin_pool_lock:
+            if self._admin_pool is None:
+                self._admin_pool = pg_pool.ThreadedConnectionPool(
+                    1, 4, **self._conn_params
+                )
+            admin_pool = self._admin_pool
+        
+        conn = admin_pool.getconn()
+        try:
+            conn.autocommit = True
+            yield conn
+        finally:
+            admin_pool.putconn(conn, close=conn.closed != 0)
+
+    def _close_admin_pool(self) -> None:
+        """Close all pooled admin connections"""
+        with self._admin_pool_lock:
+            admin_pool, self._admin_pool = self._admin_pool, None
+        if admin_pool is not None:
+            admin_pool.closeall()
+
+    def _build_connection_params(self) -> Dict[str, Any]:
+        """Build psycopg2 connection parameters from config"""
         if isinstance(self.connection_config, str):
             return {'dsn': self.connection_config}
         else:
@@ -4,7 +4,6 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import yaml
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -32,6 +31,9 @@ class Settings(BaseSettings):
     neo4j_user: str = Field("neo4j", env="NEO4J_USER")
     neo4j_password: str = Field("neo4jpassword", env="NEO4J_PASSWORD")
     neo4j_database: str = Field("neo4j", env="NEO4J_DATABASE")
+    neo4j_pool_size: int = Field(50, env="NEO4J_POOL_SIZE")
+    neo4j_connection_acquisition_timeout: float = Field(60.0, env="NEO4J_CONNECTION_ACQUISITION_TIMEOUT")
+    neo4j_max_connection_lifetime: float = Field(600.0, env="NEO4J_MAX_CONNECTION_LIFETIME")
     
     neptune_endpoint: Optional[str] = Field(None, env="NEPTUNE_ENDPOINT")
     neptune_port: int = Field(8182, env="NEPTUNE_PORT")
@@ -42,12 +44,16 @@ class Settings(BaseSettings):
     api_host: str = Field("0.0.0.0", env="API_HOST")
     api_port: int = Field(8000, env="API_PORT")
     api_reload: bool = Field(True, env="API_RELOAD")
+    api_job_workers: int = Field(2, env="API_JOB_WORKERS")
     
     log_level: str = Field("INFO", env="LOG_LEVEL")
     
     embedding_provider: str = Field("openai", env="EMBEDDING_PROVIDER")  # openai or gemini
     embedding_model: str = Field("text-embedding-3-small", env="EMBEDDING_MODEL")
     embedding_dimension: int = Field(1536, env="EMBEDDING_DIMENSION")
+    embedding_batch_size: int = Field(100, env="EMBEDDING_BATCH_SIZE")
+    embedding_cache_enabled: bool = Field(True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_path: str = Field("data/embedding_cache.db", env="EMBEDDING_CACHE_PATH")
 
     openai_embedding_model: str = Field("text-embedding-3-small", env="OPENAI_EMBEDDING_MODEL")
     gemini_embedding_model: str = Field("models/text-embedding-004", env="GEMINI_EMBEDDING_MODEL")
@@ -65,6 +71,19 @@ class Settings(BaseSettings):
     gemini_model: str = Field("gemini-1.5-flash", env="GEMINI_MODEL")
 
     vector_store_path: str = Field("data/vector_store", env="VECTOR_STORE_PATH")
+    vector_quantization: str = Field("fp16", env="VECTOR_QUANTIZATION")  # none, fp16, or int8
+    vector_index_type: str = Field("flat", env="VECTOR_INDEX_TYPE")  # flat, hnsw, or ivfpq
+    vector_metric: str = Field("cosine", env="VECTOR_METRIC")  # cosine or l2
+    vector_device: str = Field("cpu", env="VECTOR_DEVICE")  # cpu or cuda
+
+    migration_batch_size: int = Field(5000, env="MIGRATION_BATCH_SIZE")
+    migration_workers: int = Field(4, env="MIGRATION_WORKERS")
+
+    query_cache_size: int = Field(1024, env="QUERY_CACHE_SIZE")
+    query_cache_ttl: float = Field(3600.0, env="QUERY_CACHE_TTL")
+    query_cache_warm_size: int = Field(500, env="QUERY_CACHE_WARM_SIZE")
+    query_log_path: str = Field("data/query_log.jsonl", env="QUERY_LOG_PATH")
+    query_log_max_bytes: int = Field(50 * 1024 * 1024, env="QUERY_LOG_MAX_BYTES")
 
     cdc_enabled: bool = Field(False, env="CDC_ENABLED")
     cdc_mode: str = Field("native", env="CDC_MODE")  # native, polling, hybrid
@@ -72,6 +91,8 @@ class Settings(BaseSettings):
     cdc_batch_timeout: float = Field(5.0, env="CDC_BATCH_TIMEOUT")
     cdc_enable_batching: bool = Field(True, env="CDC_ENABLE_BATCHING")
     cdc_sync_embeddings: bool = Field(True, env="CDC_SYNC_EMBEDDINGS")
+    cdc_feedback_flush_size: int = Field(100, env="CDC_FEEDBACK_FLUSH_SIZE")
+    cdc_feedback_flush_interval: float = Field(1.0, env="CDC_FEEDBACK_FLUSH_INTERVAL")
 
     postgres_cdc_slot_name: str = Field("graph_sync_slot", env="POSTGRES_CDC_SLOT_NAME")
     postgres_cdc_publication: str = Field("graph_sync_pub", env="POSTGRES_CDC_PUBLICATION")
@@ -104,6 +125,7 @@ def load_yaml_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
     """Load YAML configuration file"""
     config_file = Path(config_path)
     if config_file.exists():
+        import yaml
         with open(config_file, "r") as f:
             return yaml.safe_load(f)
     return {}
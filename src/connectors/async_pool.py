@@ -0,0 +1,205 @@
+"""Asyncio-native database connection pooling"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from loguru import logger
+
+
+class AsyncConnectionPool:
+    """
+    Connection pool for asyncio code
+
+    Backed by asyncpg (PostgreSQL), aiomysql (MySQL) or aiosqlite (SQLite).
+    A connection is only ever used by the coroutine that acquired it, so many
+    in-flight queries share a small pool without one thread per connection.
+
+    Usage:
+        pool = await create_async_pool("postgres", {"dsn": ...})
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("SELECT 1")
+    """
+
+    def __init__(
+        self,
+        db_type: str,
+        connection_params: Dict[str, Any],
+        min_connections: int = 5,
+        max_connections: int = 20,
+        timeout: float = 30,
+        max_inactive_lifetime: float = 300.0
+    ):
+        """
+        Initialize async connection pool (call initialize() before use)
+
+        Args:
+            db_type: Database type ('postgres', 'mysql', 'sqlite')
+            connection_params: Connection parameters for the backend driver
+            min_connections: Minimum number of connections to maintain
+            max_connections: Maximum number of connections allowed
+            timeout: Seconds to wait for a free connection
+            max_inactive_lifetime: Seconds an idle PostgreSQL connection is
+                kept before being closed
+        """
+        self.db_type = db_type.lower()
+        self.connection_params = connection_params
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_inactive_lifetime = max_inactive_lifetime
+        self.pool = None
+        self._get_impl: Callable[[], Awaitable[Any]] = None
+        self._put_impl: Callable[[Any], Awaitable[None]] = None
+        # SQLite only: idle connections and a cap on borrowed ones
+        self._idle: Deque[Any] = deque()
+        self._slots: Optional[asyncio.BoundedSemaphore] = None
+
+    async def initialize(self) -> None:
+        """Create the backend pool"""
+        try:
+            if self.db_type == 'postgres':
+                await self._initialize_postgres_pool()
+            elif self.db_type == 'mysql':
+                await self._initialize_mysql_pool()
+            elif self.db_type == 'sqlite':
+                await self._initialize_sqlite_pool()
+            else:
+                raise ValueError(f"Unsupported database type: {self.db_type}")
+
+            logger.info(f"Initialized async {self.db_type} connection pool (min={self.min_connections}, max={self.max_connections})")
+        except Exception as e:
+            logger.error(f"Failed to initialize async connection pool: {e}")
+            raise
+
+    async def _initialize_postgres_pool(self) -> None:
+        """Initialize asyncpg connection pool"""
+        import asyncpg
+        self.pool = await asyncpg.create_pool(
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            timeout=self.timeout,
+            max_inactive_connection_lifetime=self.max_inactive_lifetime,
+            **self.connection_params
+        )
+        self._get_impl = lambda: self.pool.acquire(timeout=self.timeout)
+        self._put_impl = self.pool.release
+
+    async def _initialize_mysql_pool(self) -> None:
+        """Initialize aiomysql connection pool"""
+        import aiomysql
+        self.pool = await aiomysql.create_pool(
+            minsize=self.min_connections,
+            maxsize=self.max_connections,
+            connect_timeout=self.timeout,
+            **self.connection_params
+        )
+        self._get_impl = lambda: asyncio.wait_for(self.pool.acquire(), self.timeout)
+        self._put_impl = self._mysql_put
+
+    async def _mysql_put(self, connection) -> None:
+        """Return an aiomysql connection to its pool"""
+        await self.pool.release(connection)
+
+    async def _initialize_sqlite_pool(self) -> None:
+        """Initialize SQLite connection pool (deque of idle connections)"""
+        self._slots = asyncio.BoundedSemaphore(self.max_connections)
+
+        for _ in range(self.min_connections):
+            self._idle.append(await self._sqlite_connect())
+        self._get_impl = self._sqlite_get
+        self._put_impl = self._sqlite_put
+
+    async def _sqlite_connect(self):
+        """Open a new aiosqlite connection"""
+        import aiosqlite
+        return await aiosqlite.connect(self.connection_params.get('database', ':memory:'))
+
+    async def _sqlite_get(self):
+        """Borrow a SQLite connection, opening a new one if none is idle"""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Connection pool exhausted")
+        try:
+            return self._idle.popleft()
+        except IndexError:
+            pass
+        try:
+            return await self._sqlite_connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    async def _sqlite_put(self, connection) -> None:
+        """Return a SQLite connection to the idle set"""
+        self._idle.append(connection)
+        self._slots.release()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """Borrow a connection for the duration of an ``async with`` block"""
+        connection = await self._get_impl()
+        try:
+            yield connection
+        finally:
+            try:
+                await self._put_impl(connection)
+            except Exception as e:
+                logger.error(f"Failed to return connection to async pool: {e}")
+
+    async def close_all(self) -> None:
+        """Close all connections in the pool"""
+        try:
+            if self.db_type == 'postgres':
+                await self.pool.close()
+            elif self.db_type == 'mysql':
+                self.pool.close()
+                await self.pool.wait_closed()
+            elif self.db_type == 'sqlite':
+                while self._idle:
+                    await self._idle.popleft().close()
+
+            logger.info(f"Closed all connections in async {self.db_type} pool")
+        except Exception as e:
+            logger.error(f"Error closing async connection pool: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get pool status information"""
+        status = {
+            'db_type': self.db_type,
+            'min_connections': self.min_connections,
+            'max_connections': self.max_connections,
+            'timeout': self.timeout
+        }
+
+        if self.db_type == 'postgres' and self.pool is not None:
+            status['available_connections'] = self.pool.get_idle_size()
+        elif self.db_type == 'mysql' and self.pool is not None:
+            status['available_connections'] = self.pool.freesize
+        elif self.db_type == 'sqlite':
+            status['available_connections'] = len(self._idle)
+
+        return status
+
+
+async def create_async_pool(
+    db_type: str,
+    connection_params: Dict[str, Any],
+    **kwargs
+) -> AsyncConnectionPool:
+    """
+    Create and initialize an async connection pool
+
+    Args:
+        db_type: Database type
+        connection_params: Connection parameters
+        **kwargs: Additional pool configuration
+
+    Returns:
+        Initialized async connection pool
+    """
+    pool = AsyncConnectionPool(db_type, connection_params, **kwargs)
+    await pool.initialize()
+    return pool
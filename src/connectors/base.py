@@ -1,11 +1,26 @@
 """Base database connector interface"""
 
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar
 from dataclasses import dataclass
 
+T = TypeVar("T")
 
-@dataclass
+# Plain or schema-qualified SQL identifier; anything else is refused before
+# being interpolated into a statement
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*(\.[A-Za-z_][A-Za-z0-9_$]*)?")
+
+
+def check_identifier(name: str) -> str:
+    """Return name if it is a safe table identifier, raise ValueError otherwise"""
+    if not _IDENTIFIER_RE.fullmatch(name):
+        raise ValueError(f"Invalid table name: {name!r}")
+    return name
+
+
+@dataclass(slots=True)
 class TableSchema:
     """Represents a database table schema"""
     name: str
@@ -16,7 +31,7 @@ class TableSchema:
     row_count: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnInfo:
     """Represents a database column"""
     name: str
@@ -31,9 +46,17 @@ class ColumnInfo:
 class DatabaseConnector(ABC):
     """Abstract base class for database connectors"""
     
-    def __init__(self, connection_string: str):
+    def __init__(self, connection_string: str, schema_ttl: float = 300.0):
+        """
+        Args:
+            connection_string: Database connection string
+            schema_ttl: Seconds that table lists and schemas are cached for
+        """
         self.connection_string = connection_string
         self.connection = None
+        self.schema_ttl = schema_ttl
+        # cache key -> (value, time.monotonic() when it was loaded)
+        self._schema_cache: Dict[Hashable, Tuple[Any, float]] = {}
     
     @abstractmethod
     def connect(self) -> None:
@@ -45,19 +68,54 @@ class DatabaseConnector(ABC):
         """Close database connection"""
         pass
     
-    @abstractmethod
     def get_tables(self) -> List[str]:
         """Get list of all tables in the database"""
-        pass
+        return self._cached("tables", self._fetch_tables)
     
-    @abstractmethod
     def get_table_schema(self, table_name: str) -> TableSchema:
         """Get schema information for a specific table"""
-        pass
+        return self._cached(("schema", table_name), lambda: self._fetch_table_schema(table_name))
     
-    @abstractmethod
     def get_all_schemas(self) -> Dict[str, TableSchema]:
         """Get schema information for all tables"""
+        return self._cached("all_schemas", self._fetch_all_schemas)
+    
+    def invalidate_schema(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached schema information, e.g. after DDL
+        
+        Args:
+            table_name: Table whose schema changed (None = everything)
+        """
+        if table_name is None:
+            self._schema_cache.clear()
+        else:
+            self._schema_cache.pop(("schema", table_name), None)
+            self._schema_cache.pop("all_schemas", None)
+    
+    def _cached(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Return a cached value younger than schema_ttl, loading it otherwise"""
+        now = time.monotonic()
+        hit = self._schema_cache.get(key)
+        if hit is not None and now - hit[1] < self.schema_ttl:
+            return hit[0]
+        value = load()
+        self._schema_cache[key] = (value, now)
+        return value
+    
+    @abstractmethod
+    def _fetch_tables(self) -> List[str]:
+        """Query the list of all tables in the database"""
+        pass
+    
+    @abstractmethod
+    def _fetch_table_schema(self, table_name: str) -> TableSchema:
+        """Query schema information for a specific table"""
+        pass
+    
+    @abstractmethod
+    def _fetch_all_schemas(self) -> Dict[str, TableSchema]:
+        """Query schema information for all tables"""
         pass
     
     @abstractmethod
@@ -65,14 +123,60 @@ class DatabaseConnector(ABC):
         """Execute a SQL query and return results"""
         pass
     
+    def fetch_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute a SQL query once and yield its rows in batches
+
+        Connectors override this to pull rows with ``cursor.fetchmany`` so a
+        large table is read with a single statement instead of repeated
+        LIMIT/OFFSET queries.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+            batch_size: Number of rows per yielded batch
+
+        Yields:
+            Lists of rows as dictionaries
+        """
+        rows = self.execute_query(query, params)
+        for i in range(0, len(rows), batch_size):
+            yield rows[i:i + batch_size]
+    
+    def execute_query_iter(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 10_000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SQL query and yield its rows one at a time
+        
+        Rows are pulled through fetch_batches, so connectors that stream
+        there never hold the full result in memory.
+        """
+        for rows in self.fetch_batches(query, params, batch_size):
+            yield from rows
+    
     @abstractmethod
     def get_sample_data(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get sample data from a table"""
         pass
     
     @abstractmethod
-    def get_row_count(self, table_name: str) -> int:
-        """Get total row count for a table"""
+    def get_row_count(self, table_name: str, exact: bool = False) -> int:
+        """
+        Get row count for a table
+        
+        Args:
+            table_name: Table to count
+            exact: Count every row instead of allowing a catalog estimate
+        """
         pass
     
     def __enter__(self):
@@ -1,8 +1,8 @@
 """Database connection pooling for improved performance and reliability"""
 
-from typing import Dict, Any, Optional
-from queue import Queue, Empty
-from threading import Lock
+from collections import deque
+from typing import Callable, Deque, Dict, Any, Optional
+from threading import BoundedSemaphore, Event, Lock, Thread
 import time
 from loguru import logger
 import psycopg2
@@ -10,6 +10,28 @@ from psycopg2 import pool as pg_pool
 import mysql.connector
 from mysql.connector import pooling as mysql_pooling
 
+from ..metrics import POOL_ACQUIRE_SECONDS
+
+
+# Applied once to every pooled SQLite connection when it is opened
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Cheap statements used by the background health check
+LIVENESS_QUERIES = {
+    'postgres': "SELECT 1",
+    'sqlite': "PRAGMA schema_version",
+}
+
+
+class PoolQueueFull(Exception):
+    """Raised when too many callers are already waiting for a connection"""
+    pass
+
 
 class ConnectionPool:
     """Generic connection pool manager"""
@@ -20,7 +42,10 @@ class ConnectionPool:
         connection_params: Dict[str, Any],
         min_connections: int = 2,
         max_connections: int = 10,
-        timeout: int = 30
+        timeout: int = 30,
+        eager: bool = False,
+        health_check_interval: Optional[float] = None,
+        max_queue_depth: Optional[int] = None
     ):
         """
         Initialize connection pool
@@ -31,15 +56,52 @@ class ConnectionPool:
             min_connections: Minimum number of connections to maintain
             max_connections: Maximum number of connections allowed
             timeout: Connection timeout in seconds
+            eager: Open max_connections connections up front instead of
+                min_connections (SQLite only)
+            health_check_interval: Seconds between background liveness
+                checks of idle connections (None = disabled; PostgreSQL and
+                SQLite only, MySQL's pool checks on borrow)
+            max_queue_depth: Most callers allowed to wait for a connection
+                when all are in use; further callers get PoolQueueFull
+                (None = unbounded)
         """
         self.db_type = db_type.lower()
         self.connection_params = connection_params
         self.min_connections = min_connections
         self.max_connections = max_connections
         self.timeout = timeout
+        self.eager = eager
+        self.max_queue_depth = max_queue_depth
         self.pool = None
-        self._lock = Lock()
+        # Borrow/return for the backend, bound once so the hot path has no
+        # per-call db_type dispatch; backend pools do their own locking
+        self._get_impl: Callable[[], Any] = None
+        self._put_impl: Callable[[Any], None] = None
+        self.health_check_interval = health_check_interval
+        self._health_stop = Event()
+        self._health_thread: Optional[Thread] = None
+        
+        # Admission in front of the backend pool: at most max_connections are
+        # borrowed, and callers beyond that wait in FIFO order; a returned
+        # slot goes straight to the head waiter
+        self._admission_lock = Lock()
+        self._in_use = 0
+        self._waiters: Deque[Event] = deque()
+        self.metrics = {
+            'total_acquires': 0,
+            'total_wait_seconds': 0.0,
+            'timeouts': 0,
+            'rejected': 0
+        }
         self._initialize_pool()
+        
+        if health_check_interval and self.db_type in LIVENESS_QUERIES:
+            self._health_thread = Thread(
+                target=self._health_check_loop,
+                name=f"{self.db_type}-pool-health",
+                daemon=True
+            )
+            self._health_thread.start()
     
     def _initialize_pool(self) -> None:
         """Initialize the connection pool based on database type"""
@@ -65,6 +127,13 @@ class ConnectionPool:
             self.max_connections,
             **self.connection_params
         )
+        self._get_impl = self.pool.getconn
+        self._put_impl = self._postgres_put
+    
+    def _postgres_put(self, connection) -> None:
+        """Return a PostgreSQL connection, discarding it if it has been closed"""
+        # A broken connection is dropped; the pool opens a fresh one on demand
+        self.pool.putconn(connection, close=bool(connection.closed))
     
     def _initialize_mysql_pool(self) -> None:
         """Initialize MySQL connection pool"""
@@ -75,45 +144,85 @@ class ConnectionPool:
             'pool_reset_session': True
         }
         self.pool = mysql_pooling.MySQLConnectionPool(**pool_config)
+        self._get_impl = self.pool.get_connection
+        # Closing a pooled MySQL connection hands it back to its pool
+        self._put_impl = lambda connection: connection.close()
     
     def _initialize_sqlite_pool(self) -> None:
-        """Initialize SQLite connection pool (simple queue-based)"""
-        import sqlite3
-        self.pool = Queue(maxsize=self.max_connections)
+        """Initialize SQLite connection pool (deque of idle connections)"""
+        # deque append/popleft are atomic under the GIL; the semaphore admits
+        # at most max_connections borrowers, so no other lock is needed
+        self._idle: Deque[Any] = deque()
+        self._slots = BoundedSemaphore(self.max_connections)
         
-        for _ in range(self.min_connections):
-            conn = sqlite3.connect(
-                self.connection_params.get('database', ':memory:'),
-                check_same_thread=False
-            )
-            self.pool.put(conn)
+        initial = self.max_connections if self.eager else self.min_connections
+        for _ in range(initial):
+            self._idle.append(self._sqlite_connect())
+        self._get_impl = self._sqlite_get
+        self._put_impl = self._sqlite_put
+    
+    def _sqlite_connect(self):
+        """Open a new SQLite connection tuned for concurrent reuse"""
+        import sqlite3
+        conn = sqlite3.connect(
+            self.connection_params.get('database', ':memory:'),
+            check_same_thread=False
+        )
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _sqlite_get(self):
+        """Borrow a SQLite connection, opening a new one if none is idle"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("Connection pool exhausted")
+        try:
+            return self._idle.popleft()
+        except IndexError:
+            pass
+        try:
+            return self._sqlite_connect()
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def _sqlite_put(self, connection) -> None:
+        """Return a SQLite connection to the idle set"""
+        self._idle.append(connection)
+        self._slots.release()
     
     def get_connection(self):
         """
         Get a connection from the pool
         
+        Waits up to timeout seconds, in arrival order, when every connection
+        is in use.
+        
         Returns:
             Database connection
+        
+        Raises:
+            PoolQueueFull: If max_queue_depth callers are already waiting
+            TimeoutError: If no connection became free within timeout
         """
+        start = time.perf_counter()
         try:
-            if self.db_type == 'postgres':
-                return self.pool.getconn()
-            elif self.db_type == 'mysql':
-                return self.pool.get_connection()
-            elif self.db_type == 'sqlite':
-                try:
-                    return self.pool.get(timeout=self.timeout)
-                except Empty:
-                    if self.pool.qsize() < self.max_connections:
-                        import sqlite3
-                        return sqlite3.connect(
-                            self.connection_params.get('database', ':memory:'),
-                            check_same_thread=False
-                        )
-                    raise TimeoutError("Connection pool exhausted")
+            self._admit()
+            try:
+                connection = self._get_impl()
+            except Exception:
+                self._release_slot()
+                raise
         except Exception as e:
             logger.error(f"Failed to get connection from pool: {e}")
             raise
+        
+        waited = time.perf_counter() - start
+        POOL_ACQUIRE_SECONDS.labels(db_type=self.db_type).observe(waited)
+        with self._admission_lock:
+            self.metrics['total_acquires'] += 1
+            self.metrics['total_wait_seconds'] += waited
+        return connection
     
     def return_connection(self, connection) -> None:
         """
@@ -123,32 +232,139 @@ class ConnectionPool:
             connection: Database connection to return
         """
         try:
-            if self.db_type == 'postgres':
-                self.pool.putconn(connection)
-            elif self.db_type == 'mysql':
-                connection.close()
-            elif self.db_type == 'sqlite':
-                if self.pool.qsize() < self.max_connections:
-                    self.pool.put(connection)
-                else:
-                    connection.close()
+            self._put_impl(connection)
         except Exception as e:
             logger.error(f"Failed to return connection to pool: {e}")
+        finally:
+            # Only after the backend has the connection back, so the woken
+            # waiter's borrow cannot find the backend pool exhausted
+            self._release_slot()
+    
+    def _admit(self) -> None:
+        """Take a borrowing slot, queueing behind earlier waiters if needed"""
+        with self._admission_lock:
+            if self._in_use < self.max_connections and not self._waiters:
+                self._in_use += 1
+                return
+            if self.max_queue_depth is not None and len(self._waiters) >= self.max_queue_depth:
+                self.metrics['rejected'] += 1
+                raise PoolQueueFull(
+                    f"{len(self._waiters)} callers already waiting for a {self.db_type} connection"
+                )
+            waiter = Event()
+            self._waiters.append(waiter)
+        
+        if waiter.wait(self.timeout):
+            return
+        
+        with self._admission_lock:
+            # A slot may have been handed over between the timeout and here
+            if waiter.is_set():
+                return
+            self._waiters.remove(waiter)
+            self.metrics['timeouts'] += 1
+        raise TimeoutError("Connection pool exhausted")
+    
+    def _try_admit(self) -> bool:
+        """Take a borrowing slot only if one is free right now"""
+        with self._admission_lock:
+            if self._in_use < self.max_connections and not self._waiters:
+                self._in_use += 1
+                return True
+            return False
+    
+    def _release_slot(self) -> None:
+        """Give a borrowing slot to the head waiter, or free it"""
+        with self._admission_lock:
+            if self._waiters:
+                # The slot passes directly to the waiter; _in_use is unchanged
+                self._waiters.popleft().set()
+            else:
+                self._in_use -= 1
+    
+    def _health_check_loop(self) -> None:
+        """Periodically validate idle connections (runs in separate thread)"""
+        while not self._health_stop.wait(self.health_check_interval):
+            try:
+                self._check_idle_connections()
+            except Exception as e:
+                logger.warning(f"Connection pool health check failed: {e}")
+    
+    def _check_idle_connections(self) -> None:
+        """Replace dead idle connections so borrowers never receive them"""
+        idle = self._idle_count()
+        # Leave a busy pool alone rather than competing with real traffic
+        if idle < 2:
+            return
+        
+        # Borrow them all before returning any: the backend pools hand out
+        # the most recently returned connection first. Slots are only taken
+        # when free, so the check never queues ahead of real callers
+        borrowed = []
+        for _ in range(min(idle, self.min_connections)):
+            if not self._try_admit():
+                break
+            try:
+                borrowed.append(self._get_impl())
+            except Exception:
+                self._release_slot()
+                raise
+        for connection in borrowed:
+            try:
+                if self._is_alive(connection):
+                    self._put_impl(connection)
+                else:
+                    logger.info(f"Discarding dead {self.db_type} pool connection")
+                    self._discard(connection)
+            finally:
+                self._release_slot()
+    
+    def _idle_count(self) -> int:
+        """Number of connections currently idle in the pool"""
+        if self.db_type == 'postgres':
+            return len(self.pool._pool)
+        return len(self._idle)
+    
+    def _is_alive(self, connection) -> bool:
+        """Run the backend's liveness query on a connection"""
+        try:
+            cursor = connection.cursor()
+            cursor.execute(LIVENESS_QUERIES[self.db_type])
+            cursor.fetchall()
+            cursor.close()
+            if self.db_type == 'postgres':
+                # Don't leave the connection idle in a transaction
+                connection.rollback()
+            return True
+        except Exception:
+            return False
+    
+    def _discard(self, connection) -> None:
+        """Close a broken connection and free its place in the pool"""
+        if self.db_type == 'postgres':
+            self.pool.putconn(connection, close=True)
+            return
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._slots.release()
     
     def close_all(self) -> None:
         """Close all connections in the pool"""
+        self._health_stop.set()
         try:
             if self.db_type == 'postgres':
                 self.pool.closeall()
             elif self.db_type == 'mysql':
                 pass
             elif self.db_type == 'sqlite':
-                while not self.pool.empty():
+                while True:
                     try:
-                        conn = self.pool.get_nowait()
-                        conn.close()
-                    except Empty:
+                        conn = self._idle.popleft()
+                    except IndexError:
                         break
+                    conn.close()
             
             logger.info(f"Closed all connections in {self.db_type} pool")
         except Exception as e:
@@ -160,11 +376,17 @@ class ConnectionPool:
             'db_type': self.db_type,
             'min_connections': self.min_connections,
             'max_connections': self.max_connections,
-            'timeout': self.timeout
+            'timeout': self.timeout,
+            'max_queue_depth': self.max_queue_depth
         }
         
-        if self.db_type == 'sqlite':
-            status['available_connections'] = self.pool.qsize()
+        with self._admission_lock:
+            status['in_use'] = self._in_use
+            status['waiters'] = len(self._waiters)
+            status['metrics'] = dict(self.metrics)
+        
+        if self.db_type in ('postgres', 'sqlite'):
+            status['available_connections'] = self._idle_count()
         
         return status
 
@@ -190,10 +412,12 @@ class PooledConnection:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Return connection to pool"""
         if self.connection:
-            if exc_type is not None:
+            # Even a read opens a transaction, and a failed one must not be
+            # handed to the next borrower
+            if exc_type is not None and not getattr(self.connection, 'autocommit', False):
                 try:
                     self.connection.rollback()
-                except:
+                except Exception:
                     pass
             self.pool.return_connection(self.connection)
         return False
@@ -221,14 +445,22 @@ def get_or_create_pool(
     Returns:
         Connection pool
     """
+    # Lock-free fast path: the pool almost always exists already, and a
+    # dict lookup is atomic under the GIL
+    pool = _pool_registry.get(pool_id)
+    if pool is not None:
+        return pool
+    
     with _registry_lock:
-        if pool_id not in _pool_registry:
-            _pool_registry[pool_id] = ConnectionPool(
+        pool = _pool_registry.get(pool_id)
+        if pool is None:
+            pool = ConnectionPool(
                 db_type,
                 connection_params,
                 **kwargs
             )
-        return _pool_registry[pool_id]
+            _pool_registry[pool_id] = pool
+        return pool
 
 
 def close_pool(pool_id: str) -> None:
@@ -239,9 +471,9 @@ def close_pool(pool_id: str) -> None:
         pool_id: Pool identifier
     """
     with _registry_lock:
-        if pool_id in _pool_registry:
-            _pool_registry[pool_id].close_all()
-            del _pool_registry[pool_id]
+        pool = _pool_registry.pop(pool_id, None)
+        if pool is not None:
+            pool.close_all()
             logger.info(f"Closed and removed pool: {pool_id}")
 
 
@@ -1,31 +1,109 @@
 """MySQL database connector"""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
 import pymysql
+from pymysql.constants import CLIENT
 from loguru import logger
 
-from .base import DatabaseConnector, TableSchema
+from .base import DatabaseConnector, TableSchema, check_identifier
+
+# Per-table introspection queries; the table name is always a bound parameter
+_COLUMNS_QUERY = """
+    SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT, COLUMN_KEY
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY ORDINAL_POSITION
+"""
+_PRIMARY_KEYS_QUERY = """
+    SELECT COLUMN_NAME
+    FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = %s
+    AND CONSTRAINT_NAME = 'PRIMARY'
+    ORDER BY ORDINAL_POSITION
+"""
+_FOREIGN_KEYS_QUERY = """
+    SELECT
+        COLUMN_NAME as column_name,
+        REFERENCED_TABLE_NAME as foreign_table_name,
+        REFERENCED_COLUMN_NAME as foreign_column_name,
+        CONSTRAINT_NAME as constraint_name
+    FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = %s
+    AND REFERENCED_TABLE_NAME IS NOT NULL
+"""
+_INDEXES_QUERY = """
+    SELECT INDEX_NAME, COLUMN_NAME, NON_UNIQUE
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY INDEX_NAME, SEQ_IN_INDEX
+"""
+_ROW_ESTIMATE_QUERY = """
+    SELECT TABLE_ROWS
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+# All per-table introspection in one multi-statement round trip; every
+# statement binds the table name once. Only sent on a connection reserved
+# for it, so the one every other query runs on never accepts stacked
+# statements
+_TABLE_SCHEMA_QUERY = ";".join((
+    _COLUMNS_QUERY,
+    _PRIMARY_KEYS_QUERY,
+    _FOREIGN_KEYS_QUERY,
+    _INDEXES_QUERY,
+    _ROW_ESTIMATE_QUERY
+))
+
+
+def _column_info(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an INFORMATION_SCHEMA.COLUMNS row to the connector's column format"""
+    return {
+        "column_name": row["COLUMN_NAME"],
+        "data_type": row["COLUMN_TYPE"],
+        "is_nullable": row["IS_NULLABLE"] == "YES",
+        "column_default": row["COLUMN_DEFAULT"],
+        "is_primary_key": row["COLUMN_KEY"] == "PRI"
+    }
+
+
+def _index_info(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an INFORMATION_SCHEMA.STATISTICS row to the connector's index format"""
+    return {
+        "index_name": row["INDEX_NAME"],
+        "column_name": row["COLUMN_NAME"],
+        "is_unique": int(row["NON_UNIQUE"]) == 0
+    }
 
 
 class MySQLConnector(DatabaseConnector):
     """MySQL database connector implementation"""
     
+    # Opened on first use by _fetch_table_schema
+    _schema_connection: Optional[pymysql.connections.Connection] = None
+    
+    def _connect_params(self) -> Dict[str, Any]:
+        """Build pymysql.connect() arguments from the connection string"""
+        url = urlsplit(self.connection_string)
+        return dict(
+            host=url.hostname,
+            port=url.port or 3306,
+            user=unquote(url.username or ""),
+            password=unquote(url.password or ""),
+            database=url.path.lstrip("/"),
+            charset="utf8mb4",
+            # Reads only; without autocommit the connection would stay
+            # pinned to the snapshot of its first query
+            autocommit=True,
+            cursorclass=pymysql.cursors.DictCursor
+        )
+    
     def connect(self) -> None:
         """Establish MySQL connection"""
         try:
-            parts = self.connection_string.replace("mysql+pymysql://", "").split("@")
-            user_pass = parts[0].split(":")
-            host_db = parts[1].split("/")
-            host_port = host_db[0].split(":")
-            
-            self.connection = pymysql.connect(
-                host=host_port[0],
-                port=int(host_port[1]) if len(host_port) > 1 else 3306,
-                user=user_pass[0],
-                password=user_pass[1] if len(user_pass) > 1 else "",
-                database=host_db[1] if len(host_db) > 1 else "",
-                cursorclass=pymysql.cursors.DictCursor
-            )
+            self.connection = pymysql.connect(**self._connect_params())
             logger.info("Successfully connected to MySQL database")
         except Exception as e:
             logger.error(f"Failed to connect to MySQL: {e}")
@@ -33,24 +111,45 @@ class MySQLConnector(DatabaseConnector):
     
     def disconnect(self) -> None:
         """Close MySQL connection"""
+        if self._schema_connection:
+            self._schema_connection.close()
+            self._schema_connection = None
         if self.connection:
             self.connection.close()
             logger.info("MySQL connection closed")
     
-    def get_tables(self) -> List[str]:
-        """Get list of all tables in the database"""
+    def _get_schema_connection(self) -> pymysql.connections.Connection:
+        """Get the multi-statement connection used for schema introspection"""
+        if self._schema_connection is None or not self._schema_connection.open:
+            self._schema_connection = pymysql.connect(
+                **self._connect_params(),
+                client_flag=CLIENT.MULTI_STATEMENTS
+            )
+        return self._schema_connection
+    
+    def _fetch_tables(self) -> List[str]:
+        """Query the list of all tables in the database"""
         query = "SHOW TABLES"
         with self.connection.cursor() as cursor:
             cursor.execute(query)
-            return [list(row.values())[0] for row in cursor.fetchall()]
-    
-    def get_table_schema(self, table_name: str) -> TableSchema:
-        """Get schema information for a specific table"""
-        columns = self._get_columns(table_name)
-        primary_keys = self._get_primary_keys(table_name)
-        foreign_keys = self._get_foreign_keys(table_name)
-        indexes = self._get_indexes(table_name)
-        row_count = self.get_row_count(table_name)
+            return [next(iter(row.values())) for row in cursor.fetchall()]
+    
+    def _fetch_table_schema(self, table_name: str) -> TableSchema:
+        """Query schema information for a specific table"""
+        with self._get_schema_connection().cursor() as cursor:
+            cursor.execute(_TABLE_SCHEMA_QUERY, (table_name,) * 5)
+            results = [cursor.fetchall()]
+            while cursor.nextset():
+                results.append(cursor.fetchall())
+        
+        column_rows, pk_rows, foreign_keys, index_rows, estimate_rows = results
+        columns = [_column_info(row) for row in column_rows]
+        primary_keys = [row["COLUMN_NAME"] for row in pk_rows]
+        indexes = [_index_info(row) for row in index_rows]
+        if estimate_rows and estimate_rows[0]["TABLE_ROWS"] is not None:
+            row_count = int(estimate_rows[0]["TABLE_ROWS"])
+        else:
+            row_count = self.get_row_count(table_name, exact=True)
         
         return TableSchema(
             name=table_name,
@@ -63,69 +162,138 @@ class MySQLConnector(DatabaseConnector):
     
     def _get_columns(self, table_name: str) -> List[Dict[str, Any]]:
         """Get column information for a table"""
-        query = f"DESCRIBE {table_name}"
         with self.connection.cursor() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            return [
-                {
-                    "column_name": row["Field"],
-                    "data_type": row["Type"],
-                    "is_nullable": row["Null"] == "YES",
-                    "column_default": row["Default"],
-                    "is_primary_key": row["Key"] == "PRI"
-                }
-                for row in results
-            ]
+            cursor.execute(_COLUMNS_QUERY, (table_name,))
+            return [_column_info(row) for row in cursor.fetchall()]
     
     def _get_primary_keys(self, table_name: str) -> List[str]:
         """Get primary key columns for a table"""
-        query = f"""
-            SELECT COLUMN_NAME
-            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA = DATABASE()
-            AND TABLE_NAME = %s
-            AND CONSTRAINT_NAME = 'PRIMARY'
-        """
         with self.connection.cursor() as cursor:
-            cursor.execute(query, (table_name,))
+            cursor.execute(_PRIMARY_KEYS_QUERY, (table_name,))
             return [row["COLUMN_NAME"] for row in cursor.fetchall()]
     
     def _get_foreign_keys(self, table_name: str) -> List[Dict[str, Any]]:
         """Get foreign key constraints for a table"""
-        query = f"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(_FOREIGN_KEYS_QUERY, (table_name,))
+            return cursor.fetchall()
+    
+    def _get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        """Get indexes for a table"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(_INDEXES_QUERY, (table_name,))
+            return [_index_info(row) for row in cursor.fetchall()]
+    
+    def _get_all_columns(self, tables: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get column information for every table in one query"""
+        query = """
             SELECT
-                COLUMN_NAME as column_name,
-                REFERENCED_TABLE_NAME as foreign_table_name,
-                REFERENCED_COLUMN_NAME as foreign_column_name,
-                CONSTRAINT_NAME as constraint_name
+                TABLE_NAME,
+                COLUMN_NAME,
+                COLUMN_TYPE,
+                IS_NULLABLE,
+                COLUMN_DEFAULT,
+                COLUMN_KEY
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+        columns: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
+        with self.connection.cursor() as cursor:
+            cursor.execute(query)
+            for row in cursor.fetchall():
+                table_columns = columns.get(row["TABLE_NAME"])
+                if table_columns is not None:
+                    table_columns.append(_column_info(row))
+        return columns
+    
+    def _get_all_keys(
+        self,
+        tables: List[str]
+    ) -> Tuple[Dict[str, List[str]], Dict[str, List[Dict[str, Any]]]]:
+        """Get primary and foreign key columns for every table in one query"""
+        query = """
+            SELECT
+                TABLE_NAME,
+                COLUMN_NAME,
+                CONSTRAINT_NAME,
+                REFERENCED_TABLE_NAME,
+                REFERENCED_COLUMN_NAME
             FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
             WHERE TABLE_SCHEMA = DATABASE()
-            AND TABLE_NAME = %s
-            AND REFERENCED_TABLE_NAME IS NOT NULL
+            AND (CONSTRAINT_NAME = 'PRIMARY' OR REFERENCED_TABLE_NAME IS NOT NULL)
+            ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
         """
+        primary_keys: Dict[str, List[str]] = {table: [] for table in tables}
+        foreign_keys: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
         with self.connection.cursor() as cursor:
-            cursor.execute(query, (table_name,))
-            return cursor.fetchall()
+            cursor.execute(query)
+            for row in cursor.fetchall():
+                table = row["TABLE_NAME"]
+                if table not in primary_keys:
+                    continue
+                if row["CONSTRAINT_NAME"] == "PRIMARY":
+                    primary_keys[table].append(row["COLUMN_NAME"])
+                else:
+                    foreign_keys[table].append({
+                        "column_name": row["COLUMN_NAME"],
+                        "foreign_table_name": row["REFERENCED_TABLE_NAME"],
+                        "foreign_column_name": row["REFERENCED_COLUMN_NAME"],
+                        "constraint_name": row["CONSTRAINT_NAME"]
+                    })
+        return primary_keys, foreign_keys
     
-    def _get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
-        """Get indexes for a table"""
-        query = f"SHOW INDEX FROM {table_name}"
+    def _get_all_indexes(self, tables: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get indexes for every table in one query"""
+        query = """
+            SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME, NON_UNIQUE
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """
+        indexes: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
         with self.connection.cursor() as cursor:
             cursor.execute(query)
-            return [
-                {
-                    "index_name": row["Key_name"],
-                    "column_name": row["Column_name"],
-                    "is_unique": row["Non_unique"] == 0
-                }
-                for row in cursor.fetchall()
-            ]
-    
-    def get_all_schemas(self) -> Dict[str, TableSchema]:
-        """Get schema information for all tables"""
+            for row in cursor.fetchall():
+                table_indexes = indexes.get(row["TABLE_NAME"])
+                if table_indexes is not None:
+                    table_indexes.append(_index_info(row))
+        return indexes
+    
+    def _get_all_row_counts(self) -> Dict[str, int]:
+        """Get approximate row counts for every table from the catalog"""
+        query = """
+            SELECT TABLE_NAME, TABLE_ROWS
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE()
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(query)
+            return {row["TABLE_NAME"]: int(row["TABLE_ROWS"] or 0) for row in cursor.fetchall()}
+    
+    def _fetch_all_schemas(self) -> Dict[str, TableSchema]:
+        """Query schema information for all tables"""
         tables = self.get_tables()
-        return {table: self.get_table_schema(table) for table in tables}
+        if not tables:
+            return {}
+        
+        columns = self._get_all_columns(tables)
+        primary_keys, foreign_keys = self._get_all_keys(tables)
+        indexes = self._get_all_indexes(tables)
+        # Catalog estimates; an exact COUNT(*) per table would scan every table
+        row_counts = self._get_all_row_counts()
+        
+        return {
+            table: TableSchema(
+                name=table,
+                columns=columns[table],
+                primary_keys=primary_keys[table],
+                foreign_keys=foreign_keys[table],
+                indexes=indexes[table],
+                row_count=row_counts.get(table, 0)
+            )
+            for table in tables
+        }
     
     def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Execute a SQL query and return results"""
@@ -133,17 +301,39 @@ class MySQLConnector(DatabaseConnector):
             cursor.execute(query, params)
             return cursor.fetchall()
     
+    def fetch_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a SQL query once and yield its rows in batches"""
+        # Unbuffered cursor: rows are read off the socket as they are fetched
+        # instead of the whole result being loaded by execute()
+        with self.connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+    
     def get_sample_data(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get sample data from a table"""
-        query = f"SELECT * FROM {table_name} LIMIT %s"
+        query = f"SELECT * FROM {check_identifier(table_name)} LIMIT %s"
         with self.connection.cursor() as cursor:
             cursor.execute(query, (limit,))
             return cursor.fetchall()
     
-    def get_row_count(self, table_name: str) -> int:
-        """Get total row count for a table"""
-        query = f"SELECT COUNT(*) as count FROM {table_name}"
+    def get_row_count(self, table_name: str, exact: bool = False) -> int:
+        """Get row count for a table, from the catalog estimate unless exact"""
         with self.connection.cursor() as cursor:
-            cursor.execute(query)
+            if not exact:
+                cursor.execute(_ROW_ESTIMATE_QUERY, (table_name,))
+                row = cursor.fetchone()
+                if row and row["TABLE_ROWS"] is not None:
+                    return int(row["TABLE_ROWS"])
+            
+            cursor.execute(f"SELECT COUNT(*) as count FROM {check_identifier(table_name)}")
             return cursor.fetchone()["count"]
 
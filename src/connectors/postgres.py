@@ -1,11 +1,20 @@
 """PostgreSQL database connector"""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+import orjson
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, register_default_jsonb
 from loguru import logger
 
-from .base import DatabaseConnector, TableSchema, ColumnInfo
+from .base import DatabaseConnector, TableSchema, ColumnInfo, check_identifier
+
+# Decode jsonb columns with orjson rather than the stdlib json module
+register_default_jsonb(globally=True, loads=orjson.loads)
+
+# Sent in the startup packet: with DateStyle already ISO, psycopg2 skips the
+# extra SET it otherwise issues on connect
+_STARTUP_OPTIONS = "-c DateStyle=ISO,YMD -c client_encoding=UTF8"
 
 
 class PostgreSQLConnector(DatabaseConnector):
@@ -14,7 +23,9 @@ class PostgreSQLConnector(DatabaseConnector):
     def connect(self) -> None:
         """Establish PostgreSQL connection"""
         try:
-            self.connection = psycopg2.connect(self.connection_string)
+            self.connection = psycopg2.connect(self.connection_string, options=_STARTUP_OPTIONS)
+            # Prepared statements live for one session, so start afresh
+            self._prepared = set()
             logger.info("Successfully connected to PostgreSQL database")
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
@@ -26,8 +37,8 @@ class PostgreSQLConnector(DatabaseConnector):
             self.connection.close()
             logger.info("PostgreSQL connection closed")
     
-    def get_tables(self) -> List[str]:
-        """Get list of all tables in the database"""
+    def _fetch_tables(self) -> List[str]:
+        """Query the list of all tables in the database"""
         query = """
             SELECT table_name 
             FROM information_schema.tables 
@@ -39,8 +50,8 @@ class PostgreSQLConnector(DatabaseConnector):
             cursor.execute(query)
             return [row[0] for row in cursor.fetchall()]
     
-    def get_table_schema(self, table_name: str) -> TableSchema:
-        """Get schema information for a specific table"""
+    def _fetch_table_schema(self, table_name: str) -> TableSchema:
+        """Query schema information for a specific table"""
         columns = self._get_columns(table_name)
         primary_keys = self._get_primary_keys(table_name)
         foreign_keys = self._get_foreign_keys(table_name)
@@ -68,12 +79,12 @@ class PostgreSQLConnector(DatabaseConnector):
                 numeric_precision,
                 numeric_scale
             FROM information_schema.columns
-            WHERE table_schema = 'public' AND table_name = %s
+            WHERE table_schema = 'public' AND table_name = $1
             ORDER BY ordinal_position
         """
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, (table_name,))
-            return [dict(row) for row in cursor.fetchall()]
+            self._execute_prepared(cursor, "schema_columns", query, table_name)
+            return cursor.fetchall()
     
     def _get_primary_keys(self, table_name: str) -> List[str]:
         """Get primary key columns for a table"""
@@ -81,10 +92,10 @@ class PostgreSQLConnector(DatabaseConnector):
             SELECT a.attname
             FROM pg_index i
             JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
-            WHERE i.indrelid = %s::regclass AND i.indisprimary
+            WHERE i.indrelid = $1::regclass AND i.indisprimary
         """
         with self.connection.cursor() as cursor:
-            cursor.execute(query, (table_name,))
+            self._execute_prepared(cursor, "schema_primary_keys", query, table_name)
             return [row[0] for row in cursor.fetchall()]
     
     def _get_foreign_keys(self, table_name: str) -> List[Dict[str, Any]]:
@@ -103,11 +114,11 @@ class PostgreSQLConnector(DatabaseConnector):
                 ON ccu.constraint_name = tc.constraint_name
                 AND ccu.table_schema = tc.table_schema
             WHERE tc.constraint_type = 'FOREIGN KEY' 
-            AND tc.table_name = %s
+            AND tc.table_name = $1
         """
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, (table_name,))
-            return [dict(row) for row in cursor.fetchall()]
+            self._execute_prepared(cursor, "schema_foreign_keys", query, table_name)
+            return cursor.fetchall()
     
     def _get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
         """Get indexes for a table"""
@@ -120,35 +131,187 @@ class PostgreSQLConnector(DatabaseConnector):
             JOIN pg_index ix ON t.oid = ix.indrelid
             JOIN pg_class i ON i.oid = ix.indexrelid
             JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(ix.indkey)
-            WHERE t.relname = %s
+            WHERE t.relname = $1
+            AND t.relkind = 'r'
+        """
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            self._execute_prepared(cursor, "schema_indexes", query, table_name)
+            return cursor.fetchall()
+    
+    def _execute_prepared(self, cursor, name: str, query: str, table_name: str) -> None:
+        """Execute a single-parameter query as a server-side prepared statement"""
+        if name not in self._prepared:
+            cursor.execute(f"PREPARE {name} AS {query}")
+            self._prepared.add(name)
+        cursor.execute(f"EXECUTE {name}(%s)", (table_name,))
+    
+    def _get_all_columns(self, tables: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get column information for several tables in one query"""
+        query = """
+            SELECT 
+                table_name,
+                column_name,
+                data_type,
+                is_nullable,
+                column_default,
+                character_maximum_length,
+                numeric_precision,
+                numeric_scale
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = ANY(%s)
+            ORDER BY table_name, ordinal_position
+        """
+        columns: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, (tables,))
+            for row in cursor.fetchall():
+                columns[row.pop("table_name")].append(row)
+        return columns
+    
+    def _get_all_primary_keys(self, tables: List[str]) -> Dict[str, List[str]]:
+        """Get primary key columns for several tables in one query"""
+        query = """
+            SELECT t.relname, a.attname
+            FROM pg_index i
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE n.nspname = 'public' AND t.relname = ANY(%s) AND i.indisprimary
+        """
+        primary_keys: Dict[str, List[str]] = {table: [] for table in tables}
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, (tables,))
+            for table_name, column_name in cursor.fetchall():
+                primary_keys[table_name].append(column_name)
+        return primary_keys
+    
+    def _get_all_foreign_keys(self, tables: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get foreign key constraints for several tables in one query"""
+        query = """
+            SELECT
+                tc.table_name,
+                kcu.column_name,
+                ccu.table_name AS foreign_table_name,
+                ccu.column_name AS foreign_column_name,
+                tc.constraint_name
+            FROM information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            WHERE tc.constraint_type = 'FOREIGN KEY' 
+            AND tc.table_name = ANY(%s)
+        """
+        foreign_keys: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, (tables,))
+            for row in cursor.fetchall():
+                foreign_keys[row.pop("table_name")].append(row)
+        return foreign_keys
+    
+    def _get_all_indexes(self, tables: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get indexes for several tables in one query"""
+        query = """
+            SELECT
+                t.relname as table_name,
+                i.relname as index_name,
+                a.attname as column_name,
+                ix.indisunique as is_unique
+            FROM pg_class t
+            JOIN pg_index ix ON t.oid = ix.indrelid
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(ix.indkey)
+            WHERE t.relname = ANY(%s)
             AND t.relkind = 'r'
         """
+        indexes: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, (table_name,))
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(query, (tables,))
+            for row in cursor.fetchall():
+                indexes[row.pop("table_name")].append(row)
+        return indexes
     
-    def get_all_schemas(self) -> Dict[str, TableSchema]:
-        """Get schema information for all tables"""
+    def _get_all_row_counts(self) -> Dict[str, int]:
+        """Get approximate row counts for every table from the statistics collector"""
+        query = """
+            SELECT relname, n_live_tup
+            FROM pg_stat_user_tables
+            WHERE schemaname = 'public'
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(query)
+            return dict(cursor.fetchall())
+    
+    def _fetch_all_schemas(self) -> Dict[str, TableSchema]:
+        """Query schema information for all tables"""
         tables = self.get_tables()
-        return {table: self.get_table_schema(table) for table in tables}
+        if not tables:
+            return {}
+
+        columns = self._get_all_columns(tables)
+        primary_keys = self._get_all_primary_keys(tables)
+        foreign_keys = self._get_all_foreign_keys(tables)
+        indexes = self._get_all_indexes(tables)
+        # Catalog estimates; an exact COUNT(*) per table would scan every table
+        row_counts = self._get_all_row_counts()
+
+        return {
+            table: TableSchema(
+                name=table,
+                columns=columns[table],
+                primary_keys=primary_keys[table],
+                foreign_keys=foreign_keys[table],
+                indexes=indexes[table],
+                row_count=row_counts.get(table, 0)
+            )
+            for table in tables
+        }
     
     def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Execute a SQL query and return results"""
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
+    
+    def fetch_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a SQL query once and yield its rows in batches"""
+        # A named cursor is a server-side cursor: each fetchmany() is a FETCH,
+        # so only one batch is ever held client-side
+        with self.connection.cursor(name=f"batches_{uuid4().hex}", cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
     
     def get_sample_data(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get sample data from a table"""
-        query = f"SELECT * FROM {table_name} LIMIT %s"
+        query = f"SELECT * FROM {check_identifier(table_name)} LIMIT %s"
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
             cursor.execute(query, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
     
-    def get_row_count(self, table_name: str) -> int:
-        """Get total row count for a table"""
-        query = f"SELECT COUNT(*) FROM {table_name}"
+    def get_row_count(self, table_name: str, exact: bool = False) -> int:
+        """Get row count for a table, from the planner estimate unless exact"""
         with self.connection.cursor() as cursor:
-            cursor.execute(query)
+            if not exact:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    (table_name,)
+                )
+                estimate = cursor.fetchone()[0]
+                # -1 means the table has never been vacuumed or analyzed
+                if estimate >= 0:
+                    return estimate
+            
+            cursor.execute(f"SELECT COUNT(*) FROM {check_identifier(table_name)}")
             return cursor.fetchone()[0]
 
@@ -1,10 +1,10 @@
 """SQLite database connector"""
 
 import sqlite3
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from loguru import logger
 
-from .base import DatabaseConnector, TableSchema
+from .base import DatabaseConnector, TableSchema, check_identifier
 
 
 class SQLiteConnector(DatabaseConnector):
@@ -26,15 +26,13 @@ class SQLiteConnector(DatabaseConnector):
             self.connection.close()
             logger.info("SQLite connection closed")
     
-    def get_tables(self) -> List[str]:
-        """Get list of all tables in the database"""
+    def _fetch_tables(self) -> List[str]:
+        """Query the list of all tables in the database"""
         query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        cursor = self.connection.cursor()
-        cursor.execute(query)
-        return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in self.connection.execute(query).fetchall()]
     
-    def get_table_schema(self, table_name: str) -> TableSchema:
-        """Get schema information for a specific table"""
+    def _fetch_table_schema(self, table_name: str) -> TableSchema:
+        """Query schema information for a specific table"""
         columns = self._get_columns(table_name)
         primary_keys = self._get_primary_keys(table_name)
         foreign_keys = self._get_foreign_keys(table_name)
@@ -52,9 +50,10 @@ class SQLiteConnector(DatabaseConnector):
     
     def _get_columns(self, table_name: str) -> List[Dict[str, Any]]:
         """Get column information for a table"""
-        query = f"PRAGMA table_info({table_name})"
-        cursor = self.connection.cursor()
-        cursor.execute(query)
+        # Table-valued pragma functions take the table name as a bound parameter
+        query = 'SELECT cid, name, type, "notnull", dflt_value, pk FROM pragma_table_info(?)'
+        # Connection.execute() runs on an internal cursor, saving a Cursor per call
+        cursor = self.connection.execute(query, (table_name,))
         return [
             {
                 "column_name": row[1],
@@ -73,9 +72,8 @@ class SQLiteConnector(DatabaseConnector):
     
     def _get_foreign_keys(self, table_name: str) -> List[Dict[str, Any]]:
         """Get foreign key constraints for a table"""
-        query = f"PRAGMA foreign_key_list({table_name})"
-        cursor = self.connection.cursor()
-        cursor.execute(query)
+        query = 'SELECT id, seq, "table", "from", "to" FROM pragma_foreign_key_list(?)'
+        cursor = self.connection.execute(query, (table_name,))
         return [
             {
                 "column_name": row[3],
@@ -88,49 +86,53 @@ class SQLiteConnector(DatabaseConnector):
     
     def _get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
         """Get indexes for a table"""
-        query = f"PRAGMA index_list({table_name})"
-        cursor = self.connection.cursor()
-        cursor.execute(query)
-        indexes = []
-        for row in cursor.fetchall():
-            index_name = row[1]
-            is_unique = row[2] == 1
-            col_query = f"PRAGMA index_info({index_name})"
-            col_cursor = self.connection.cursor()
-            col_cursor.execute(col_query)
-            for col_row in col_cursor.fetchall():
-                indexes.append({
-                    "index_name": index_name,
-                    "column_name": col_row[2],
-                    "is_unique": is_unique
-                })
-        return indexes
+        query = """
+            SELECT il.name, ii.name, il."unique"
+            FROM pragma_index_list(?) AS il
+            JOIN pragma_index_info(il.name) AS ii
+            ORDER BY il.seq, ii.seqno
+        """
+        cursor = self.connection.execute(query, (table_name,))
+        return [
+            {
+                "index_name": row[0],
+                "column_name": row[1],
+                "is_unique": row[2] == 1
+            }
+            for row in cursor.fetchall()
+        ]
     
-    def get_all_schemas(self) -> Dict[str, TableSchema]:
-        """Get schema information for all tables"""
+    def _fetch_all_schemas(self) -> Dict[str, TableSchema]:
+        """Query schema information for all tables"""
         tables = self.get_tables()
         return {table: self.get_table_schema(table) for table in tables}
     
     def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Execute a SQL query and return results"""
-        cursor = self.connection.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
+        cursor = self.connection.execute(query, params or ())
         return [dict(row) for row in cursor.fetchall()]
     
+    def fetch_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a SQL query once and yield its rows in batches"""
+        cursor = self.connection.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+    
     def get_sample_data(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get sample data from a table"""
-        query = f"SELECT * FROM {table_name} LIMIT ?"
-        cursor = self.connection.cursor()
-        cursor.execute(query, (limit,))
-        return [dict(row) for row in cursor.fetchall()]
+        query = f"SELECT * FROM {check_identifier(table_name)} LIMIT ?"
+        return [dict(row) for row in self.connection.execute(query, (limit,)).fetchall()]
     
-    def get_row_count(self, table_name: str) -> int:
-        """Get total row count for a table"""
-        query = f"SELECT COUNT(*) FROM {table_name}"
-        cursor = self.connection.cursor()
-        cursor.execute(query)
-        return cursor.fetchone()[0]
+    def get_row_count(self, table_name: str, exact: bool = False) -> int:
+        """Get total row count for a table (SQLite has no estimate, so always exact)"""
+        query = f"SELECT COUNT(*) FROM {check_identifier(table_name)}"
+        return self.connection.execute(query).fetchone()[0]
 
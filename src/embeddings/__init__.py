@@ -2,6 +2,7 @@
 
 from .embedder import EmbeddingService
 from .vector_store import VectorStore
+from .cache import EmbeddingCache
 
-__all__ = ["EmbeddingService", "VectorStore"]
+__all__ = ["EmbeddingService", "VectorStore", "EmbeddingCache"]
 
@@ -0,0 +1,114 @@
+"""Persistent content-hash cache for embedding vectors"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache mapping SHA-256(text) to an embedding vector
+
+    Entries are keyed by ``(provider, model, hash)`` so switching the
+    embedding provider or model never returns stale vectors. Vectors are
+    stored as float16 blobs to halve disk usage.
+    """
+
+    def __init__(self, db_path: str, provider: str, model: str):
+        """
+        Initialize embedding cache
+
+        Args:
+            db_path: Path to the SQLite database file
+            provider: Embedding provider the cached vectors come from
+            model: Embedding model the cached vectors come from
+        """
+        self.db_path = Path(db_path)
+        self.provider = provider
+        self.model = model
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    hash BLOB NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (provider, model, hash)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+
+        logger.info(f"Embedding cache opened at {self.db_path}")
+
+    @staticmethod
+    def hash_text(text: str) -> bytes:
+        """Get the cache key digest for a text"""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def get_many(self, hashes: List[bytes]) -> Dict[bytes, List[float]]:
+        """
+        Look up cached vectors
+
+        Args:
+            hashes: Text digests from hash_text()
+
+        Returns:
+            Mapping of digest to vector for the digests found in the cache
+        """
+        found: Dict[bytes, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+
+        # Stay well below SQLite's bound-parameter limit
+        chunk_size = 500
+        with self._lock:
+            for i in range(0, len(unique), chunk_size):
+                chunk = unique[i:i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings "
+                    f"WHERE provider = ? AND model = ? AND hash IN ({placeholders})",
+                    (self.provider, self.model, *chunk)
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+
+        return found
+
+    def put_many(self, pairs: Iterable[Tuple[bytes, List[float]]]) -> None:
+        """
+        Store vectors in the cache
+
+        Args:
+            pairs: (digest, vector) pairs
+        """
+        rows = [
+            (self.provider, self.model, digest, np.asarray(vector, dtype=np.float16).tobytes())
+            for digest, vector in pairs
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (provider, model, hash, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
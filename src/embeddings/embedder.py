@@ -1,11 +1,22 @@
 """Embedding service for generating vector embeddings"""
 
-from typing import List, Union, Optional
+import asyncio
+from typing import Dict, List, Union, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 import google.generativeai as genai
 from loguru import logger
 
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+    simsimd = None
+
+from .cache import EmbeddingCache
+
 
 class EmbeddingService:
     """Service for generating embeddings using OpenAI or Google Gemini"""
@@ -14,7 +25,8 @@ class EmbeddingService:
         self,
         api_key: str,
         model: str = "text-embedding-3-small",
-        provider: str = "openai"
+        provider: str = "openai",
+        cache: Optional[EmbeddingCache] = None
     ):
         """
         Initialize embedding service
@@ -23,12 +35,16 @@ class EmbeddingService:
             api_key: API key for the provider
             model: Embedding model to use
             provider: Provider to use ('openai' or 'gemini')
+            cache: Optional content-hash cache; texts already embedded are
+                served from it instead of calling the provider
         """
         self.provider = provider.lower()
         self.model = model
+        self.cache = cache
 
         if self.provider == "openai":
             self.client = OpenAI(api_key=api_key)
+            self.aclient = AsyncOpenAI(api_key=api_key)
             self.dimension = 1536 if "small" in model else 3072
         elif self.provider == "gemini":
             genai.configure(api_key=api_key)
@@ -64,46 +80,209 @@ class EmbeddingService:
             logger.error(f"Error generating embedding with {self.provider}: {e}")
             raise
     
-    def embed_texts(self, texts: List[str], batch_size: int = 100) -> List[List[float]]:
+    def embed_texts(
+        self,
+        texts: List[str],
+        batch_size: int = 100,
+        max_workers: int = 4,
+        as_array: bool = False
+    ) -> Union[List[List[float]], np.ndarray]:
         """
         Generate embeddings for multiple texts in batches
 
+        Each batch is sent as a single request (OpenAI ``input=[...]``,
+        Gemini ``batchEmbedContents``) and batches are dispatched concurrently.
+
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts to process in each batch
+            batch_size: Number of texts to send in each request
+            max_workers: Maximum number of batches in flight at once
+            as_array: Return one (n, dimension) float32 array, ready for
+                VectorStore.add_vectors, instead of a list of lists
 
         Returns:
-            List of embedding vectors
+            Embedding vectors, in the same order as ``texts``
         """
+        if not texts:
+            return self._to_result([], as_array)
+
+        if self.cache is None:
+            return self._to_result(self._embed_uncached(texts, batch_size, max_workers), as_array)
+
+        hashes, cached, misses = self._cache_lookup(texts)
+        if misses:
+            fresh = self._embed_uncached(list(misses.values()), batch_size, max_workers)
+            self._cache_store(cached, misses, fresh)
+
+        logger.debug(f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} misses")
+        return self._to_result([cached[digest] for digest in hashes], as_array)
+
+    async def aembed_texts(
+        self,
+        texts: List[str],
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        as_array: bool = False
+    ) -> Union[List[List[float]], np.ndarray]:
+        """
+        Async version of embed_texts for callers already on an event loop
+
+        Batches are awaited together with asyncio.gather on the async OpenAI
+        client (Gemini batches run in worker threads), with at most
+        max_concurrency requests in flight.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts to send in each request
+            max_concurrency: Maximum number of batches in flight at once
+            as_array: Return one (n, dimension) float32 array instead of a
+                list of lists
+
+        Returns:
+            Embedding vectors, in the same order as ``texts``
+        """
+        if not texts:
+            return self._to_result([], as_array)
+
+        if self.cache is None:
+            embeddings = await self._aembed_uncached(texts, batch_size, max_concurrency)
+            return self._to_result(embeddings, as_array)
+
+        hashes, cached, misses = await asyncio.to_thread(self._cache_lookup, texts)
+        if misses:
+            fresh = await self._aembed_uncached(list(misses.values()), batch_size, max_concurrency)
+            await asyncio.to_thread(self._cache_store, cached, misses, fresh)
+
+        logger.debug(f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} misses")
+        return self._to_result([cached[digest] for digest in hashes], as_array)
+
+    def _to_result(
+        self,
+        embeddings: List[List[float]],
+        as_array: bool
+    ) -> Union[List[List[float]], np.ndarray]:
+        """Return embeddings as lists, or packed into one float32 matrix"""
+        if not as_array:
+            return embeddings
+        if not embeddings:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.array(embeddings, dtype=np.float32)
+
+    def _cache_lookup(
+        self,
+        texts: List[str]
+    ) -> Tuple[List[bytes], Dict[bytes, List[float]], Dict[bytes, str]]:
+        """Hash texts and split them into cached vectors and unique misses"""
+        hashes = [EmbeddingCache.hash_text(text) for text in texts]
+        cached = self.cache.get_many(hashes)
+
+        misses = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in cached and digest not in misses:
+                misses[digest] = text
+        return hashes, cached, misses
+
+    def _cache_store(
+        self,
+        cached: Dict[bytes, List[float]],
+        misses: Dict[bytes, str],
+        fresh: List[List[float]]
+    ) -> None:
+        """Write freshly embedded misses to the cache and the lookup result"""
+        fresh_pairs = list(zip(misses.keys(), fresh))
+        self.cache.put_many(fresh_pairs)
+        cached.update(fresh_pairs)
+
+    def _embed_uncached(
+        self,
+        texts: List[str],
+        batch_size: int,
+        max_workers: int
+    ) -> List[List[float]]:
+        """Embed texts with the provider, dispatching batches concurrently"""
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+
         embeddings = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            for batch_embeddings in executor.map(self._embed_batch, batches):
+                embeddings.extend(batch_embeddings)
 
-        if self.provider == "openai":
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                try:
-                    response = self.client.embeddings.create(
-                        input=batch,
-                        model=self.model
-                    )
-                    batch_embeddings = [item.embedding for item in response.data]
-                    embeddings.extend(batch_embeddings)
-                except Exception as e:
-                    logger.error(f"Error generating batch embeddings: {e}")
-                    raise
-        elif self.provider == "gemini":
-            for text in texts:
-                try:
-                    result = genai.embed_content(
-                        model=self.model,
-                        content=text,
-                        task_type="retrieval_document"
-                    )
-                    embeddings.append(result['embedding'])
-                except Exception as e:
-                    logger.error(f"Error generating embedding for text: {e}")
-                    raise
+        return embeddings
 
+    async def _aembed_uncached(
+        self,
+        texts: List[str],
+        batch_size: int,
+        max_concurrency: int
+    ) -> List[List[float]]:
+        """Embed texts with the provider, awaiting batches concurrently"""
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def embed(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._aembed_batch(batch)
+
+        embeddings = []
+        # gather returns results in argument order, so texts keep their order
+        for batch_embeddings in await asyncio.gather(*(embed(batch) for batch in batches)):
+            embeddings.extend(batch_embeddings)
         return embeddings
+
+    async def _aembed_batch(
+        self,
+        batch: List[str],
+        max_retries: int = 3,
+        initial_delay: float = 1.0
+    ) -> List[List[float]]:
+        """Embed one batch without blocking the loop, backing off on rate limits"""
+        if self.provider != "openai":
+            return await asyncio.to_thread(self._embed_batch, batch)
+
+        delay = initial_delay
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self.aclient.embeddings.create(
+                    input=batch,
+                    model=self.model
+                )
+                return [item.embedding for item in response.data]
+            except RateLimitError as e:
+                if attempt == max_retries:
+                    logger.error(f"Error generating batch embeddings with {self.provider}: {e}")
+                    raise
+                logger.warning(
+                    f"Rate limit hit (attempt {attempt + 1}/{max_retries}). "
+                    f"Retrying in {delay:.1f}s..."
+                )
+                await asyncio.sleep(delay)
+                delay *= 2
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings with {self.provider}: {e}")
+                raise
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed a single batch of texts with one provider request"""
+        try:
+            if self.provider == "openai":
+                response = self.client.embeddings.create(
+                    input=batch,
+                    model=self.model
+                )
+                return [item.embedding for item in response.data]
+            elif self.provider == "gemini":
+                result = genai.embed_content(
+                    model=self.model,
+                    content=batch,
+                    task_type="retrieval_document"
+                )
+                return result['embedding']
+        except Exception as e:
+            logger.error(f"Error generating batch embeddings with {self.provider}: {e}")
+            raise
     
     def embed_node(self, node_data: dict) -> List[float]:
         """
@@ -115,17 +294,41 @@ class EmbeddingService:
         Returns:
             Embedding vector
         """
-        text_parts = []
-        
-        if "label" in node_data:
-            text_parts.append(f"Type: {node_data['label']}")
-        
-        for key, value in node_data.items():
-            if key != "label" and value is not None:
-                text_parts.append(f"{key}: {value}")
+        return self.embed_text(self.node_text(node_data))
+    
+    def embed_nodes(
+        self,
+        nodes: List[dict],
+        batch_size: int = 100,
+        as_array: bool = False
+    ) -> Union[List[List[float]], np.ndarray]:
+        """
+        Generate embeddings for many graph nodes with batched requests
         
-        text = " | ".join(text_parts)
-        return self.embed_text(text)
+        Args:
+            nodes: Node properties dictionaries
+            batch_size: Number of nodes to send in each request
+            as_array: Return one float32 matrix instead of a list of lists
+            
+        Returns:
+            Embedding vectors, in the same order as ``nodes``
+        """
+        texts = [self.node_text(node_data) for node_data in nodes]
+        return self.embed_texts(texts, batch_size=batch_size, as_array=as_array)
+    
+    @staticmethod
+    def node_text(node_data: dict) -> str:
+        """Build the text embedded for a node: its type, then non-null properties"""
+        properties = " | ".join(
+            f"{key}: {value}"
+            for key, value in node_data.items()
+            if value is not None and key != "label"
+        )
+        if "label" not in node_data:
+            return properties
+        if not properties:
+            return f"Type: {node_data['label']}"
+        return f"Type: {node_data['label']} | {properties}"
     
     @staticmethod
     def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -139,6 +342,12 @@ class EmbeddingService:
         Returns:
             Cosine similarity score
         """
+        if SIMSIMD_AVAILABLE:
+            # One fused SIMD pass instead of a dot product and two norms
+            v1 = np.asarray(vec1, dtype=np.float32)
+            v2 = np.asarray(vec2, dtype=np.float32)
+            return 1.0 - float(simsimd.cosine(v1, v2))
+        
         v1 = np.array(vec1)
         v2 = np.array(vec2)
         
@@ -151,3 +360,29 @@ class EmbeddingService:
         
         return dot_product / (norm_v1 * norm_v2)
 
+    @staticmethod
+    def cosine_similarity_batch(
+        query: Union[List[float], np.ndarray],
+        matrix: Union[List[List[float]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Calculate cosine similarity between one vector and many
+        
+        Args:
+            query: Query vector
+            matrix: Vectors to compare against, one per row
+            
+        Returns:
+            Cosine similarity score for each row of ``matrix``
+        """
+        q = np.ascontiguousarray(query, dtype=np.float32)
+        m = np.ascontiguousarray(matrix, dtype=np.float32)
+        
+        if SIMSIMD_AVAILABLE:
+            return 1.0 - np.asarray(simsimd.cdist(q[None, :], m, metric="cosine"))[0]
+        
+        norms = np.linalg.norm(m, axis=1) * np.linalg.norm(q)
+        scores = m @ q
+        np.divide(scores, norms, out=scores, where=norms != 0)
+        scores[norms == 0] = 0.0
+        return scores
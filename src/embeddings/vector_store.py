@@ -1,8 +1,10 @@
 """Vector store for similarity search"""
 
-from typing import List, Dict, Any, Tuple
+import os
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
 import faiss
+import orjson
 import pickle
 from pathlib import Path
 from loguru import logger
@@ -11,48 +13,190 @@ from loguru import logger
 class VectorStore:
     """FAISS-based vector store for similarity search"""
 
-    def __init__(self, dimension: int = 1536, storage_path: str = "data/vector_store", auto_save: bool = True):
+    QUANTIZATION_TYPES = {
+        "fp16": faiss.ScalarQuantizer.QT_fp16,
+        "int8": faiss.ScalarQuantizer.QT_8bit
+    }
+
+    INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+
+    METRICS = {
+        "cosine": faiss.METRIC_INNER_PRODUCT,
+        "l2": faiss.METRIC_L2
+    }
+
+    # HNSW graph degree and build/search beam widths
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+
+    # Vectors to collect before training an int8 or IVF-PQ index; a single
+    # incremental add is far too few to learn ranges or centroids from
+    MIN_TRAINING_VECTORS = 256
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        storage_path: str = "data/vector_store",
+        auto_save: bool = True,
+        auto_save_every: int = 10000,
+        quantization: str = "fp16",
+        index_type: str = "flat",
+        metric: str = "cosine",
+        nlist: int = 256,
+        nprobe: int = 16,
+        num_threads: Optional[int] = None,
+        device: str = "cpu"
+    ):
         """
         Initialize vector store
 
         Args:
             dimension: Dimension of embedding vectors
             storage_path: Path to store/load the vector store
-            auto_save: Whether to automatically save after adding vectors
+            auto_save: Whether to automatically persist added vectors
+            auto_save_every: Number of added vectors after which the index
+                is rewritten to disk; metadata is appended on every add, and
+                flush() writes out the rest
+            quantization: Storage precision for vectors ('none', 'fp16' or
+                'int8'); ignored by 'ivfpq', which stores product codes
+            index_type: 'flat' (exact search), 'hnsw' (graph-based
+                approximate search) or 'ivfpq' (inverted lists of product
+                codes)
+
+                Indexes that need training (int8 and 'ivfpq') buffer added
+                vectors until MIN_TRAINING_VECTORS (and, for 'ivfpq', nlist)
+                have arrived; buffered vectors are not searchable yet
+            metric: 'cosine' (inner product on L2-normalized vectors) or 'l2'
+            nlist: Number of inverted lists for 'ivfpq'
+            nprobe: Number of inverted lists visited per 'ivfpq' search
+            num_threads: OpenMP threads FAISS uses for adds and searches
+                (None = one per CPU core)
+            device: 'cpu' or 'cuda'; 'cuda' keeps the index on GPU 0 when
+                FAISS sees a GPU and supports the index type there, and
+                falls back to the CPU otherwise
         """
+        if quantization != "none" and quantization not in self.QUANTIZATION_TYPES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}")
+        if metric not in self.METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+
         self.dimension = dimension
         self.storage_path = Path(storage_path)
         self.auto_save = auto_save
-        self.index = faiss.IndexFlatL2(dimension)
+        self.auto_save_every = auto_save_every
+        self._pending_since_save = 0
+        self.quantization = quantization
+        self.index_type = index_type
+        self.metric = metric
+        self.nlist = nlist
+        self.nprobe = nprobe
+
+        # The OpenMP thread count is process-wide in FAISS
+        faiss.omp_set_num_threads(num_threads or os.cpu_count() or 1)
+        # pip wheels pick the AVX2 build at import when the CPU supports it
+        logger.info(f"FAISS compile options: {faiss.get_compile_options()}")
+
+        self.device = device
+        self._gpu_resources = None
+        if device == "cuda":
+            if faiss.get_num_gpus() > 0:
+                self._gpu_resources = faiss.StandardGpuResources()
+            else:
+                logger.warning("No GPU visible to FAISS, using the CPU index")
+                self.device = "cpu"
+
+        self.index = self._create_index()
         self.metadata: List[Dict[str, Any]] = []
+        self._untrained_vectors: List[np.ndarray] = []
+        self._untrained_metadata: List[Dict[str, Any]] = []
 
         self._auto_load()
     
     def add_vectors(
         self,
-        vectors: List[List[float]],
+        vectors: Union[List[List[float]], np.ndarray],
         metadata: List[Dict[str, Any]]
     ) -> None:
         """
         Add vectors to the store
 
         Args:
-            vectors: List of embedding vectors
+            vectors: Embedding vectors; for the 'l2' metric a contiguous
+                float32 array is used without copying
             metadata: List of metadata dictionaries (one per vector)
         """
         if len(vectors) != len(metadata):
             raise ValueError("Number of vectors must match number of metadata items")
 
-        vectors_np = np.array(vectors, dtype=np.float32)
+        vectors_np = self._prepare(vectors)
+
+        if not self.index.is_trained:
+            self._untrained_vectors.append(vectors_np)
+            self._untrained_metadata.extend(metadata)
+            if len(self._untrained_metadata) < self._training_size():
+                logger.info(
+                    f"Buffered {len(vectors)} vectors until the index can be trained. "
+                    f"Buffered: {len(self._untrained_metadata)}"
+                )
+                return
+            vectors_np, metadata = self._take_untrained()
+            self.index.train(vectors_np)
 
+        self._add_trained(vectors_np, metadata)
+
+    def _add_trained(self, vectors_np: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
+        """Add prepared vectors to a trained index and persist their metadata"""
         self.index.add(vectors_np)
 
         self.metadata.extend(metadata)
 
-        logger.info(f"Added {len(vectors)} vectors to store. Total: {self.index.ntotal}")
+        logger.info(f"Added {len(metadata)} vectors to store. Total: {self.index.ntotal}")
 
         if self.auto_save:
+            self._append_metadata(metadata)
+            self._pending_since_save += len(metadata)
+            if self._pending_since_save >= self.auto_save_every:
+                self._auto_save()
+
+    def _training_size(self) -> int:
+        """Number of vectors needed before the index is trained"""
+        if self.index_type == "ivfpq":
+            # k-means needs a point per list, and PQ one per 8-bit code
+            return max(self.nlist, self.MIN_TRAINING_VECTORS)
+        return self.MIN_TRAINING_VECTORS
+
+    def _take_untrained(self) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Remove and return the vectors buffered for training"""
+        vectors_np = np.concatenate(self._untrained_vectors)
+        metadata = self._untrained_metadata
+        self._untrained_vectors = []
+        self._untrained_metadata = []
+        return vectors_np, metadata
+
+    def flush(self) -> None:
+        """Write vectors added since the last save to disk"""
+        if self._untrained_metadata:
+            if self.index_type == "ivfpq":
+                logger.warning(
+                    f"{len(self._untrained_metadata)} vectors are not saved: IVF-PQ needs "
+                    f"{self._training_size()} to train"
+                )
+            else:
+                # Scalar quantizer ranges can be learned from any number of
+                # vectors, just less accurately from few
+                vectors_np, metadata = self._take_untrained()
+                self.index.train(vectors_np)
+                self._add_trained(vectors_np, metadata)
+        if self._pending_since_save:
             self._auto_save()
+
+    def close(self) -> None:
+        """Flush pending vectors; call before discarding the store"""
+        if self.auto_save:
+            self.flush()
     
     def search(
         self, 
@@ -67,18 +211,55 @@ class VectorStore:
             top_k: Number of results to return
             
         Returns:
-            List of (metadata, distance) tuples
+            List of (metadata, similarity) tuples, most similar first; the
+            similarity is the cosine for the 'cosine' metric and
+            1 / (1 + distance) for 'l2'
         """
-        query_np = np.array([query_vector], dtype=np.float32)
-        
+        return self.search_batch([query_vector], top_k)[0]
+
+    def search_batch(
+        self,
+        query_vectors: Union[List[List[float]], np.ndarray],
+        top_k: int = 10
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Search for similar vectors for many queries in one index call
+
+        Args:
+            query_vectors: Query embedding vectors, one per row
+            top_k: Number of results to return per query
+
+        Returns:
+            One list of (metadata, similarity) tuples per query, as for search()
+        """
+        query_np = self._prepare(query_vectors)
+        if not self.index.is_trained:
+            return [[] for _ in range(len(query_np))]
+
         distances, indices = self.index.search(query_np, top_k)
-        
+
+        cosine = self.metric == "cosine"
+        metadata = self.metadata
         results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx < len(self.metadata):
-                results.append((self.metadata[idx], float(dist)))
-        
+        for row_distances, row_indices in zip(distances, indices):
+            row = []
+            for dist, idx in zip(row_distances, row_indices):
+                # idx is -1 when fewer than top_k vectors were found
+                if 0 <= idx < len(metadata):
+                    score = float(dist) if cosine else 1.0 / (1.0 + float(dist))
+                    row.append((metadata[idx], score))
+            results.append(row)
+
         return results
+
+    def _prepare(self, vectors: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """Convert vectors to a float32 matrix, L2-normalized for cosine"""
+        if self.metric != "cosine":
+            return np.ascontiguousarray(vectors, dtype=np.float32)
+        # normalize_L2 works in place, so never hand it the caller's array
+        vectors_np = np.array(vectors, dtype=np.float32)
+        faiss.normalize_L2(vectors_np)
+        return vectors_np
     
     def save(self, path: str) -> None:
         """
@@ -90,12 +271,35 @@ class VectorStore:
         path_obj = Path(path)
         path_obj.mkdir(parents=True, exist_ok=True)
         
-        faiss.write_index(self.index, str(path_obj / "index.faiss"))
-        
-        with open(path_obj / "metadata.pkl", "wb") as f:
-            pickle.dump(self.metadata, f)
+        self._write_index(path_obj)
+        self._write_metadata(path_obj)
         
         logger.info(f"Saved vector store to {path}")
+
+    def _write_index(self, path_obj: Path) -> None:
+        """Serialize the FAISS index into a directory"""
+        index = self.index
+        if self._gpu_resources is not None:
+            index = faiss.index_gpu_to_cpu(index)
+        faiss.write_index(index, str(path_obj / "index.faiss"))
+
+    def _write_metadata(self, path_obj: Path) -> None:
+        """Rewrite the whole metadata sidecar, one JSON object per line"""
+        with open(path_obj / "metadata.jsonl", "wb") as f:
+            for item in self.metadata:
+                f.write(orjson.dumps(item, default=str, option=orjson.OPT_APPEND_NEWLINE))
+
+    def _append_metadata(self, metadata: List[Dict[str, Any]]) -> None:
+        """Append new metadata to the sidecar in the storage path"""
+        try:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            with open(self.storage_path / "metadata.jsonl", "ab") as f:
+                f.write(b"".join(
+                    orjson.dumps(item, default=str, option=orjson.OPT_APPEND_NEWLINE)
+                    for item in metadata
+                ))
+        except Exception as e:
+            logger.error(f"Failed to append vector store metadata: {e}")
     
     def load(self, path: str) -> None:
         """
@@ -106,21 +310,118 @@ class VectorStore:
         """
         path_obj = Path(path)
         
-        self.index = faiss.read_index(str(path_obj / "index.faiss"))
+        index = faiss.read_index(str(path_obj / "index.faiss"))
+        # A saved index keeps the type and metric it was built with
+        self.metric = "cosine" if index.metric_type == faiss.METRIC_INNER_PRODUCT else "l2"
+        if isinstance(index, faiss.IndexHNSW):
+            self.index_type = "hnsw"
+        elif isinstance(index, faiss.IndexIVF):
+            self.index_type = "ivfpq"
+        else:
+            self.index_type = "flat"
+        self._configure_search(index)
+        self.index = self._to_device(index)
         
-        with open(path_obj / "metadata.pkl", "rb") as f:
-            self.metadata = pickle.load(f)
+        jsonl_path = path_obj / "metadata.jsonl"
+        if jsonl_path.exists():
+            with open(jsonl_path, "rb") as f:
+                self.metadata = [orjson.loads(line) for line in f if line.strip()]
+        else:
+            # Stores saved before the JSONL sidecar; convert them so later
+            # appends line up with the index
+            with open(path_obj / "metadata.pkl", "rb") as f:
+                self.metadata = pickle.load(f)
+            self._write_metadata(path_obj)
+
+        if len(self.metadata) > self.index.ntotal:
+            # Metadata is appended before the index is next written, so a
+            # crash in between leaves extra lines behind
+            logger.warning(
+                f"Dropping {len(self.metadata) - self.index.ntotal} metadata entries "
+                f"with no saved vector"
+            )
+            del self.metadata[self.index.ntotal:]
+            self._write_metadata(path_obj)
+        self._untrained_vectors = []
+        self._untrained_metadata = []
+        self._pending_since_save = 0
         
         logger.info(f"Loaded vector store from {path}. Total vectors: {self.index.ntotal}")
     
     def clear(self) -> None:
         """Clear all vectors from the store"""
-        self.index = faiss.IndexFlatL2(self.dimension)
+        self.index = self._create_index()
         self.metadata = []
+        self._untrained_vectors = []
+        self._untrained_metadata = []
+        self._pending_since_save = 0
         logger.info("Cleared vector store")
 
         if self.auto_save:
-            self._auto_save()
+            try:
+                self.save(str(self.storage_path))
+            except Exception as e:
+                logger.error(f"Failed to auto-save vector store: {e}")
+
+    def _create_index(self) -> faiss.Index:
+        """Create an empty index for the configured type, metric and quantization"""
+        metric = self.METRICS[self.metric]
+
+        if self.index_type == "ivfpq":
+            quantizer = (
+                faiss.IndexFlatIP(self.dimension) if self.metric == "cosine"
+                else faiss.IndexFlatL2(self.dimension)
+            )
+            index = faiss.IndexIVFPQ(
+                quantizer, self.dimension, self.nlist, self._pq_subquantizers(), 8, metric
+            )
+        elif self.index_type == "hnsw":
+            if self.quantization == "none":
+                index = faiss.IndexHNSWFlat(self.dimension, self.HNSW_M, metric)
+            else:
+                index = faiss.IndexHNSWSQ(
+                    self.dimension,
+                    self.QUANTIZATION_TYPES[self.quantization],
+                    self.HNSW_M,
+                    metric
+                )
+            index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+        elif self.quantization == "none":
+            index = faiss.IndexFlat(self.dimension, metric)
+        else:
+            index = faiss.IndexScalarQuantizer(
+                self.dimension,
+                self.QUANTIZATION_TYPES[self.quantization],
+                metric
+            )
+
+        self._configure_search(index)
+        return self._to_device(index)
+
+    def _to_device(self, index: faiss.Index) -> faiss.Index:
+        """Move a CPU index to the GPU when the store runs on one"""
+        if self._gpu_resources is None:
+            return index
+        try:
+            return faiss.index_cpu_to_gpu(self._gpu_resources, 0, index)
+        except RuntimeError as e:
+            # e.g. HNSW, which FAISS cannot run on a GPU
+            logger.warning(f"Keeping {self.index_type} index on the CPU: {e}")
+            return index
+
+    def _pq_subquantizers(self) -> int:
+        """Largest PQ subquantizer count up to dimension / 8 that divides it"""
+        m = max(1, self.dimension // 8)
+        while self.dimension % m:
+            m -= 1
+        return m
+
+    def _configure_search(self, index: faiss.Index) -> None:
+        """Apply search-time parameters, which saved indexes do not keep"""
+        if isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = self.HNSW_EF_SEARCH
+        elif isinstance(index, faiss.IndexIVF):
+            index.nprobe = self.nprobe
 
     def _auto_load(self) -> None:
         """Automatically load vector store if it exists"""
@@ -132,9 +433,12 @@ class VectorStore:
             logger.warning(f"Could not auto-load vector store: {e}")
 
     def _auto_save(self) -> None:
-        """Automatically save vector store"""
+        """Write the index to the storage path (its metadata is already appended)"""
         try:
-            self.save(str(self.storage_path))
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            self._write_index(self.storage_path)
+            self._pending_since_save = 0
+            logger.info(f"Saved vector store index to {self.storage_path}")
         except Exception as e:
             logger.error(f"Failed to auto-save vector store: {e}")
 
@@ -143,8 +447,14 @@ class VectorStore:
         return {
             "size": self.size,
             "dimension": self.dimension,
+            "quantization": self.quantization,
+            "index_type": self.index_type,
+            "metric": self.metric,
+            "device": self.device,
             "storage_path": str(self.storage_path),
             "auto_save": self.auto_save,
+            "pending_since_save": self._pending_since_save,
+            "pending_training": len(self._untrained_metadata),
             "is_loaded": self.size > 0,
             "storage_exists": (self.storage_path / "index.faiss").exists()
         }
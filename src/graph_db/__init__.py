@@ -1,8 +1,8 @@
 """Graph database connectors module"""
 
 from .base import GraphDatabaseConnector
-from .neo4j_connector import Neo4jConnector
+from .neo4j_connector import Neo4jConnector, AsyncNeo4jConnector
 from .neptune_connector import NeptuneConnector
 
-__all__ = ["GraphDatabaseConnector", "Neo4jConnector", "NeptuneConnector"]
+__all__ = ["GraphDatabaseConnector", "Neo4jConnector", "AsyncNeo4jConnector", "NeptuneConnector"]
 
@@ -1,12 +1,15 @@
 """Base graph database connector interface"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 
 class GraphDatabaseConnector(ABC):
     """Abstract base class for graph database connectors"""
     
+    # Whether batch_merge_nodes/batch_merge_relationships are implemented
+    supports_merge: bool = False
+    
     def __init__(self, connection_config: Dict[str, Any]):
         self.connection_config = connection_config
         self.connection = None
@@ -50,11 +53,63 @@ class GraphDatabaseConnector(ABC):
         """Create multiple relationships in batch"""
         pass
     
+    def batch_merge_nodes(self, label: str, key: str, nodes: List[Dict[str, Any]]) -> int:
+        """
+        Upsert multiple nodes in batch, matching existing nodes on a key property
+
+        Args:
+            label: Node label
+            key: Property that uniquely identifies a node of this label
+            nodes: Node property dictionaries, each containing ``key``
+
+        Returns:
+            Number of nodes merged
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support batch merges")
+    
+    def batch_merge_relationships(
+        self,
+        from_label: str,
+        from_key: str,
+        to_label: str,
+        to_key: str,
+        relationship_type: str,
+        relationships: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Upsert multiple relationships in batch, matching endpoints by key property
+
+        Each relationship dict should have:
+        - from_key: key value of the source node
+        - to_key: key value of the target node
+        - properties: optional properties dict
+
+        Returns:
+            Number of relationships merged
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support batch merges")
+    
     @abstractmethod
     def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Execute a query and return results"""
         pass
     
+    def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute a query and yield results in batches
+
+        The default implementation materializes the full result; connectors
+        that support cursors should override it to stream from the server.
+        """
+        results = self.execute_query(query, parameters)
+        for i in range(0, len(results), batch_size):
+            yield results[i:i + batch_size]
+    
     @abstractmethod
     def create_index(self, label: str, property_name: str) -> None:
         """Create an index on a node property"""
@@ -1,18 +1,43 @@
 """Neo4j graph database connector"""
 
-from typing import Any, Dict, List, Optional
-from neo4j import GraphDatabase, Driver
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase, Driver
 from loguru import logger
 
 from .base import GraphDatabaseConnector
 
 
+_POOL_OPTIONS = (
+    "max_connection_pool_size",
+    "connection_acquisition_timeout",
+    "max_connection_lifetime"
+)
+
+
+# Rows written per transaction by the batch methods; larger lists are split
+# so one transaction's state never grows without bound
+BATCH_CHUNK_SIZE = 10_000
+
+
+def _pool_options(connection_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract driver connection pool options present in the config"""
+    return {
+        key: connection_config[key]
+        for key in _POOL_OPTIONS
+        if connection_config.get(key) is not None
+    }
+
+
 class Neo4jConnector(GraphDatabaseConnector):
     """Neo4j database connector implementation"""
     
+    supports_merge = True
+    
     def __init__(self, connection_config: Dict[str, Any]):
         super().__init__(connection_config)
         self.driver: Optional[Driver] = None
+        # Naming the database spares each session a home-database lookup
+        self.database: Optional[str] = connection_config.get("database")
     
     def connect(self) -> None:
         """Establish connection to Neo4j"""
@@ -21,7 +46,7 @@ class Neo4jConnector(GraphDatabaseConnector):
             user = self.connection_config.get("user", "neo4j")
             password = self.connection_config.get("password", "neo4j")
             
-            self.driver = GraphDatabase.driver(uri, auth=(user, password))
+            self.driver = GraphDatabase.driver(uri, auth=(user, password), **_pool_options(self.connection_config))
             self.driver.verify_connectivity()
             logger.info(f"Successfully connected to Neo4j at {uri}")
         except Exception as e:
@@ -34,13 +59,49 @@ class Neo4jConnector(GraphDatabaseConnector):
             self.driver.close()
             logger.info("Neo4j connection closed")
     
+    def _session(self, **kwargs):
+        """
+        Open a session on the configured database
+
+        Sessions are cheap (the driver pools the bolt connections) but not
+        thread-safe, so each call opens its own rather than sharing one.
+        """
+        return self.driver.session(database=self.database, **kwargs)
+    
+    def _write(self, query: str, **params) -> List[Any]:
+        """Run a write query in a managed (retried) transaction, returning its records"""
+        with self._session() as session:
+            return session.execute_write(lambda tx: list(tx.run(query, **params)))
+    
+    def _write_chunks(
+        self,
+        query: str,
+        param: str,
+        rows: List[Dict[str, Any]],
+        field: Union[str, Tuple[str, ...]]
+    ) -> List[Any]:
+        """
+        Run an UNWIND write over rows, one transaction per BATCH_CHUNK_SIZE rows
+
+        Returns the ``field`` value of each result record, or a tuple of
+        values when ``field`` names several.
+        """
+        values = []
+        with self._session() as session:
+            for i in range(0, len(rows), BATCH_CHUNK_SIZE):
+                chunk = rows[i:i + BATCH_CHUNK_SIZE]
+                if isinstance(field, str):
+                    work = lambda tx: [record[field] for record in tx.run(query, **{param: chunk})]
+                else:
+                    work = lambda tx: [record.values(*field) for record in tx.run(query, **{param: chunk})]
+                values.extend(session.execute_write(work))
+        return values
+    
     def create_node(self, label: str, properties: Dict[str, Any]) -> Any:
-        """Create a node in Neo4j"""
-        with self.driver.session() as session:
-            query = f"CREATE (n:{label} $props) RETURN id(n) as node_id"
-            result = session.run(query, props=properties)
-            record = result.single()
-            return record["node_id"] if record else None
+        """Create a node in Neo4j (prefer batch_create_nodes for many nodes)"""
+        query = f"CREATE (n:{label} $props) RETURN id(n) as node_id"
+        records = self._write(query, props=properties)
+        return records[0]["node_id"] if records else None
     
     def create_relationship(
         self,
@@ -49,37 +110,33 @@ class Neo4jConnector(GraphDatabaseConnector):
         relationship_type: str,
         properties: Optional[Dict[str, Any]] = None
     ) -> Any:
-        """Create a relationship between two nodes"""
-        with self.driver.session() as session:
-            props_clause = "$props" if properties else "{}"
-            query = f"""
-                MATCH (a), (b)
-                WHERE id(a) = $from_id AND id(b) = $to_id
-                CREATE (a)-[r:{relationship_type} {props_clause}]->(b)
-                RETURN id(r) as rel_id
-            """
-            params = {
-                "from_id": from_node_id,
-                "to_id": to_node_id
-            }
-            if properties:
-                params["props"] = properties
-            
-            result = session.run(query, **params)
-            record = result.single()
-            return record["rel_id"] if record else None
+        """Create a relationship between two nodes (prefer batch_create_relationships for many)"""
+        props_clause = "$props" if properties else "{}"
+        query = f"""
+            MATCH (a), (b)
+            WHERE id(a) = $from_id AND id(b) = $to_id
+            CREATE (a)-[r:{relationship_type} {props_clause}]->(b)
+            RETURN id(r) as rel_id
+        """
+        params = {
+            "from_id": from_node_id,
+            "to_id": to_node_id
+        }
+        if properties:
+            params["props"] = properties
+        
+        records = self._write(query, **params)
+        return records[0]["rel_id"] if records else None
     
     def batch_create_nodes(self, label: str, nodes: List[Dict[str, Any]]) -> List[Any]:
         """Create multiple nodes in batch"""
-        with self.driver.session() as session:
-            query = f"""
-                UNWIND $nodes as node
-                CREATE (n:{label})
-                SET n = node
-                RETURN id(n) as node_id
-            """
-            result = session.run(query, nodes=nodes)
-            return [record["node_id"] for record in result]
+        query = f"""
+            UNWIND $nodes as node
+            CREATE (n:{label})
+            SET n = node
+            RETURN id(n) as node_id
+        """
+        return self._write_chunks(query, "nodes", nodes, "node_id")
     
     def batch_create_relationships(self, relationships: List[Dict[str, Any]]) -> List[Any]:
         """
@@ -90,46 +147,119 @@ class Neo4jConnector(GraphDatabaseConnector):
         - to_id: target node id
         - type: relationship type
         - properties: optional properties dict
+        
+        Returns relationship ids in input order, None where an endpoint
+        node was not found.
         """
-        with self.driver.session() as session:
-            query = """
+        # One plain-Cypher UNWIND per relationship type (a type can't be a
+        # parameter), so neither APOC nor a per-row fallback is needed
+        by_type: Dict[str, List[int]] = {}
+        for i, rel in enumerate(relationships):
+            by_type.setdefault(rel["type"], []).append(i)
+        
+        rel_ids: List[Any] = [None] * len(relationships)
+        for rel_type, positions in by_type.items():
+            query = f"""
                 UNWIND $rels as rel
                 MATCH (a), (b)
                 WHERE id(a) = rel.from_id AND id(b) = rel.to_id
-                CALL apoc.create.relationship(a, rel.type, rel.properties, b) YIELD rel as r
-                RETURN id(r) as rel_id
+                CREATE (a)-[r:`{rel_type}`]->(b)
+                SET r = coalesce(rel.properties, {{}})
+                RETURN rel.pos as pos, id(r) as rel_id
             """
-            try:
-                result = session.run(query, rels=relationships)
-                return [record["rel_id"] for record in result]
-            except Exception:
-                rel_ids = []
-                for rel in relationships:
-                    rel_id = self.create_relationship(
-                        rel["from_id"],
-                        rel["to_id"],
-                        rel["type"],
-                        rel.get("properties")
-                    )
-                    rel_ids.append(rel_id)
-                return rel_ids
+            rows = [
+                {
+                    "pos": pos,
+                    "from_id": relationships[pos]["from_id"],
+                    "to_id": relationships[pos]["to_id"],
+                    "properties": relationships[pos].get("properties")
+                }
+                for pos in positions
+            ]
+            for pos, rel_id in self._write_chunks(query, "rels", rows, ("pos", "rel_id")):
+                rel_ids[pos] = rel_id
+        return rel_ids
+    
+    def batch_merge_nodes(self, label: str, key: str, nodes: List[Dict[str, Any]]) -> int:
+        """Upsert multiple nodes in one transaction with UNWIND + MERGE"""
+        query = f"""
+            UNWIND $nodes AS node
+            MERGE (n:`{label}` {{`{key}`: node.`{key}`}})
+            SET n += node
+            RETURN count(n) AS count
+        """
+        with self._session() as session:
+            return session.execute_write(
+                lambda tx: tx.run(query, nodes=nodes).single()["count"]
+            )
+    
+    def batch_merge_relationships(
+        self,
+        from_label: str,
+        from_key: str,
+        to_label: str,
+        to_key: str,
+        relationship_type: str,
+        relationships: List[Dict[str, Any]]
+    ) -> int:
+        """Upsert multiple relationships in one transaction with UNWIND + MERGE"""
+        query = f"""
+            UNWIND $rels AS rel
+            MATCH (a:`{from_label}` {{`{from_key}`: rel.from_key}})
+            MATCH (b:`{to_label}` {{`{to_key}`: rel.to_key}})
+            MERGE (a)-[r:`{relationship_type}`]->(b)
+            SET r += coalesce(rel.properties, {{}})
+            RETURN count(r) AS count
+        """
+        with self._session() as session:
+            return session.execute_write(
+                lambda tx: tx.run(query, rels=relationships).single()["count"]
+            )
     
     def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Execute a Cypher query and return results"""
-        with self.driver.session() as session:
+        with self._session() as session:
             result = session.run(query, parameters or {})
             return [dict(record) for record in result]
     
+    def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute a Cypher query and yield results in batches
+
+        Records are pulled from the server ``batch_size`` at a time, so only
+        one batch is held in memory at once.
+
+        Args:
+            query: Cypher query
+            parameters: Query parameters
+            batch_size: Number of records per yielded batch
+
+        Yields:
+            Lists of result records as dictionaries
+        """
+        with self._session(fetch_size=batch_size) as session:
+            result = session.run(query, parameters or {})
+            while True:
+                records = result.fetch(batch_size)
+                if not records:
+                    break
+                yield [dict(record) for record in records]
+    
     def create_index(self, label: str, property_name: str) -> None:
         """Create an index on a node property"""
-        with self.driver.session() as session:
+        with self._session() as session:
             query = f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.{property_name})"
             session.run(query)
             logger.info(f"Created index on {label}.{property_name}")
     
     def create_constraint(self, label: str, property_name: str, constraint_type: str = "unique") -> None:
         """Create a constraint on a node property"""
-        with self.driver.session() as session:
+        with self._session() as session:
             if constraint_type == "unique":
                 query = f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{label}) REQUIRE n.{property_name} IS UNIQUE"
             else:
@@ -140,14 +270,14 @@ class Neo4jConnector(GraphDatabaseConnector):
     
     def clear_database(self) -> None:
         """Clear all data from the database"""
-        with self.driver.session() as session:
+        with self._session() as session:
             session.run("MATCH ()-[r]->() DELETE r")
             session.run("MATCH (n) DELETE n")
             logger.warning("Cleared all data from Neo4j database")
     
     def get_node_count(self, label: Optional[str] = None) -> int:
         """Get count of nodes"""
-        with self.driver.session() as session:
+        with self._session() as session:
             if label:
                 query = f"MATCH (n:{label}) RETURN count(n) as count"
             else:
@@ -159,7 +289,7 @@ class Neo4jConnector(GraphDatabaseConnector):
     
     def get_relationship_count(self, relationship_type: Optional[str] = None) -> int:
         """Get count of relationships"""
-        with self.driver.session() as session:
+        with self._session() as session:
             if relationship_type:
                 query = f"MATCH ()-[r:{relationship_type}]->() RETURN count(r) as count"
             else:
@@ -171,14 +301,14 @@ class Neo4jConnector(GraphDatabaseConnector):
     
     def find_nodes_by_property(self, label: str, property_name: str, value: Any) -> List[Dict[str, Any]]:
         """Find nodes by property value"""
-        with self.driver.session() as session:
+        with self._session() as session:
             query = f"MATCH (n:{label} {{{property_name}: $value}}) RETURN n"
             result = session.run(query, value=value)
             return [dict(record["n"]) for record in result]
     
     def get_node_with_relationships(self, node_id: Any, depth: int = 1) -> Dict[str, Any]:
         """Get a node with its relationships up to a certain depth"""
-        with self.driver.session() as session:
+        with self._session() as session:
             query = f"""
                 MATCH path = (n)-[*1..{depth}]-(related)
                 WHERE id(n) = $node_id
@@ -188,3 +318,62 @@ class Neo4jConnector(GraphDatabaseConnector):
             records = [dict(record) for record in result]
             return records[0] if records else {}
 
+
+class AsyncNeo4jConnector:
+    """
+    Asyncio Neo4j connector for read queries issued from async API handlers
+
+    Uses the driver's native async sessions so queries never block the
+    event loop.
+    """
+
+    def __init__(self, connection_config: Dict[str, Any]):
+        self.connection_config = connection_config
+        self.driver: Optional[AsyncDriver] = None
+        self.database: Optional[str] = connection_config.get("database")
+
+    async def connect(self) -> None:
+        """Establish connection to Neo4j"""
+        try:
+            uri = self.connection_config.get("uri", "bolt://localhost:7687")
+            user = self.connection_config.get("user", "neo4j")
+            password = self.connection_config.get("password", "neo4j")
+
+            self.driver = AsyncGraphDatabase.driver(uri, auth=(user, password), **_pool_options(self.connection_config))
+            await self.driver.verify_connectivity()
+            logger.info(f"Successfully connected to Neo4j (async) at {uri}")
+        except Exception as e:
+            logger.error(f"Failed to connect to Neo4j: {e}")
+            raise
+
+    async def disconnect(self) -> None:
+        """Close connection to Neo4j"""
+        if self.driver:
+            await self.driver.close()
+            logger.info("Neo4j async connection closed")
+
+    async def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Execute a Cypher query and return results"""
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(query, parameters or {})
+            return [dict(record) async for record in result]
+
+    async def get_node_count(self, label: Optional[str] = None) -> int:
+        """Get count of nodes"""
+        if label:
+            query = f"MATCH (n:{label}) RETURN count(n) as count"
+        else:
+            query = "MATCH (n) RETURN count(n) as count"
+
+        records = await self.execute_query(query)
+        return records[0]["count"] if records else 0
+
+    async def get_relationship_count(self, relationship_type: Optional[str] = None) -> int:
+        """Get count of relationships"""
+        if relationship_type:
+            query = f"MATCH ()-[r:{relationship_type}]->() RETURN count(r) as count"
+        else:
+            query = "MATCH ()-[r]->() RETURN count(r) as count"
+
+        records = await self.execute_query(query)
+        return records[0]["count"] if records else 0
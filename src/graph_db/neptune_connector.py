@@ -1,12 +1,31 @@
 """AWS Neptune graph database connector"""
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 import boto3
 from gremlin_python.driver import client, serializer
+from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
+from gremlin_python.process.anonymous_traversal import traversal
+from gremlin_python.process.graph_traversal import __
 from loguru import logger
 
 from .base import GraphDatabaseConnector
 
+# Vertices or edges added per traversal by the batch methods
+BATCH_TRAVERSAL_SIZE = 100
+
+# Property value types sent as-is; anything else is stored as its string form
+_NATIVE_TYPES = (bool, int, float, str, datetime)
+
+
+def _with_properties(t, properties: Optional[Dict[str, Any]]):
+    """Append property() steps for the non-null entries of properties"""
+    if properties:
+        for key, value in properties.items():
+            if value is not None:
+                t = t.property(key, value if isinstance(value, _NATIVE_TYPES) else str(value))
+    return t
+
 
 class NeptuneConnector(GraphDatabaseConnector):
     """AWS Neptune database connector implementation using Gremlin"""
@@ -14,6 +33,8 @@ class NeptuneConnector(GraphDatabaseConnector):
     def __init__(self, connection_config: Dict[str, Any]):
         super().__init__(connection_config)
         self.client = None
+        self.remote: Optional[DriverRemoteConnection] = None
+        self.g = None
     
     def connect(self) -> None:
         """Establish connection to Neptune"""
@@ -32,6 +53,14 @@ class NeptuneConnector(GraphDatabaseConnector):
                 'g',
                 message_serializer=serializer.GraphSONSerializersV2d0()
             )
+            # Writes go as bytecode traversals: values travel as typed data
+            # rather than being spliced into a script
+            self.remote = DriverRemoteConnection(
+                connection_url,
+                'g',
+                message_serializer=serializer.GraphSONSerializersV2d0()
+            )
+            self.g = traversal().withRemote(self.remote)
             
             logger.info(f"Successfully connected to Neptune at {endpoint}")
         except Exception as e:
@@ -40,6 +69,8 @@ class NeptuneConnector(GraphDatabaseConnector):
     
     def disconnect(self) -> None:
         """Close connection to Neptune"""
+        if self.remote:
+            self.remote.close()
         if self.client:
             self.client.close()
             logger.info("Neptune connection closed")
@@ -49,13 +80,7 @@ class NeptuneConnector(GraphDatabaseConnector):
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
-        query = f"g.addV('{label}')"
-        for key, value in properties.items():
-            query += f".property('{key}', '{value}')"
-        query += ".id()"
-        
-        result = self.client.submit(query).all().result()
-        return result[0] if result else None
+        return _with_properties(self.g.addV(label), properties).id_().next()
     
     def create_relationship(
         self,
@@ -68,15 +93,8 @@ class NeptuneConnector(GraphDatabaseConnector):
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
-        query = f"g.V('{from_node_id}').addE('{relationship_type}').to(g.V('{to_node_id}'))"
-        
-        if properties:
-            for key, value in properties.items():
-                query += f".property('{key}', '{value}')"
-        
-        query += ".id()"
-        
-        result = self.client.submit(query).all().result()
+        t = self.g.V(from_node_id).addE(relationship_type).to(__.V(to_node_id))
+        result = _with_properties(t, properties).id_().toList()
         return result[0] if result else None
     
     def batch_create_nodes(self, label: str, nodes: List[Dict[str, Any]]) -> List[Any]:
@@ -84,10 +102,15 @@ class NeptuneConnector(GraphDatabaseConnector):
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
+        # Each traversal adds a chunk of vertices as union() branches, which
+        # return their ids in branch order
         node_ids = []
-        for node in nodes:
-            node_id = self.create_node(label, node)
-            node_ids.append(node_id)
+        for i in range(0, len(nodes), BATCH_TRAVERSAL_SIZE):
+            branches = [
+                _with_properties(__.addV(label), node).id_()
+                for node in nodes[i:i + BATCH_TRAVERSAL_SIZE]
+            ]
+            node_ids.extend(self.g.inject(0).union(*branches).toList())
         
         return node_ids
     
@@ -96,15 +119,18 @@ class NeptuneConnector(GraphDatabaseConnector):
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
+        # Edges whose endpoints are missing add nothing, so unlike vertices
+        # the returned ids may be fewer than the inputs
         rel_ids = []
-        for rel in relationships:
-            rel_id = self.create_relationship(
-                rel["from_id"],
-                rel["to_id"],
-                rel["type"],
-                rel.get("properties")
-            )
-            rel_ids.append(rel_id)
+        for i in range(0, len(relationships), BATCH_TRAVERSAL_SIZE):
+            branches = [
+                _with_properties(
+                    __.V(rel["from_id"]).addE(rel["type"]).to(__.V(rel["to_id"])),
+                    rel.get("properties")
+                ).id_()
+                for rel in relationships[i:i + BATCH_TRAVERSAL_SIZE]
+            ]
+            rel_ids.extend(self.g.inject(0).union(*branches).toList())
         
         return rel_ids
     
@@ -129,8 +155,7 @@ class NeptuneConnector(GraphDatabaseConnector):
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
-        query = "g.V().drop()"
-        self.client.submit(query).all().result()
+        self.g.V().drop().iterate()
         logger.warning("Cleared all data from Neptune database")
     
     def get_node_count(self, label: Optional[str] = None) -> int:
@@ -138,24 +163,18 @@ class NeptuneConnector(GraphDatabaseConnector):
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
+        t = self.g.V()
         if label:
-            query = f"g.V().hasLabel('{label}').count()"
-        else:
-            query = "g.V().count()"
-        
-        result = self.client.submit(query).all().result()
-        return result[0] if result else 0
+            t = t.hasLabel(label)
+        return t.count().next()
     
     def get_relationship_count(self, relationship_type: Optional[str] = None) -> int:
         """Get count of edges"""
         if not self.client:
             raise RuntimeError("Not connected to Neptune")
         
+        t = self.g.E()
         if relationship_type:
-            query = f"g.E().hasLabel('{relationship_type}').count()"
-        else:
-            query = "g.E().count()"
-        
-        result = self.client.submit(query).all().result()
-        return result[0] if result else 0
+            t = t.hasLabel(relationship_type)
+        return t.count().next()
 
@@ -0,0 +1,48 @@
+"""Prometheus metrics for migration, CDC and query paths
+
+Hot paths update these instead of logging per row or per event; the API
+serves them at /metrics.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+MIGRATION_TABLES = Gauge(
+    "migration_tables",
+    "Source tables selected for the most recent migration"
+)
+MIGRATION_ROWS = Counter(
+    "migration_rows_total",
+    "Source rows written to the graph as nodes",
+    ["table"]
+)
+MIGRATION_RELATIONSHIPS = Counter(
+    "migration_relationships_total",
+    "Relationships written to the graph",
+    ["type"]
+)
+
+CDC_EVENTS = Counter(
+    "cdc_events_total",
+    "Change events received from CDC listeners",
+    ["table", "operation"]
+)
+CDC_EVENTS_FAILED = Counter(
+    "cdc_events_failed_total",
+    "Change events a handler failed to apply",
+    ["handler"]
+)
+CDC_BATCH_SECONDS = Histogram(
+    "cdc_batch_seconds",
+    "Time spent applying one batch of change events"
+)
+
+QUERY_SECONDS = Histogram(
+    "query_seconds",
+    "Time spent answering an uncached query"
+)
+
+POOL_ACQUIRE_SECONDS = Histogram(
+    "pool_acquire_seconds",
+    "Time spent waiting to borrow a pooled database connection",
+    ["db_type"]
+)
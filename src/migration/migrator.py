@@ -1,23 +1,41 @@
 """Data migrator for transferring data from RDBMS to graph databases"""
 
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
 from loguru import logger
 from tqdm import tqdm
 
 from ..connectors.base import DatabaseConnector
 from ..graph_db.base import GraphDatabaseConnector
 from ..schema_mapper.graph_schema import GraphSchema
+from ..metrics import MIGRATION_ROWS, MIGRATION_RELATIONSHIPS
+
+
+def _to_graph_value(value: Any) -> Any:
+    """Convert a source column value to a type the graph driver stores"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
 
 
 class DataMigrator:
     """Migrates data from relational databases to graph databases"""
     
+    # Batches a writer may have queued per table before the reader waits
+    MAX_PENDING_BATCHES = 2
+    
     def __init__(
         self,
         source_connector: DatabaseConnector,
         target_connector: GraphDatabaseConnector,
         graph_schema: GraphSchema,
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        max_workers: int = 1
     ):
         """
         Initialize data migrator
@@ -27,12 +45,16 @@ class DataMigrator:
             target_connector: Target graph database connector
             graph_schema: Graph schema to use for migration
             batch_size: Number of records to process in each batch
+            max_workers: Number of concurrent graph writers
         """
         self.source = source_connector
         self.target = target_connector
         self.graph_schema = graph_schema
         self.batch_size = batch_size
+        self.max_workers = max(1, max_workers)
         self.node_id_mapping: Dict[str, Dict[Any, Any]] = {}
+        # Endpoint label -> lock held by relationship writes touching it
+        self._label_locks: Dict[str, threading.Lock] = {}
     
     def migrate(self, clear_target: bool = False) -> Dict[str, Any]:
         """
@@ -59,26 +81,72 @@ class DataMigrator:
         
         self._create_indexes_and_constraints()
         
-        for node_type in self.graph_schema.node_types:
-            try:
-                count = self._migrate_table_to_nodes(node_type)
-                stats["nodes_created"] += count
-                stats["tables_migrated"] += 1
-                logger.info(f"Migrated {count} nodes for {node_type.label}")
-            except Exception as e:
-                error_msg = f"Error migrating {node_type.label}: {str(e)}"
-                logger.error(error_msg)
-                stats["errors"].append(error_msg)
-        
-        for rel_type in self.graph_schema.relationship_types:
-            try:
-                count = self._create_relationships(rel_type)
-                stats["relationships_created"] += count
-                logger.info(f"Created {count} relationships of type {rel_type.type}")
-            except Exception as e:
-                error_msg = f"Error creating relationships {rel_type.type}: {str(e)}"
-                logger.error(error_msg)
-                stats["errors"].append(error_msg)
+        # Source rows are read on this thread; writes go to one single-threaded
+        # writer per bin. Node labels are dealt out round-robin and never
+        # share nodes. Relationships are binned per (from, to) label pair, but
+        # pairs can share an endpoint label and MERGE locks both endpoints,
+        # so each relationship batch also holds its endpoint labels' locks.
+        writers = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"migration-writer-{i}")
+            for i in range(self.max_workers)
+        ]
+        
+        try:
+            node_futures = {}
+            for i, node_type in enumerate(self.graph_schema.node_types):
+                try:
+                    writer = writers[i % len(writers)]
+                    node_futures[node_type.label] = (node_type, self._migrate_table_to_nodes(node_type, writer))
+                except Exception as e:
+                    error_msg = f"Error migrating {node_type.label}: {str(e)}"
+                    logger.error(error_msg)
+                    stats["errors"].append(error_msg)
+            
+            for label, (node_type, futures) in node_futures.items():
+                try:
+                    count = 0
+                    for future in futures:
+                        created, id_pairs = future.result()
+                        count += created
+                        self.node_id_mapping[node_type.source_table].update(id_pairs)
+                    stats["nodes_created"] += count
+                    stats["tables_migrated"] += 1
+                    logger.info(f"Migrated {count} nodes for {label}")
+                except Exception as e:
+                    error_msg = f"Error migrating {label}: {str(e)}"
+                    logger.error(error_msg)
+                    stats["errors"].append(error_msg)
+            
+            self._label_locks = {
+                label: threading.Lock()
+                for rel_type in self.graph_schema.relationship_types
+                for label in (rel_type.from_node, rel_type.to_node)
+            }
+            pair_bins: Dict[Tuple[str, str], int] = {}
+            rel_futures = []
+            for rel_type in self.graph_schema.relationship_types:
+                try:
+                    pair = (rel_type.from_node, rel_type.to_node)
+                    writer = writers[pair_bins.setdefault(pair, len(pair_bins)) % len(writers)]
+                    rel_futures.append((rel_type, self._create_relationships(rel_type, writer)))
+                except Exception as e:
+                    error_msg = f"Error creating relationships {rel_type.type}: {str(e)}"
+                    logger.error(error_msg)
+                    stats["errors"].append(error_msg)
+            
+            for rel_type, futures in rel_futures:
+                try:
+                    count = sum(future.result() for future in futures)
+                    stats["relationships_created"] += count
+                    MIGRATION_RELATIONSHIPS.labels(type=rel_type.type).inc(count)
+                    logger.info(f"Created {count} relationships of type {rel_type.type}")
+                except Exception as e:
+                    error_msg = f"Error creating relationships {rel_type.type}: {str(e)}"
+                    logger.error(error_msg)
+                    stats["errors"].append(error_msg)
+        finally:
+            for writer in writers:
+                writer.shutdown(wait=True)
         
         logger.info(f"Migration complete: {stats}")
         return stats
@@ -107,56 +175,84 @@ class DataMigrator:
                     except Exception as e:
                         logger.warning(f"Could not create constraint: {e}")
     
-    def _migrate_table_to_nodes(self, node_type) -> int:
-        """Migrate a single table to graph nodes"""
+    def _submit(self, futures: List[Future], writer: ThreadPoolExecutor, fn, *args) -> None:
+        """Queue a write on a writer, waiting if too many batches are pending"""
+        futures.append(writer.submit(fn, *args))
+        if len(futures) > self.MAX_PENDING_BATCHES:
+            futures[-self.MAX_PENDING_BATCHES - 1].result()
+    
+    def _migrate_table_to_nodes(self, node_type, writer: ThreadPoolExecutor) -> List[Future]:
+        """
+        Read a single table and queue its rows as graph node writes
+        
+        Returns:
+            Futures resolving to (nodes created, [(primary key, node id), ...])
+        """
         table_name = node_type.source_table
         if not table_name:
             logger.warning(f"No source table for node type {node_type.label}")
-            return 0
+            return []
         
         total_rows = self.source.get_row_count(table_name)
         logger.info(f"Migrating {total_rows} rows from {table_name} to {node_type.label}")
         
         self.node_id_mapping[table_name] = {}
         
-        offset = 0
-        total_created = 0
+        futures: List[Future] = []
+        
+        key = node_type.primary_key if self.target.supports_merge else None
         
         with tqdm(total=total_rows, desc=f"Migrating {table_name}") as pbar:
-            while offset < total_rows:
-                query = f"SELECT * FROM {table_name} LIMIT {self.batch_size} OFFSET {offset}"
-                rows = self.source.execute_query(query)
-                
-                if not rows:
-                    break
-                
+            query = f"SELECT * FROM {table_name}"
+            for rows in self.source.fetch_batches(query, batch_size=self.batch_size):
                 nodes = []
                 pk_values = []
+                keyed_nodes = []
                 
                 for row in rows:
+                    node_props = self._row_to_node_properties(row, node_type)
+                    
+                    if key and node_props.get(key) is not None:
+                        keyed_nodes.append(node_props)
+                        continue
+                    
                     pk_value = row.get(node_type.primary_key) if node_type.primary_key else None
                     pk_values.append(pk_value)
-                    
-                    node_props = self._row_to_node_properties(row, node_type)
                     nodes.append(node_props)
                 
-                node_ids = self.target.batch_create_nodes(node_type.label, nodes)
-                
-                for pk_value, node_id in zip(pk_values, node_ids):
-                    if pk_value is not None:
-                        self.node_id_mapping[table_name][pk_value] = node_id
-                
-                total_created += len(nodes)
-                offset += self.batch_size
+                self._submit(futures, writer, self._write_node_batch, node_type, keyed_nodes, nodes, pk_values)
                 pbar.update(len(rows))
         
-        return total_created
+        return futures
+    
+    def _write_node_batch(
+        self,
+        node_type,
+        keyed_nodes: List[Dict[str, Any]],
+        nodes: List[Dict[str, Any]],
+        pk_values: List[Any]
+    ) -> Tuple[int, List[Tuple[Any, Any]]]:
+        """Write one batch of nodes, merging keyed nodes and creating the rest"""
+        created = 0
+        id_pairs = []
+        
+        if keyed_nodes:
+            created += self.target.batch_merge_nodes(node_type.label, node_type.primary_key, keyed_nodes)
+        
+        if nodes:
+            node_ids = self.target.batch_create_nodes(node_type.label, nodes)
+            id_pairs = [
+                (pk_value, node_id)
+                for pk_value, node_id in zip(pk_values, node_ids)
+                if pk_value is not None
+            ]
+            created += len(nodes)
+        
+        MIGRATION_ROWS.labels(table=node_type.source_table).inc(created)
+        return created, id_pairs
     
     def _row_to_node_properties(self, row: Dict[str, Any], node_type) -> Dict[str, Any]:
         """Convert a database row to graph node properties"""
-        from decimal import Decimal
-        from datetime import datetime, date
-
         properties = {}
 
         property_names = {prop.name for prop in node_type.properties}
@@ -164,20 +260,20 @@ class DataMigrator:
         for key, value in row.items():
             if key in property_names:
                 if value is not None:
-                    if isinstance(value, Decimal):
-                        properties[key] = float(value)
-                    elif isinstance(value, (datetime, date)):
-                        properties[key] = value.isoformat()
-                    else:
-                        properties[key] = value
+                    properties[key] = _to_graph_value(value)
 
         return properties
     
-    def _create_relationships(self, rel_type) -> int:
-        """Create relationships based on foreign keys"""
+    def _create_relationships(self, rel_type, writer: ThreadPoolExecutor) -> List[Future]:
+        """
+        Queue relationship writes based on foreign keys
+        
+        Returns:
+            Futures resolving to the number of relationships created
+        """
         if not rel_type.source_foreign_key:
             logger.warning(f"No source foreign key for relationship {rel_type.type}")
-            return 0
+            return []
         
         fk_info = rel_type.source_foreign_key
         source_table = fk_info["table"]
@@ -187,17 +283,56 @@ class DataMigrator:
         
         logger.info(f"Creating relationships: {source_table}.{fk_column} -> {target_table}.{target_column}")
         
+        source_node_type = self._get_node_type(source_table)
+        target_node_type = self._get_node_type(target_table)
+        source_pk_column = self._get_primary_key(source_table)
+        
         query = f"""
-            SELECT {fk_column}, {self._get_primary_key(source_table)}
+            SELECT {fk_column}, {source_pk_column}
             FROM {source_table}
             WHERE {fk_column} IS NOT NULL
         """
         
+        futures: List[Future] = []
+        labels = (rel_type.from_node, rel_type.to_node)
+        
+        if (
+            self.target.supports_merge
+            and source_node_type and source_node_type.primary_key
+            and target_node_type
+        ):
+            for rows in self.source.fetch_batches(query, batch_size=self.batch_size):
+                relationships = [
+                    # Converted like node properties so the MATCH on the
+                    # stored key value finds the nodes
+                    {
+                        "from_key": _to_graph_value(row[source_pk_column]),
+                        "to_key": _to_graph_value(row[fk_column])
+                    }
+                    for row in rows
+                    if row[source_pk_column] is not None
+                ]
+                if relationships:
+                    self._submit(
+                        futures,
+                        writer,
+                        self._write_with_label_locks,
+                        labels,
+                        self.target.batch_merge_relationships,
+                        source_node_type.label,
+                        source_pk_column,
+                        target_node_type.label,
+                        target_column,
+                        rel_type.type,
+                        relationships
+                    )
+            return futures
+        
         rows = self.source.execute_query(query)
         
         relationships = []
         for row in rows:
-            source_pk = row[self._get_primary_key(source_table)]
+            source_pk = row[source_pk_column]
             target_pk = row[fk_column]
             
             source_node_id = self.node_id_mapping.get(source_table, {}).get(source_pk)
@@ -211,11 +346,39 @@ class DataMigrator:
                     "properties": {}
                 })
         
-        if relationships:
-            self.target.batch_create_relationships(relationships)
+        for i in range(0, len(relationships), self.batch_size):
+            self._submit(
+                futures,
+                writer,
+                self._write_with_label_locks,
+                labels,
+                self._write_relationship_batch,
+                relationships[i:i + self.batch_size]
+            )
         
+        return futures
+    
+    def _write_with_label_locks(self, labels: Tuple[str, str], fn, *args) -> Any:
+        """Run a relationship write while holding its endpoint labels' locks"""
+        # Sorted so two writers never wait on each other's second lock
+        locks = [self._label_locks[label] for label in sorted(set(labels))]
+        for lock in locks:
+            lock.acquire()
+        try:
+            return fn(*args)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+    
+    def _write_relationship_batch(self, relationships: List[Dict[str, Any]]) -> int:
+        """Write one batch of relationships by internal node id"""
+        self.target.batch_create_relationships(relationships)
         return len(relationships)
     
+    def _get_node_type(self, table_name: str):
+        """Get the node type migrated from a table"""
+        return self.graph_schema.table_index.get(table_name)
+    
     def _get_primary_key(self, table_name: str) -> str:
         """Get primary key column name for a table"""
         for node_type in self.graph_schema.node_types:
@@ -1,7 +1,8 @@
 """LangGraph-based agentic retrieval system"""
 
-from typing import Dict, Any, List, Annotated
+from typing import AsyncIterator, Dict, Any, List, Annotated
 from typing_extensions import TypedDict
+import asyncio
 import operator
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -33,6 +34,7 @@ class AgentState(TypedDict):
     combined_results: List[Dict[str, Any]]
     context: str
     answer: str
+    answer_failed: bool
     messages: Annotated[List, operator.add]
     iteration: int
 
@@ -143,12 +145,12 @@ class RetrievalAgent:
 
                     similar = self.vector_store.search(query_embedding, top_k=5)
 
-                    for metadata, distance in similar:
+                    for metadata, score in similar:
                         vector_results.append({
                             "source": "vector",
                             "query": query,
                             "data": metadata,
-                            "score": 1.0 / (1.0 + distance)  # Convert distance to similarity
+                            "score": score
                         })
 
                 logger.info(f"Found {len(vector_results)} vector search results")
@@ -270,16 +272,19 @@ Provide a CLEAR, CONCISE answer:
 - Avoid repetition
 - If information is missing, state it briefly"""
 
+        answer_failed = False
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
             answer = response.content
         except Exception as e:
             logger.error(f"Error generating answer: {e}")
             answer = "I encountered an error while generating the answer."
+            answer_failed = True
 
         return {
             **state,
             "answer": answer,
+            "answer_failed": answer_failed,
             "messages": [AIMessage(content=f"Generated answer")]
         }
     
@@ -425,19 +430,9 @@ Example Cypher patterns:
             logger.error(f"Error getting schema: {e}")
             return "Graph Schema: Unable to retrieve schema"
     
-    def query(self, user_query: str) -> Dict[str, Any]:
-        """
-        Execute a query through the agent
-        
-        Args:
-            user_query: User's natural language query
-            
-        Returns:
-            Dictionary with answer and metadata
-        """
-        logger.info(f"Agent received query: {user_query}")
-        
-        initial_state = {
+    def _initial_state(self, user_query: str) -> AgentState:
+        """Build the empty workflow state for a query"""
+        return {
             "query": user_query,
             "expanded_queries": [],
             "intent": "",
@@ -448,15 +443,56 @@ Example Cypher patterns:
             "combined_results": [],
             "context": "",
             "answer": "",
+            "answer_failed": False,
             "messages": [],
             "iteration": 0
         }
+    
+    def _stream_prompt(self, user_query: str, context: str) -> str:
+        """Build the answer prompt used by the streaming paths"""
+        return f"""Based on the following context from a knowledge graph, answer the user's question.
+
+Context:
+{context}
+
+Question: {user_query}
+
+Provide a clear, comprehensive answer based on the context. If the context doesn't contain enough information, say so."""
+    
+    def _complete_chunk(self, user_query: str, state: AgentState, answer: str) -> Dict[str, Any]:
+        """Build the final chunk of a streamed response"""
+        return {
+            "type": "complete",
+            "query": user_query,
+            "answer": answer,
+            "context": state.get("context", ""),
+            "results": state.get("combined_results", []),
+            "iterations": state.get("iteration", 0),
+            "intent": state.get("intent", ""),
+            "entities": state.get("entities", {})
+        }
+    
+    def query(self, user_query: str) -> Dict[str, Any]:
+        """
+        Execute a query through the agent
+        
+        Args:
+            user_query: User's natural language query
+            
+        Returns:
+            Dictionary with answer and metadata; ``answer_failed`` is set
+            when the LLM call failed and ``answer`` is only a fallback message
+        """
+        logger.info(f"Agent received query: {user_query}")
+        
+        initial_state = self._initial_state(user_query)
         
         final_state = self.graph.invoke(initial_state)
         
         return {
             "query": user_query,
             "answer": final_state.get("answer", ""),
+            "answer_failed": final_state.get("answer_failed", False),
             "context": final_state.get("context", ""),
             "results": final_state.get("combined_results", []),
             "iterations": final_state.get("iteration", 0),
@@ -482,20 +518,7 @@ Example Cypher patterns:
             "query": user_query
         }
 
-        initial_state = {
-            "query": user_query,
-            "expanded_queries": [],
-            "intent": "",
-            "entities": {},
-            "cypher_query": "",
-            "graph_results": [],
-            "vector_results": [],
-            "combined_results": [],
-            "context": "",
-            "answer": "",
-            "messages": [],
-            "iteration": 0
-        }
+        initial_state = self._initial_state(user_query)
 
         yield {
             "type": "status",
@@ -530,16 +553,7 @@ Example Cypher patterns:
             "message": "Generating answer..."
         }
 
-        context = state.get("context", "")
-
-        prompt = f"""Based on the following context from a knowledge graph, answer the user's question.
-
-Context:
-{context}
-
-Question: {user_query}
-
-Provide a clear, comprehensive answer based on the context. If the context doesn't contain enough information, say so."""
+        prompt = self._stream_prompt(user_query, state.get("context", ""))
 
         answer_chunks = []
         try:
@@ -559,15 +573,79 @@ Provide a clear, comprehensive answer based on the context. If the context doesn
                 "message": str(e)
             }
 
-        full_answer = "".join(answer_chunks)
+        yield self._complete_chunk(user_query, state, "".join(answer_chunks))
+
+    async def aquery_stream(self, user_query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a query and stream the response without blocking the event loop
+
+        Query analysis and retrieval run in a worker thread; the answer is
+        streamed token by token with the LLM's native async client.
+
+        Args:
+            user_query: User's natural language query
+
+        Yields:
+            Dictionary chunks with progressive results
+        """
+        logger.info(f"Agent received async streaming query: {user_query}")
+
         yield {
-            "type": "complete",
-            "query": user_query,
-            "answer": full_answer,
-            "context": context,
-            "results": state.get("combined_results", []),
-            "iterations": state.get("iteration", 0),
-            "intent": state.get("intent", ""),
-            "entities": state.get("entities", {})
+            "type": "status",
+            "message": "Processing query...",
+            "query": user_query
+        }
+
+        yield {
+            "type": "status",
+            "message": "Analyzing query..."
+        }
+
+        state = await asyncio.to_thread(self._process_query, self._initial_state(user_query))
+
+        yield {
+            "type": "query_analysis",
+            "expanded_queries": state["expanded_queries"],
+            "entities": state["entities"],
+            "intent": state["intent"]
+        }
+
+        yield {
+            "type": "status",
+            "message": "Retrieving data..."
         }
 
+        state = await asyncio.to_thread(self._retrieve, state)
+
+        yield {
+            "type": "retrieval",
+            "graph_results_count": len(state.get("graph_results", [])),
+            "vector_results_count": len(state.get("vector_results", [])),
+            "cypher_query": state.get("cypher_query", "")
+        }
+
+        yield {
+            "type": "status",
+            "message": "Generating answer..."
+        }
+
+        prompt = self._stream_prompt(user_query, state.get("context", ""))
+
+        answer_chunks = []
+        try:
+            async for chunk in self.llm.astream([HumanMessage(content=prompt)]):
+                if hasattr(chunk, 'content') and chunk.content:
+                    answer_chunks.append(chunk.content)
+                    yield {
+                        "type": "answer_chunk",
+                        "content": chunk.content
+                    }
+        except Exception as e:
+            logger.error(f"Error streaming answer: {e}")
+            yield {
+                "type": "error",
+                "message": str(e)
+            }
+
+        yield self._complete_chunk(user_query, state, "".join(answer_chunks))
+
@@ -1,6 +1,7 @@
 """Graph schema data structures"""
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 from enum import Enum
 
@@ -99,11 +100,21 @@ class GraphSchema:
     def add_node_type(self, node_type: NodeType) -> None:
         """Add a node type to the schema"""
         self.node_types.append(node_type)
+        self.__dict__.pop("table_index", None)
     
     def add_relationship_type(self, relationship_type: RelationshipType) -> None:
         """Add a relationship type to the schema"""
         self.relationship_types.append(relationship_type)
     
+    @cached_property
+    def table_index(self) -> Dict[str, NodeType]:
+        """Map of source table to node type, built once and shared by callers"""
+        return {
+            node_type.source_table: node_type
+            for node_type in self.node_types
+            if node_type.source_table
+        }
+    
     def get_node_type(self, label: str) -> Optional[NodeType]:
         """Get a node type by label"""
         for node_type in self.node_types:
@@ -82,6 +82,18 @@ test_schema_mapping() {
     fi
 }
 
+wait_for_job() {
+    local job_id=$1
+    local job
+    while true; do
+        job=$(curl -s "$API_URL/jobs/$job_id")
+        case $(echo "$job" | jq -r '.status') in
+            completed|failed|null) echo "$job"; return ;;
+        esac
+        sleep 2
+    done
+}
+
 test_migration() {
     print_header "TEST 4: Database Migration"
     print_info "Migrating PostgreSQL to Neo4j..."
@@ -96,9 +108,11 @@ test_migration() {
             \"batch_size\": 1000
         }")
     
+    response=$(wait_for_job "$(echo "$response" | jq -r '.job_id')")
+    
     if echo "$response" | grep -q "nodes_created"; then
-        nodes=$(echo "$response" | jq '.nodes_created')
-        rels=$(echo "$response" | jq '.relationships_created')
+        nodes=$(echo "$response" | jq '.result.nodes_created')
+        rels=$(echo "$response" | jq '.result.relationships_created')
         print_success "Migration completed: $nodes nodes, $rels relationships"
         return 0
     else
@@ -119,8 +133,10 @@ test_embeddings() {
             \"batch_size\": 100
         }")
     
+    response=$(wait_for_job "$(echo "$response" | jq -r '.job_id')")
+    
     if echo "$response" | grep -q "embeddings_created"; then
-        count=$(echo "$response" | jq '.embeddings_created')
+        count=$(echo "$response" | jq '.result.embeddings_created')
         print_success "Embeddings created: $count"
         return 0
     else